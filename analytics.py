@@ -0,0 +1,264 @@
+"""
+Motor de análisis columnar de STOCK Y VENTAS con NumPy
+
+Carga una sola vez las columnas de la hoja (fecha, detalle, cliente, entregador,
+modo de pago, gastos, total, deudas, cantidad gr, esquejes/kits) en arrays de NumPy.
+Las columnas de texto se guardan como categorías (códigos enteros + valores únicos en
+orden de aparición), así los chequeos de texto se hacen una vez por valor distinto y
+los totales y agrupaciones se calculan con máscaras y np.bincount, sin loops por fila.
+Con --usd los ingresos y egresos también se pasan a dólares con la tabla de
+cotizaciones de fx_rates.py (una conversión vectorizada por columna).
+
+Uso:
+    python analytics.py [--excel ARCHIVO] [--por mes|cliente|entregador|modo_pago]
+                        [--usd] [--csv-dolar cotizaciones.csv]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+import numpy as np
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+AGRUPACIONES = ('mes', 'cliente', 'entregador', 'modo_pago')
+
+
+class Categoria:
+    """Columna de texto codificada: codigos[i] indexa valores (orden de primera aparición)"""
+
+    def __init__(self, codigos, valores):
+        self.codigos = codigos
+        self.valores = valores
+
+    def mascara(self, predicado):
+        """Evalúa el predicado una vez por valor distinto y lo expande a las filas"""
+        por_valor = np.fromiter((predicado(v) for v in self.valores), dtype=bool, count=len(self.valores))
+        return por_valor[self.codigos]
+
+    def conteos(self):
+        return np.bincount(self.codigos, minlength=len(self.valores))
+
+
+class _Codificador:
+    def __init__(self):
+        self.indice = {}
+        self.codigos = []
+
+    def agregar(self, valor):
+        codigo = self.indice.get(valor)
+        if codigo is None:
+            codigo = self.indice[valor] = len(self.indice)
+        self.codigos.append(codigo)
+
+    def categoria(self):
+        valores = np.empty(len(self.indice), dtype=object)
+        valores[:] = list(self.indice)
+        return Categoria(np.asarray(self.codigos, dtype=np.int32), valores)
+
+
+def _texto(valor):
+    return str(valor).strip() if valor else ''
+
+
+def _numero(valor):
+    return valor if valor and isinstance(valor, (int, float)) else 0
+
+
+class TablaStock:
+    """Columnas de STOCK Y VENTAS como arrays de NumPy"""
+
+    def __init__(self, fecha, detalle, cliente, entregador, modo_pago, es_gasto, total, deudas,
+                 cantidad_gr, cantidad_esquejes):
+        self.fecha = fecha
+        self.detalle = detalle
+        self.cliente = cliente
+        self.entregador = entregador
+        self.modo_pago = modo_pago
+        self.es_gasto = es_gasto
+        self.total = total
+        self.deudas = deudas
+        self.cantidad_gr = cantidad_gr
+        self.cantidad_esquejes = cantidad_esquejes
+
+    def __len__(self):
+        return len(self.total)
+
+    @classmethod
+    def desde_filas(cls, rows, desde=2):
+        """Arma la tabla a partir de las tuplas de la hoja (por defecto desde la fila 3)"""
+        fechas = []
+        textos = {c: _Codificador() for c in ('detalle', 'cliente', 'entregador', 'modo_pago')}
+        es_gasto = []
+        total = []
+        deudas = []
+        gramos = []
+        esquejes = []
+
+        for i, row in enumerate(rows):
+            if i < desde:
+                continue
+            fechas.append(row[1] if isinstance(row[1], datetime) else None)
+            textos['detalle'].agregar(_texto(row[2]))
+            textos['cliente'].agregar(_texto(row[3]))
+            textos['entregador'].agregar(_texto(row[5]).upper())
+            textos['modo_pago'].agregar(_texto(row[6]).upper())
+            gramos.append(_numero(row[7]))
+            esquejes.append(_numero(row[8]))
+            es_gasto.append(row[9] == 1.0)
+            total.append(_numero(row[10]))
+            deudas.append(_numero(row[11]))
+
+        return cls(
+            fecha=np.array(fechas, dtype='datetime64[D]'),
+            detalle=textos['detalle'].categoria(),
+            cliente=textos['cliente'].categoria(),
+            entregador=textos['entregador'].categoria(),
+            modo_pago=textos['modo_pago'].categoria(),
+            es_gasto=np.array(es_gasto, dtype=bool),
+            total=np.array(total, dtype=np.float64),
+            deudas=np.array(deudas, dtype=np.float64),
+            cantidad_gr=np.array(gramos, dtype=np.float64),
+            cantidad_esquejes=np.array(esquejes, dtype=np.float64),
+        )
+
+    # ------------------------------------------------------------------
+    # Máscaras y métricas por fila
+    # ------------------------------------------------------------------
+
+    def mascara_ingresos(self):
+        return ~self.es_gasto & (self.total > 0)
+
+    def ingresos_por_fila(self):
+        return np.where(self.mascara_ingresos(), self.total, 0.0)
+
+    def egresos_por_fila(self):
+        return np.where(self.es_gasto, np.abs(self.total), 0.0)
+
+    def en_usd(self, montos, cambio):
+        """Pasa una columna de montos por fila a USD según la fecha (0 en filas sin fecha)"""
+        usd = cambio.a_usd(montos, self.fecha)
+        return np.where(np.isnan(usd), 0.0, usd)
+
+    def mascaras_producto(self):
+        """(weed, esqueje/kit) según el DETALLE, con la misma precedencia que el análisis original"""
+        weed = self.detalle.mascara(lambda d: 'WEED' in d)
+        esqueje = ~weed & self.detalle.mascara(lambda d: 'ESQUEJE' in d or 'KIT' in d)
+        return weed, esqueje
+
+
+def resumen(tabla, cambio=None):
+    """
+    Totales de todo el período (mismo reporte que final_analysis.py).
+    Con una TablaCambio de fx_rates.py agrega ingresos_usd y egresos_usd.
+    """
+    weed, esqueje = tabla.mascaras_producto()
+
+    conteos = tabla.detalle.conteos()
+    valores = tabla.detalle.valores
+    con_detalle = np.flatnonzero(valores != '')
+    orden = con_detalle[np.argsort(-conteos[con_detalle], kind='stable')]
+
+    clientes = tabla.cliente.valores
+    usd = {}
+    if cambio is not None:
+        usd = {"ingresos_usd": float(tabla.en_usd(tabla.ingresos_por_fila(), cambio).sum()),
+               "egresos_usd": float(tabla.en_usd(tabla.egresos_por_fila(), cambio).sum())}
+    return {
+        "total_transacciones": len(tabla),
+        "clientes_unicos": int(np.count_nonzero(clientes != '')),
+        "ventas_weed": int(np.count_nonzero(weed)),
+        "ventas_esqueje": int(np.count_nonzero(esqueje)),
+        "gastos": int(np.count_nonzero(tabla.es_gasto)),
+        "ingresos": float(tabla.ingresos_por_fila().sum()),
+        "egresos": float(tabla.egresos_por_fila().sum()),
+        "tipos_operacion": [(valores[i], int(conteos[i])) for i in orden],
+        **usd,
+    }
+
+
+def agrupar(tabla, por, cambio=None):
+    """
+    Agrupa las métricas por mes, cliente, entregador o modo_pago.
+    Devuelve un dict de arrays alineados: clave, operaciones, ingresos, egresos, gramos, esquejes
+    (y con una TablaCambio, ingresos_usd y egresos_usd).
+    """
+    if por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación desconocida: {por}")
+
+    filas = np.arange(len(tabla))
+    if por == 'mes':
+        filas = filas[~np.isnat(tabla.fecha)]
+        claves, grupo = np.unique(tabla.fecha[filas].astype('datetime64[M]'), return_inverse=True)
+        claves = claves.astype(str)
+    else:
+        categoria = getattr(tabla, por)
+        claves = categoria.valores
+        grupo = categoria.codigos
+
+    n = len(claves)
+    vendido = np.where(tabla.mascara_ingresos(), 1.0, 0.0)
+    usd = {}
+    if cambio is not None:
+        for metrica, montos in (("ingresos", tabla.ingresos_por_fila()), ("egresos", tabla.egresos_por_fila())):
+            usd[f"{metrica}_usd"] = np.bincount(grupo, weights=tabla.en_usd(montos, cambio)[filas], minlength=n)
+    return {
+        "clave": claves,
+        "operaciones": np.bincount(grupo, minlength=n),
+        "ingresos": np.bincount(grupo, weights=tabla.ingresos_por_fila()[filas], minlength=n),
+        "egresos": np.bincount(grupo, weights=tabla.egresos_por_fila()[filas], minlength=n),
+        "gramos": np.bincount(grupo, weights=(np.maximum(-tabla.cantidad_gr, 0) * vendido)[filas], minlength=n),
+        "esquejes": np.bincount(grupo, weights=(np.maximum(-tabla.cantidad_esquejes, 0) * vendido)[filas],
+                                minlength=n),
+        **usd,
+    }
+
+
+def cargar_tabla(excel_path=EXCEL_PATH):
+    """Carga STOCK Y VENTAS desde el snapshot cacheado del Excel"""
+    from workbook_cache import cargar_snapshot
+
+    wb = cargar_snapshot(excel_path)
+    return TablaStock.desde_filas(wb['STOCK Y VENTAS'].iter_rows(values_only=True))
+
+
+def imprimir_agrupacion(grupos, por):
+    usd = "ingresos_usd" in grupos
+    print(f"\n{por.upper():<20} {'OPER':>6} {'INGRESOS':>16} {'EGRESOS':>16} {'GRAMOS':>10} {'ESQUEJES':>9}"
+          + (f" {'INGRESOS USD':>13} {'EGRESOS USD':>13}" if usd else ""))
+    orden = np.argsort(grupos["clave"]) if por == 'mes' else np.argsort(-grupos["ingresos"], kind='stable')
+    for i in orden:
+        clave = grupos["clave"][i] or '(sin dato)'
+        print(f"{clave:<20} {grupos['operaciones'][i]:>6d} {grupos['ingresos'][i]:>16,.0f} "
+              f"{grupos['egresos'][i]:>16,.0f} {grupos['gramos'][i]:>10,.0f} {grupos['esquejes'][i]:>9,.0f}"
+              + (f" {grupos['ingresos_usd'][i]:>13,.0f} {grupos['egresos_usd'][i]:>13,.0f}" if usd else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reportes vectorizados de STOCK Y VENTAS")
+    parser.add_argument('--excel', default=EXCEL_PATH)
+    parser.add_argument('--por', choices=AGRUPACIONES, action='append',
+                        help="Agrega una tabla agrupada (se puede repetir)")
+    parser.add_argument('--usd', action='store_true', help="Agrega ingresos y egresos en dólares")
+    parser.add_argument('--csv-dolar', help="Cotizaciones externas (fecha,tasa) para --usd")
+    args = parser.parse_args(argv)
+
+    tabla = cargar_tabla(args.excel)
+    cambio = None
+    if args.usd or args.csv_dolar:
+        from fx_rates import cargar_tabla_cambio
+
+        cambio = cargar_tabla_cambio(args.excel, args.csv_dolar)
+    r = resumen(tabla, cambio)
+    print(f"Transacciones: {r['total_transacciones']} | Clientes únicos: {r['clientes_unicos']}")
+    print(f"Ventas WEED: {r['ventas_weed']} | Ventas ESQUEJES/KITS: {r['ventas_esqueje']} | Gastos: {r['gastos']}")
+    print(f"Ingresos: ${r['ingresos']:,.0f} | Egresos: ${r['egresos']:,.0f}")
+    if cambio is not None:
+        print(f"Ingresos: US${r['ingresos_usd']:,.0f} | Egresos: US${r['egresos_usd']:,.0f}")
+    for por in args.por or ():
+        imprimir_agrupacion(agrupar(tabla, por, cambio), por)
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -1,47 +1,70 @@
-import openpyxl
+"""
+Vista general del Excel: filas con datos, columnas y primeras filas de cada hoja
+
+Uso:
+    python analyze_excel.py [--excel ARCHIVO]
+"""
+
+import argparse
 import sys
 
-# Configurar encoding para Windows
-sys.stdout.reconfigure(encoding='utf-8')
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+
+
+def analizar_hojas(wb, filas_muestra=15):
+    """Imprime el resumen de cada hoja del workbook"""
+    print('=' * 80)
+    print('ANÁLISIS DEL ARCHIVO EXCEL')
+    print('=' * 80)
+
+    for sheet_name in wb.sheetnames:
+        print(f'\n{"="*80}')
+        print(f'HOJA: {sheet_name}')
+        print(f'{"="*80}')
+
+        ws = wb[sheet_name]
+
+        # Contar filas con datos
+        rows_with_data = 0
+        max_row_found = 0
+        max_col_found = 0
 
-wb = openpyxl.load_workbook('Sheets actual 19-01-26.xlsx', data_only=True)
+        all_rows = []
+        for row in ws.iter_rows(values_only=True):
+            if any(cell is not None for cell in row):
+                rows_with_data += 1
+                max_row_found += 1
+                all_rows.append(row)
+                if len([c for c in row if c is not None]) > 0:
+                    max_col_found = max(max_col_found, len(row))
 
-print('=' * 80)
-print('ANÁLISIS DEL ARCHIVO EXCEL')
-print('=' * 80)
+        print(f'\nFilas con datos: {rows_with_data}')
+        print(f'Columnas: {max_col_found}')
 
-for sheet_name in wb.sheetnames:
-    print(f'\n{"="*80}')
-    print(f'HOJA: {sheet_name}')
-    print(f'{"="*80}')
+        if rows_with_data > 0:
+            print(f'\n--- Primeras {filas_muestra} filas ---')
+            for i, row in enumerate(all_rows[:filas_muestra], 1):
+                print(f'Fila {i}: {row}')
 
-    ws = wb[sheet_name]
+            if rows_with_data > filas_muestra:
+                print(f'\n... ({rows_with_data - filas_muestra} filas más) ...')
 
-    # Contar filas con datos
-    rows_with_data = 0
-    max_row_found = 0
-    max_col_found = 0
+        print('')
 
-    all_rows = []
-    for row in ws.iter_rows(values_only=True):
-        if any(cell is not None for cell in row):
-            rows_with_data += 1
-            max_row_found += 1
-            all_rows.append(row)
-            if len([c for c in row if c is not None]) > 0:
-                max_col_found = max(max_col_found, len(row))
 
-    print(f'\nFilas con datos: {rows_with_data}')
-    print(f'Columnas: {max_col_found}')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumen de las hojas del Excel")
+    parser.add_argument('--excel', default=EXCEL_PATH)
+    args = parser.parse_args(argv)
 
-    if rows_with_data > 0:
-        print(f'\n--- Primeras 15 filas ---')
-        for i, row in enumerate(all_rows[:15], 1):
-            print(f'Fila {i}: {row}')
+    from workbook_cache import cargar_snapshot
 
-        if rows_with_data > 15:
-            print(f'\n... ({rows_with_data - 15} filas más) ...')
+    wb = cargar_snapshot(args.excel)
+    analizar_hojas(wb)
+    wb.close()
 
-    print('')
 
-wb.close()
+if __name__ == '__main__':
+    # Configurar encoding para Windows
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
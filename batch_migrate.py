@@ -0,0 +1,243 @@
+"""
+Migración en lote de varios workbooks en paralelo
+
+Recibe directorios, globs o archivos .xlsx (uno por mes y por club) y migra cada uno en
+un proceso de un pool (concurrent.futures). Los resultados se combinan en el orden de
+los archivos en una sola salida:
+
+- Los IDs salen del contenido de cada fila (content_ids.py) y se conservan: el socioId es
+  el del nombre (después del mapa de alias), así el mismo cliente en dos workbooks queda
+  con un único socio y la fecha de registro más vieja.
+- Una fila que aparece en dos workbooks (períodos superpuestos) da el mismo ID: se toma
+  la primera y se informa cuántas se descartaron. Solo el numero de ventas y gastos
+  operativos se renumera correlativamente; el motivo de los egresos de stock de cada
+  venta ("Venta #n") se reescribe con el número nuevo.
+- Inversores y gastos fijos se recalculan en cada workbook: se toman los del último.
+- La cuenta corriente (movimientos, pagos y saldo de cada socio) se rearma con las
+  ventas de todos los workbooks, y el flujo de caja con sus ventas y gastos.
+
+Un archivo que falla se informa al final sin frenar el resto del lote.
+
+Uso:
+    python batch_migrate.py ENTRADA [ENTRADA ...] [--salida ARCHIVO] [--procesos N]
+                            [--formato json|ndjson|copy] [--compresion gzip|lzma]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from cash_flow import FlujoCaja
+from classifier import REGLAS_PATH, cargar_reglas
+from cuenta_corriente import CuentaCorriente
+from migrate_excel_to_new_model import (
+    COLECCIONES_DERIVADAS, COLECCIONES_RECALCULADAS, calcular_estadisticas, crear_destino,
+    emitir_cuenta_corriente, emitir_flujo_caja, emitir_libro_stock, guardar_resultado, imprimir_estadisticas,
+    migrar,
+)
+from socios_dedup import ALIAS_PATH, cargar_alias
+from stock_ledger import LibroStock
+
+SALIDA_PATH = 'datos_migrados_lote.json'
+
+# Colecciones por fila de origen que se combinan (las que tienen numero se renumeran)
+COLECCIONES_FILAS = ("gastosInversion", "ventas", "itemsVenta", "gastosOperativos")
+
+# ============================================================================
+# ENTRADAS
+# ============================================================================
+
+def expandir_entradas(entradas):
+    """Convierte directorios, globs y archivos en la lista ordenada de workbooks (sin repetir)"""
+    archivos = []
+    for entrada in entradas:
+        if Path(entrada).is_dir():
+            encontrados = sorted(Path(entrada).glob('*.xlsx'))
+        elif glob.has_magic(entrada):
+            encontrados = sorted(Path(p) for p in glob.glob(entrada, recursive=True))
+        else:
+            encontrados = [Path(entrada)]
+        for archivo in encontrados:
+            if archivo.name.startswith('~$'):  # Archivos de bloqueo de Excel
+                continue
+            if archivo not in archivos:
+                archivos.append(archivo)
+    return archivos
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+_config = {}
+
+def _inicializar_worker(alias_path, reglas_path):
+    """Carga el mapa de alias y las reglas una vez por proceso"""
+    _config["alias"] = cargar_alias(alias_path) if alias_path else None
+    _config["reglas"] = cargar_reglas(reglas_path)
+
+def migrar_archivo(ruta, usar_cache=True):
+    """
+    Migra un workbook silenciando la salida de la migración.
+    Devuelve (ruta, resultado, segundos, error); error es el traceback si falló.
+    """
+    inicio = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado, _ = migrar(str(ruta), usar_cache=usar_cache,
+                                  alias=_config.get("alias"), reglas=_config.get("reglas"))
+        return str(ruta), resultado, time.perf_counter() - inicio, None
+    except Exception:
+        return str(ruta), None, time.perf_counter() - inicio, traceback.format_exc()
+
+# ============================================================================
+# COMBINAR RESULTADOS
+# ============================================================================
+
+def combinar(resultados, destino):
+    """
+    Combina los resultados de cada workbook (en orden) enviando las entidades al destino.
+    Devuelve destino.cerrar() con las estadísticas del total.
+    """
+    socios = {}
+    cuenta = CuentaCorriente()
+    libro = LibroStock()
+    caja = FlujoCaja()
+    vistos = {coleccion: set() for coleccion in COLECCIONES_FILAS + ("movimientosStock",)}
+    siguientes = {"ventas": 1, "gastosOperativos": 1}
+    numeros_venta = {}  # ID de venta -> numero en el lote
+    repetidas = 0
+
+    for resultado in resultados:
+        for socio in resultado["socios"]:
+            combinado = socios.get(socio["id"])
+            if combinado is None:
+                socios[socio["id"]] = dict(socio)
+            elif socio["fechaRegistro"] and (not combinado["fechaRegistro"]
+                                             or socio["fechaRegistro"] < combinado["fechaRegistro"]):
+                combinado["fechaRegistro"] = socio["fechaRegistro"]
+
+        for coleccion in COLECCIONES_FILAS:
+            for entidad in resultado[coleccion]:
+                if entidad["id"] in vistos[coleccion]:
+                    repetidas += 1
+                    continue
+                vistos[coleccion].add(entidad["id"])
+                if coleccion in siguientes:
+                    entidad = dict(entidad, numero=siguientes[coleccion])
+                    siguientes[coleccion] += 1
+                if coleccion == "ventas":
+                    numeros_venta[entidad["id"]] = entidad["numero"]
+                    cuenta.agregar_venta(entidad)
+                caja.agregar(coleccion, entidad)
+                destino.agregar(coleccion, entidad)
+
+        for movimiento in resultado["movimientosStock"]:
+            if movimiento["id"] not in vistos["movimientosStock"]:
+                vistos["movimientosStock"].add(movimiento["id"])
+                numero = numeros_venta.get(movimiento.get("referenciaId"))
+                if movimiento.get("referenciaTabla") == "ventas" and numero is not None:
+                    movimiento = dict(movimiento, motivo=f"Venta #{numero}")
+                libro.agregar_registro(movimiento)
+
+    if repetidas:
+        print(f"\nFilas repetidas entre workbooks (mismo ID) descartadas: {repetidas}")
+    emitir_cuenta_corriente(destino, socios.values(), cuenta)
+    emitir_libro_stock(destino, libro)
+    if resultados:
+        for coleccion in COLECCIONES_RECALCULADAS:
+            if coleccion in COLECCIONES_DERIVADAS:
+                continue
+            for entidad in resultados[-1][coleccion]:
+                caja.agregar(coleccion, entidad)
+                destino.agregar(coleccion, entidad)
+    emitir_flujo_caja(destino, caja)
+
+    return destino.cerrar(calcular_estadisticas(destino.totales))
+
+# ============================================================================
+# LOTE
+# ============================================================================
+
+def migrar_lote(archivos, procesos=None, usar_cache=True, alias_path=ALIAS_PATH, reglas_path=REGLAS_PATH):
+    """
+    Migra los workbooks en un pool de procesos informando cada uno al terminar.
+    Devuelve (resultados en el orden de archivos, fallidos como [(ruta, error)]).
+    """
+    por_ruta = {}
+    fallidos = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_worker,
+                             initargs=(alias_path, reglas_path)) as pool:
+        futuros = [pool.submit(migrar_archivo, archivo, usar_cache) for archivo in archivos]
+        for futuro in as_completed(futuros):
+            ruta, resultado, segundos, error = futuro.result()
+            if error is None:
+                por_ruta[ruta] = resultado
+                stats = resultado["estadisticas"]
+                print(f"  OK     {segundos:7.2f}s  {ruta}  "
+                      f"({stats['totalVentas']} ventas, {stats['totalSocios']} socios)")
+            else:
+                fallidos.append((ruta, error))
+                ultima_linea = error.strip().splitlines()[-1]
+                print(f"  ERROR  {segundos:7.2f}s  {ruta}  {ultima_linea}")
+
+    resultados = [por_ruta[str(a)] for a in archivos if str(a) in por_ruta]
+    return resultados, fallidos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migra varios workbooks en paralelo y combina el resultado")
+    parser.add_argument('entradas', nargs='+', help="Directorios, globs o archivos .xlsx")
+    parser.add_argument('--salida', default=None,
+                        help=f"Salida combinada; por defecto {SALIDA_PATH} (o su directorio para ndjson/copy)")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos del pool; por defecto uno por CPU")
+    parser.add_argument('--formato', choices=['json', 'ndjson', 'copy'], default='json')
+    parser.add_argument('--compresion', choices=['gzip', 'lzma'], default=None)
+    parser.add_argument('--sin-cache', action='store_true')
+    parser.add_argument('--alias-socios', default=ALIAS_PATH)
+    parser.add_argument('--sin-alias', action='store_true')
+    parser.add_argument('--reglas', default=REGLAS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.compresion and args.formato != 'ndjson':
+        parser.error("--compresion solo aplica con --formato ndjson")
+
+    archivos = expandir_entradas(args.entradas)
+    if not archivos:
+        parser.error("No se encontraron workbooks en las entradas")
+    salida = args.salida or (SALIDA_PATH if args.formato == 'json' else str(Path(SALIDA_PATH).with_suffix('')))
+
+    print("=" * 100)
+    print(f"MIGRACIÓN EN LOTE: {len(archivos)} workbooks, {args.procesos or os.cpu_count()} procesos")
+    print("=" * 100)
+
+    inicio = time.perf_counter()
+    resultados, fallidos = migrar_lote(
+        archivos, args.procesos, usar_cache=not args.sin_cache,
+        alias_path=None if args.sin_alias else args.alias_socios, reglas_path=args.reglas,
+    )
+    print(f"\nMigrados: {len(resultados)} | Fallidos: {len(fallidos)} | "
+          f"Tiempo total: {time.perf_counter() - inicio:.2f}s")
+
+    for ruta, error in fallidos:
+        print(f"\n--- {ruta} ---\n{error}")
+
+    if resultados:
+        combinado = combinar(resultados, crear_destino(args.formato, salida, args.compresion))
+        if args.formato == 'json':
+            guardar_resultado(combinado, salida)
+        else:
+            imprimir_estadisticas(combinado["estadisticas"], salida)
+
+    return 1 if fallidos else 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Benchmark por etapas de la migración y el análisis sobre workbooks sintéticos
+
+Para cada escala genera (o reutiliza de .cache/bench) un workbook con synthetic_workbook.py
+y mide cada etapa por separado:
+
+    carga_openpyxl     parseo de las tres hojas con openpyxl read-only
+    carga_xml          parseo de las tres hojas con el lector directo (xlsx_reader.py)
+    carga_snapshot     lectura del snapshot cacheado (workbook_cache.py)
+    clasificacion      filas de STOCK Y VENTAS -> RegistroStock (reglas + alias)
+    entidades          RegistroStock -> socios, ventas, items y gastos
+    salida_json        json.dump del resultado completo
+    salida_ndjson      escritura NDJSON por colección
+    analisis           TablaStock de NumPy + resumen y agrupación por mes
+    migracion          migrar() de punta a punta (desde el snapshot)
+
+Por etapa se informan segundos, filas/s (filas de datos de STOCK Y VENTAS) y el pico
+de RSS del proceso al terminar la etapa. Cada escala corre en un proceso nuevo para
+que el pico de memoria de una no contamine a la siguiente.
+
+Con --guardar los números quedan en un JSON; con --comparar se contrastan contra un
+JSON anterior y se marca REGRESION cada etapa que tarde más que la tolerancia (el
+código de salida es 1 si hubo alguna).
+
+Uso:
+    python benchmark.py [--escalas 1 10 100] [--base 1000] [--clientes 200]
+                        [--guardar ARCHIVO] [--comparar ARCHIVO] [--tolerancia 0.25]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path('.cache') / 'bench'
+# Etapas más cortas que esto no se comparan: el ruido domina
+MIN_SEGUNDOS_COMPARACION = 0.005
+ETAPAS = ('carga_openpyxl', 'carga_xml', 'carga_snapshot', 'clasificacion', 'entidades',
+          'salida_json', 'salida_ndjson', 'analisis', 'migracion')
+
+
+def rss_pico_mb():
+    """Pico de RSS del proceso en MB (ru_maxrss está en KB en Linux y en bytes en macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def workbook_sintetico(filas, clientes, semilla=0):
+    """Ruta del workbook sintético de esa escala, generándolo si no está en el cache"""
+    from synthetic_workbook import generar_workbook
+
+    ruta = BENCH_DIR / f"sintetico_{filas}_{clientes}_{semilla}.xlsx"
+    if not ruta.exists():
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = ruta.with_name(ruta.stem + '.tmp.xlsx')
+        generar_workbook(tmp, filas, clientes, semilla=semilla)
+        tmp.replace(ruta)
+    return ruta
+
+
+class Cronometro:
+    """Acumula segundos y pico de RSS por etapa"""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.etapas = {}
+
+    @contextlib.contextmanager
+    def etapa(self, nombre):
+        inicio = time.perf_counter()
+        yield
+        segundos = time.perf_counter() - inicio
+        self.etapas[nombre] = {
+            "segundos": round(segundos, 4),
+            "filas_por_seg": round(self.filas / segundos) if segundos > 0 else None,
+            "rss_pico_mb": round(rss_pico_mb(), 1),
+        }
+
+
+def medir_escala(filas, clientes):
+    """Corre todas las etapas sobre el workbook de la escala (se llama en un proceso aparte)"""
+    import openpyxl  # noqa: F401  (el import no cuenta en carga_openpyxl)
+
+    import analytics
+    import migrate_excel_to_new_model as migracion
+    from classifier import cargar_reglas
+    from ndjson_output import NdjsonWriter
+    from records import a_json
+    from socios_dedup import cargar_alias
+    from workbook_cache import abrir_openpyxl, cargar_snapshot, parsear_workbook
+
+    ruta = workbook_sintetico(filas, clientes)
+    crono = Cronometro(filas)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with crono.etapa('carga_openpyxl'):
+            parsear_workbook(ruta, abrir=abrir_openpyxl)
+        with crono.etapa('carga_xml'):
+            parsear_workbook(ruta)
+        cargar_snapshot(ruta)  # Crea el snapshot si hace falta (no se mide)
+        with crono.etapa('carga_snapshot'):
+            wb = cargar_snapshot(ruta)
+
+        reglas = cargar_reglas()
+        alias = cargar_alias()
+        alias = migracion.mapa_por_plegado(alias) if alias else None
+        filas_stock = list(wb['STOCK Y VENTAS'].iter_rows(values_only=True))
+
+        with crono.etapa('clasificacion'):
+            registros = list(migracion.iter_registros_stock(filas_stock, alias=alias, reglas=reglas["stock"]))
+
+        with crono.etapa('entidades'):
+            destino = migracion.ResultadoJson()
+            for coleccion, entidad in migracion.construir_entidades_stock(iter(registros)):
+                destino.agregar(coleccion, entidad)
+
+        resultado = destino.cerrar(migracion.calcular_estadisticas(destino.totales))
+        with crono.etapa('salida_json'):
+            with open(Path(tmp) / 'salida.json', 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2, default=a_json)
+
+        with crono.etapa('salida_ndjson'):
+            writer = NdjsonWriter(Path(tmp) / 'ndjson', migracion.COLECCIONES)
+            for coleccion in migracion.COLECCIONES:
+                for entidad in resultado[coleccion]:
+                    writer.agregar(coleccion, entidad)
+            writer.cerrar(resultado["estadisticas"])
+        del resultado, destino, registros
+
+        with crono.etapa('analisis'):
+            tabla = analytics.TablaStock.desde_filas(filas_stock)
+            analytics.resumen(tabla)
+            analytics.agrupar(tabla, 'mes')
+        del tabla, filas_stock, wb
+
+        with crono.etapa('migracion'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                migracion.migrar(str(ruta), reglas=reglas)
+
+    return {"filas": filas, "clientes": clientes, "etapas": crono.etapas}
+
+
+def correr(escalas, base, clientes):
+    """Mide cada escala en su propio proceso y devuelve la lista de resultados"""
+    resultados = []
+    for escala in escalas:
+        filas = int(base * escala)
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            resultado = pool.submit(medir_escala, filas, clientes).result()
+        resultados.append(resultado)
+        imprimir_escala(resultado)
+    return resultados
+
+
+def imprimir_escala(resultado):
+    print(f"\n{resultado['filas']:,} filas, {resultado['clientes']} clientes")
+    print(f"  {'ETAPA':<16} {'SEGUNDOS':>10} {'FILAS/S':>12} {'RSS PICO MB':>12}")
+    for nombre in ETAPAS:
+        etapa = resultado["etapas"][nombre]
+        por_seg = f"{etapa['filas_por_seg']:,}" if etapa['filas_por_seg'] else '-'
+        print(f"  {nombre:<16} {etapa['segundos']:>10.4f} {por_seg:>12} {etapa['rss_pico_mb']:>12.1f}")
+
+
+def comparar(resultados, anterior, tolerancia):
+    """Imprime la relación de tiempos contra una corrida anterior; devuelve las regresiones"""
+    previas = {r["filas"]: r for r in anterior["escalas"]}
+    regresiones = []
+    print("\nCOMPARACIÓN CONTRA LA CORRIDA ANTERIOR (tiempo actual / anterior)")
+    for resultado in resultados:
+        previa = previas.get(resultado["filas"])
+        if previa is None:
+            continue
+        print(f"\n{resultado['filas']:,} filas")
+        for nombre in ETAPAS:
+            antes = previa["etapas"].get(nombre, {}).get("segundos")
+            ahora = resultado["etapas"][nombre]["segundos"]
+            if not antes or max(antes, ahora) < MIN_SEGUNDOS_COMPARACION:
+                continue
+            relacion = ahora / antes
+            marca = "REGRESION" if relacion > 1 + tolerancia else ""
+            if marca:
+                regresiones.append((resultado["filas"], nombre, relacion))
+            print(f"  {nombre:<16} {relacion:>6.2f}x  {marca}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapas sobre workbooks sintéticos")
+    parser.add_argument('--escalas', type=float, nargs='+', default=[1, 10, 100],
+                        help="Multiplicadores de --base (1 ~ el tamaño del Excel real)")
+    parser.add_argument('--base', type=int, default=1000, help="Filas de STOCK Y VENTAS en la escala 1")
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--guardar', help="Guarda los resultados en este JSON")
+    parser.add_argument('--comparar', help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento de tiempo tolerado antes de marcar regresión (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    print("=" * 100)
+    print(f"BENCHMARK: escalas {args.escalas} x {args.base} filas")
+    print("=" * 100)
+    resultados = correr(args.escalas, args.base, args.clientes)
+
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as f:
+            json.dump({
+                "fecha": datetime.now().isoformat(timespec='seconds'),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "escalas": resultados,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regresiones = comparar(resultados, json.load(f), args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} etapas con regresión")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
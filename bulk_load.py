@@ -0,0 +1,610 @@
+"""
+Carga masiva de la migración con COPY (supabase/migrations/001_initial_schema.sql)
+
+Convierte las entidades migradas en archivos TSV en formato texto de COPY, uno por
+tabla y numerados en orden de claves foráneas, más un load.sql que los carga con
+\\copy. La carga completa es un COPY por tabla dentro de una única transacción.
+
+Tablas: categorias_productos, productos, categorias_gastos (filas de referencia para
+los productoId/categoriaId que usa la migración), inversores, gastos_inversion,
+socios, ventas, items_venta, gastos (gastosOperativos + gastosFijos),
+movimientos_cuenta_corriente, pagos, movimientos_stock y movimientos_caja.
+
+Los IDs de la migración ("venta-3f9a0c52d1e87b44") se convierten en UUID v5
+deterministas, así una recarga produce siempre los mismos UUID.
+
+Uso:
+    python bulk_load.py exportar [--entrada datos_migrados.json] [--directorio copy_migracion]
+    python bulk_load.py postgres --dsn postgresql://localhost/tgb [--directorio copy_migracion]
+    python bulk_load.py sqlite --db espejo.db [--directorio copy_migracion]
+
+`postgres` ejecuta load.sql con psql --single-transaction contra una base con el esquema
+001 aplicado. `sqlite` carga los mismos archivos en un espejo SQLite de esas tablas
+(mismas FK, NOT NULL y enums) para verificar los archivos sin un Postgres.
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+DIRECTORIO_COPY = 'copy_migracion'
+NAMESPACE_IDS = uuid.uuid5(uuid.NAMESPACE_URL, 'https://thegardenboys.local/migracion')
+
+METODOS_PAGO = ('EFECTIVO', 'TRANSFERENCIA', 'MERCADOPAGO', 'CREDITO', 'DEBITO', 'CUENTA_CORRIENTE')
+
+# Filas de referencia (mismos IDs que lib/mockData.ts) para satisfacer las FK
+CATEGORIAS_PRODUCTOS = {
+    'cat-flor': ('Flores', 'FLOR'),
+    'cat-esqueje': ('Esquejes', 'ESQUEJE'),
+    'cat-kit': ('Kits de Cultivo', 'KIT'),
+    'cat-otro': ('Otros', 'OTRO'),
+}
+PRODUCTOS = {
+    'prod-weed': ('cat-flor', 'Weed', 'GRAMOS', 6000),
+    'prod-esqueje': ('cat-esqueje', 'Esqueje', 'UNIDADES', 10000),
+    'prod-kit': ('cat-kit', 'Kit', 'KITS', 45000),
+}
+CATEGORIAS_GASTOS = {
+    'cat-varios': ('Varios', 'VARIABLE'),
+    'cat-fijo': ('Gastos fijos', 'FIJO'),
+    'cat-alquiler': ('Alquiler', 'FIJO'),
+    'cat-servicios-legales': ('Servicios Legales', 'FIJO'),
+    'cat-servicios-medicos': ('Servicios Médicos', 'FIJO'),
+    'cat-marketing': ('Marketing y Redes', 'FIJO'),
+    'cat-servicios': ('Servicios Básicos', 'FIJO'),
+    'cat-insumos': ('Insumos de Cultivo', 'VARIABLE'),
+    'cat-mantenimiento': ('Mantenimiento', 'VARIABLE'),
+    'cat-mano-obra': ('Mano de Obra Variable', 'VARIABLE'),
+}
+
+# (archivo, tabla, columnas) en orden de claves foráneas
+TABLAS = [
+    ('01_categorias_productos.tsv', 'categorias_productos', ['id', 'nombre', 'tipo', 'activo']),
+    ('02_productos.tsv', 'productos', ['id', 'categoria_id', 'nombre', 'unidad_medida', 'precio_base', 'activo']),
+    ('03_categorias_gastos.tsv', 'categorias_gastos', ['id', 'nombre', 'tipo', 'activo']),
+    ('04_inversores.tsv', 'inversores', [
+        'id', 'nombre', 'monto_invertido_usd', 'monto_invertido_pesos',
+        'porcentaje_participacion', 'fecha_ingreso', 'activo',
+    ]),
+    ('05_gastos_inversion.tsv', 'gastos_inversion', [
+        'id', 'inversor_id', 'fecha', 'detalle', 'categoria', 'monto_usd', 'monto_pesos', 'precio_dolar',
+    ]),
+    ('06_socios.tsv', 'socios', ['id', 'nombre', 'fecha_registro', 'tipo', 'activo', 'saldo', 'limite_credito']),
+    ('07_ventas.tsv', 'ventas', [
+        'id', 'numero', 'fecha', 'socio_id', 'vendedor_id', 'subtotal', 'descuento', 'total',
+        'estado_pago', 'monto_pagado', 'saldo_pendiente', 'metodo_pago', 'entregado',
+        'fecha_entrega', 'notas',
+    ]),
+    ('08_items_venta.tsv', 'items_venta', [
+        'id', 'venta_id', 'producto_id', 'descripcion', 'cantidad', 'precio_unitario',
+        'subtotal', 'descuento', 'total',
+    ]),
+    ('09_gastos.tsv', 'gastos', [
+        'id', 'numero', 'fecha', 'categoria_id', 'detalle', 'proveedor', 'monto', 'metodo_pago',
+        'pagado', 'es_recurrente', 'frecuencia', 'notas',
+    ]),
+    ('10_movimientos_cuenta_corriente.tsv', 'movimientos_cuenta_corriente', [
+        'id', 'socio_id', 'fecha', 'tipo', 'concepto', 'monto', 'saldo_anterior', 'saldo_nuevo',
+        'referencia_id', 'referencia_tabla',
+    ]),
+    ('11_pagos.tsv', 'pagos', ['id', 'fecha', 'socio_id', 'venta_id', 'monto', 'metodo_pago', 'concepto']),
+    ('12_movimientos_stock.tsv', 'movimientos_stock', [
+        'id', 'producto_id', 'fecha', 'tipo', 'cantidad', 'stock_anterior', 'stock_nuevo', 'motivo',
+        'referencia_id', 'referencia_tabla',
+    ]),
+    ('13_movimientos_caja.tsv', 'movimientos_caja', [
+        'id', 'fecha', 'tipo', 'categoria', 'monto', 'metodo_pago', 'concepto', 'referencia_id',
+        'referencia_tabla', 'saldo_anterior', 'saldo_nuevo', 'responsable', 'notas',
+    ]),
+]
+COLUMNAS = {tabla: columnas for _, tabla, columnas in TABLAS}
+ARCHIVOS = {tabla: archivo for archivo, tabla, _ in TABLAS}
+
+# ============================================================================
+# CONVERSIÓN DE ENTIDADES A FILAS
+# ============================================================================
+
+def uuid_de(id_migracion):
+    """UUID v5 determinista para un ID de la migración (None se mantiene None)"""
+    if id_migracion is None:
+        return None
+    return str(uuid.uuid5(NAMESPACE_IDS, id_migracion))
+
+
+def metodo_pago_sql(valor, defecto='EFECTIVO'):
+    """Lleva el modo de pago del Excel al enum metodo_pago ('EFECTIVO/TRAN' -> EFECTIVO)"""
+    valor = (valor or '').upper()
+    if valor in METODOS_PAGO:
+        return valor
+    if valor.startswith('EFEC'):
+        return 'EFECTIVO'
+    if valor.startswith('TRANSF'):
+        return 'TRANSFERENCIA'
+    return defecto
+
+
+def valor_copy(valor):
+    """Formatea un valor para el formato texto de COPY"""
+    if valor is None:
+        return r'\N'
+    if valor is True:
+        return 't'
+    if valor is False:
+        return 'f'
+    texto = str(valor)
+    if any(c in texto for c in '\\\t\n\r'):
+        texto = (texto.replace('\\', '\\\\').replace('\t', '\\t')
+                 .replace('\n', '\\n').replace('\r', '\\r'))
+    return texto
+
+
+def parsear_valor_copy(texto):
+    """Inversa de valor_copy (los números y booleanos quedan como texto)"""
+    if texto == r'\N':
+        return None
+    if '\\' not in texto:
+        return texto
+    escapes = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+    salida = []
+    i = 0
+    while i < len(texto):
+        c = texto[i]
+        if c == '\\' and i + 1 < len(texto):
+            salida.append(escapes.get(texto[i + 1], texto[i + 1]))
+            i += 2
+        else:
+            salida.append(c)
+            i += 1
+    return ''.join(salida)
+
+
+def fila_inversor(inv):
+    return [uuid_de(inv['id']), inv['nombre'], inv['montoInvertidoUSD'], inv['montoInvertidoPesos'],
+            inv['porcentajeParticipacion'], inv['fechaIngreso'], inv['activo']]
+
+
+def fila_gasto_inversion(g):
+    return [uuid_de(g['id']), uuid_de(g['inversorId']), g['fecha'], g['detalle'] or '', g['categoria'],
+            g['montoUSD'], g['montoPesos'], g['precioDolar']]
+
+
+def fila_socio(s):
+    return [uuid_de(s['id']), s['nombre'], s['fechaRegistro'], s['tipo'], s['activo'], s['saldo'],
+            s.get('limiteCredito')]
+
+
+def fila_venta(v):
+    return [uuid_de(v['id']), v['numero'], v['fecha'], uuid_de(v['socioId']), uuid_de(v['vendedorId']),
+            v['subtotal'], v['descuento'], v['total'], v['estadoPago'], v['montoPagado'],
+            v['saldoPendiente'], metodo_pago_sql(v['metodoPago'], defecto=None), v['entregado'],
+            v.get('fechaEntrega'), v.get('notas')]
+
+
+def fila_item_venta(item):
+    return [uuid_de(item['id']), uuid_de(item['ventaId']), uuid_de(item['productoId']), item['descripcion'],
+            item['cantidad'], item['precioUnitario'], item['subtotal'], item['descuento'], item['total']]
+
+
+def fila_gasto(g, numero):
+    return [uuid_de(g['id']), numero, g['fecha'], uuid_de(g['categoriaId']), g['detalle'],
+            g.get('proveedor'), g['monto'], metodo_pago_sql(g['metodoPago']), g['pagado'],
+            g['esRecurrente'], g.get('frecuencia'), g.get('notas')]
+
+
+def fila_movimiento_cc(m):
+    return [uuid_de(m['id']), uuid_de(m['socioId']), m['fecha'], m['tipo'], m['concepto'], m['monto'],
+            m['saldoAnterior'], m['saldoNuevo'], uuid_de(m['referenciaId']), m['referenciaTabla']]
+
+
+def fila_pago(p):
+    return [uuid_de(p['id']), p['fecha'], uuid_de(p['socioId']), uuid_de(p['ventaId']), p['monto'],
+            metodo_pago_sql(p['metodoPago']), p['concepto']]
+
+
+def fila_movimiento_stock(m):
+    return [uuid_de(m['id']), uuid_de(m['productoId']), m['fecha'], m['tipo'], m['cantidad'],
+            m['stockAnterior'], m['stockNuevo'], m['motivo'], uuid_de(m['referenciaId']), m['referenciaTabla']]
+
+
+def fila_movimiento_caja(m):
+    return [uuid_de(m['id']), m['fecha'], m['tipo'], m['categoria'], m['monto'], m['metodoPago'], m['concepto'],
+            uuid_de(m['referenciaId']), m['referenciaTabla'], m['saldoAnterior'], m['saldoNuevo'],
+            m.get('responsable'), m.get('notas')]
+
+# ============================================================================
+# ESCRITOR DE ARCHIVOS COPY
+# ============================================================================
+
+class ConversorFilas:
+    """
+    Convierte cada entidad de la migración en la fila de su tabla (valores en el orden
+    de COLUMNAS) y se la pasa a _escribir, que define cada subclase.
+
+    gastosOperativos y gastosFijos comparten la tabla gastos (numero UNIQUE): los
+    gastos fijos se numeran a continuación del último gasto operativo. Las filas de
+    referencia (categorías y productos) se escriben al cerrar, según los IDs vistos.
+    """
+
+    TABLA_DE = {
+        'inversores': 'inversores',
+        'gastosInversion': 'gastos_inversion',
+        'socios': 'socios',
+        'ventas': 'ventas',
+        'itemsVenta': 'items_venta',
+        'gastosOperativos': 'gastos',
+        'gastosFijos': 'gastos',
+        'movimientosCuentaCorriente': 'movimientos_cuenta_corriente',
+        'pagos': 'pagos',
+        'movimientosStock': 'movimientos_stock',
+        'movimientosCaja': 'movimientos_caja',
+    }
+
+    def __init__(self):
+        self.totales = dict.fromkeys(self.TABLA_DE, 0)
+        self.filas_por_tabla = dict.fromkeys(COLUMNAS, 0)
+        self._productos = set()
+        self._categorias_gastos = set()
+        self._ultimo_numero_gasto = 0
+        self._base_gastos_fijos = None
+
+    def _escribir(self, tabla, fila):
+        raise NotImplementedError
+
+    def agregar(self, coleccion, entidad):
+        """Convierte la entidad a la fila de su tabla y la escribe"""
+        tabla = self.TABLA_DE[coleccion]
+        if coleccion == 'inversores':
+            fila = fila_inversor(entidad)
+        elif coleccion == 'gastosInversion':
+            fila = fila_gasto_inversion(entidad)
+        elif coleccion == 'socios':
+            fila = fila_socio(entidad)
+        elif coleccion == 'ventas':
+            fila = fila_venta(entidad)
+        elif coleccion == 'itemsVenta':
+            self._productos.add(entidad['productoId'])
+            fila = fila_item_venta(entidad)
+        elif coleccion == 'gastosOperativos':
+            self._categorias_gastos.add(entidad['categoriaId'])
+            self._ultimo_numero_gasto = max(self._ultimo_numero_gasto, entidad['numero'])
+            fila = fila_gasto(entidad, entidad['numero'])
+        elif coleccion == 'movimientosCuentaCorriente':
+            fila = fila_movimiento_cc(entidad)
+        elif coleccion == 'pagos':
+            fila = fila_pago(entidad)
+        elif coleccion == 'movimientosStock':
+            self._productos.add(entidad['productoId'])
+            fila = fila_movimiento_stock(entidad)
+        elif coleccion == 'movimientosCaja':
+            fila = fila_movimiento_caja(entidad)
+        else:
+            if self._base_gastos_fijos is None:
+                self._base_gastos_fijos = self._ultimo_numero_gasto
+            self._categorias_gastos.add(entidad['categoriaId'])
+            fila = fila_gasto(entidad, self._base_gastos_fijos + entidad['numero'])
+        self._escribir(tabla, fila)
+        self.totales[coleccion] += 1
+
+    def _escribir_referencias(self):
+        categorias_productos = set()
+        for producto_id in sorted(self._productos):
+            categoria_id, nombre, unidad, precio = PRODUCTOS.get(
+                producto_id, ('cat-otro', producto_id, 'UNIDADES', 0))
+            categorias_productos.add(categoria_id)
+            self._escribir('productos', [uuid_de(producto_id), uuid_de(categoria_id), nombre, unidad, precio, True])
+        for categoria_id in sorted(categorias_productos):
+            nombre, tipo = CATEGORIAS_PRODUCTOS[categoria_id]
+            self._escribir('categorias_productos', [uuid_de(categoria_id), nombre, tipo, True])
+        for categoria_id in sorted(self._categorias_gastos):
+            nombre, tipo = CATEGORIAS_GASTOS.get(categoria_id, (categoria_id, 'VARIABLE'))
+            self._escribir('categorias_gastos', [uuid_de(categoria_id), nombre, tipo, True])
+
+
+class CopyWriter(ConversorFilas):
+    """Destino de la migración que escribe cada entidad como fila TSV de su tabla"""
+
+    def __init__(self, directorio=DIRECTORIO_COPY):
+        super().__init__()
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self._archivos = {}
+
+    def _archivo(self, tabla):
+        f = self._archivos.get(tabla)
+        if f is None:
+            tmp = self.directorio / (ARCHIVOS[tabla] + '.tmp')
+            f = self._archivos[tabla] = open(tmp, 'w', encoding='utf-8', newline='\n')
+        return f
+
+    def _escribir(self, tabla, fila):
+        self._archivo(tabla).write('\t'.join(valor_copy(v) for v in fila) + '\n')
+        self.filas_por_tabla[tabla] += 1
+
+    def cerrar(self, estadisticas=None):
+        """Escribe las filas de referencia, publica los TSV y genera load.sql"""
+        self._escribir_referencias()
+        for tabla in COLUMNAS:
+            self._archivo(tabla)  # Las tablas vacías también tienen archivo
+        for tabla, f in self._archivos.items():
+            f.close()
+            os.replace(self.directorio / (ARCHIVOS[tabla] + '.tmp'), self.directorio / ARCHIVOS[tabla])
+        self._archivos = {}
+        escribir_load_sql(self.directorio)
+        return {"directorio": str(self.directorio), "filas": dict(self.filas_por_tabla),
+                "estadisticas": estadisticas or {}}
+
+    def descartar(self):
+        """Cierra y borra los archivos temporales"""
+        for tabla, f in self._archivos.items():
+            f.close()
+            (self.directorio / (ARCHIVOS[tabla] + '.tmp')).unlink(missing_ok=True)
+        self._archivos = {}
+
+
+def escribir_load_sql(directorio):
+    """Genera load.sql: un \\copy por tabla en orden de FK y la actualización de secuencias"""
+    lineas = [
+        "-- Generado por bulk_load.py. Ejecutar desde este directorio con:",
+        "--   psql <dsn> --single-transaction -v ON_ERROR_STOP=1 -f load.sql",
+    ]
+    for archivo, tabla, columnas in TABLAS:
+        lineas.append(f"\\copy {tabla} ({', '.join(columnas)}) FROM '{archivo}'")
+    for secuencia, tabla in (('ventas', 'ventas'), ('gastos', 'gastos')):
+        lineas.append(
+            f"UPDATE secuencias SET numero = GREATEST(numero, "
+            f"(SELECT COALESCE(MAX(numero), 0) FROM {tabla})) WHERE nombre = '{secuencia}';"
+        )
+    with open(Path(directorio) / 'load.sql', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lineas) + '\n')
+
+
+def convertir_salida(entrada, conversor):
+    """Pasa por el conversor las entidades de una salida existente (JSON o directorio NDJSON)"""
+    from ndjson_output import iter_salida
+
+    # gastosFijos se numeran después de los operativos: se difieren hasta el final
+    gastos_fijos = []
+    for coleccion, registro in iter_salida(entrada):
+        if coleccion == 'gastosFijos':
+            gastos_fijos.append(registro)
+        elif coleccion in ConversorFilas.TABLA_DE:
+            conversor.agregar(coleccion, registro)
+    for gasto in gastos_fijos:
+        conversor.agregar('gastosFijos', gasto)
+    return conversor
+
+
+def exportar_copy(entrada, directorio=DIRECTORIO_COPY):
+    """Genera los archivos COPY a partir de una salida existente (JSON o directorio NDJSON)"""
+    writer = CopyWriter(directorio)
+    try:
+        convertir_salida(entrada, writer)
+    except BaseException:
+        writer.descartar()
+        raise
+    return writer.cerrar()
+
+# ============================================================================
+# CARGA
+# ============================================================================
+
+def cargar_postgres(directorio=DIRECTORIO_COPY, dsn=None):
+    """Ejecuta load.sql con psql en una única transacción (ON_ERROR_STOP)"""
+    comando = ['psql', '--single-transaction', '-v', 'ON_ERROR_STOP=1', '-f', 'load.sql']
+    if dsn:
+        comando.insert(1, dsn)
+    subprocess.run(comando, cwd=directorio, check=True)
+
+
+ESQUEMA_SQLITE = """
+CREATE TABLE categorias_productos (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('FLOR', 'ESQUEJE', 'KIT', 'SEMILLA', 'INSUMO', 'OTRO')),
+    activo BOOLEAN NOT NULL DEFAULT 1
+);
+CREATE TABLE productos (
+    id TEXT PRIMARY KEY,
+    categoria_id TEXT NOT NULL REFERENCES categorias_productos(id),
+    nombre TEXT NOT NULL,
+    unidad_medida TEXT NOT NULL CHECK (unidad_medida IN ('GRAMOS', 'UNIDADES', 'KITS')),
+    precio_base NUMERIC NOT NULL,
+    activo BOOLEAN NOT NULL DEFAULT 1
+);
+CREATE TABLE categorias_gastos (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('FIJO', 'VARIABLE')),
+    activo BOOLEAN NOT NULL DEFAULT 1
+);
+CREATE TABLE inversores (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    monto_invertido_usd NUMERIC NOT NULL,
+    monto_invertido_pesos NUMERIC NOT NULL,
+    porcentaje_participacion NUMERIC NOT NULL,
+    fecha_ingreso TEXT NOT NULL,
+    activo BOOLEAN NOT NULL
+);
+CREATE TABLE gastos_inversion (
+    id TEXT PRIMARY KEY,
+    inversor_id TEXT NOT NULL REFERENCES inversores(id),
+    fecha TEXT NOT NULL,
+    detalle TEXT NOT NULL,
+    categoria TEXT NOT NULL CHECK (categoria IN ('EQUIPAMIENTO', 'CONSTRUCCION', 'INSUMOS_INICIALES', 'LEGAL', 'OTROS')),
+    monto_usd NUMERIC NOT NULL,
+    monto_pesos NUMERIC NOT NULL,
+    precio_dolar NUMERIC NOT NULL
+);
+CREATE TABLE socios (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    fecha_registro TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('SOCIO_PLENO', 'SOCIO_ADHERENTE', 'CLIENTE_FRECUENTE', 'CLIENTE_OCASIONAL')),
+    activo BOOLEAN NOT NULL,
+    saldo NUMERIC NOT NULL,
+    limite_credito NUMERIC
+);
+CREATE TABLE ventas (
+    id TEXT PRIMARY KEY,
+    numero INTEGER NOT NULL UNIQUE,
+    fecha TEXT NOT NULL,
+    socio_id TEXT NOT NULL REFERENCES socios(id),
+    vendedor_id TEXT,
+    subtotal NUMERIC NOT NULL,
+    descuento NUMERIC NOT NULL,
+    total NUMERIC NOT NULL,
+    estado_pago TEXT NOT NULL CHECK (estado_pago IN ('PENDIENTE', 'PARCIAL', 'PAGADO')),
+    monto_pagado NUMERIC NOT NULL,
+    saldo_pendiente NUMERIC NOT NULL,
+    metodo_pago TEXT CHECK (metodo_pago IN ({metodos})),
+    entregado BOOLEAN NOT NULL,
+    fecha_entrega TEXT,
+    notas TEXT
+);
+CREATE TABLE items_venta (
+    id TEXT PRIMARY KEY,
+    venta_id TEXT NOT NULL REFERENCES ventas(id),
+    producto_id TEXT NOT NULL REFERENCES productos(id),
+    descripcion TEXT NOT NULL,
+    cantidad NUMERIC NOT NULL,
+    precio_unitario NUMERIC NOT NULL,
+    subtotal NUMERIC NOT NULL,
+    descuento NUMERIC NOT NULL,
+    total NUMERIC NOT NULL
+);
+CREATE TABLE gastos (
+    id TEXT PRIMARY KEY,
+    numero INTEGER NOT NULL UNIQUE,
+    fecha TEXT NOT NULL,
+    categoria_id TEXT NOT NULL REFERENCES categorias_gastos(id),
+    detalle TEXT NOT NULL,
+    proveedor TEXT,
+    monto NUMERIC NOT NULL,
+    metodo_pago TEXT NOT NULL CHECK (metodo_pago IN ({metodos})),
+    pagado BOOLEAN NOT NULL,
+    es_recurrente BOOLEAN NOT NULL,
+    frecuencia TEXT CHECK (frecuencia IN ('MENSUAL', 'BIMESTRAL', 'TRIMESTRAL', 'ANUAL')),
+    notas TEXT
+);
+CREATE TABLE movimientos_cuenta_corriente (
+    id TEXT PRIMARY KEY,
+    socio_id TEXT NOT NULL REFERENCES socios(id),
+    fecha TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('CARGO', 'PAGO')),
+    concepto TEXT NOT NULL,
+    monto NUMERIC NOT NULL,
+    saldo_anterior NUMERIC NOT NULL,
+    saldo_nuevo NUMERIC NOT NULL,
+    referencia_id TEXT,
+    referencia_tabla TEXT
+);
+CREATE TABLE pagos (
+    id TEXT PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    socio_id TEXT NOT NULL REFERENCES socios(id),
+    venta_id TEXT REFERENCES ventas(id),
+    monto NUMERIC NOT NULL,
+    metodo_pago TEXT NOT NULL CHECK (metodo_pago IN ({metodos})),
+    concepto TEXT NOT NULL
+);
+CREATE TABLE movimientos_stock (
+    id TEXT PRIMARY KEY,
+    producto_id TEXT NOT NULL REFERENCES productos(id),
+    fecha TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('INGRESO', 'EGRESO', 'AJUSTE', 'COSECHA')),
+    cantidad NUMERIC NOT NULL,
+    stock_anterior NUMERIC NOT NULL,
+    stock_nuevo NUMERIC NOT NULL,
+    motivo TEXT NOT NULL,
+    referencia_id TEXT,
+    referencia_tabla TEXT
+);
+CREATE TABLE movimientos_caja (
+    id TEXT PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('INGRESO', 'EGRESO')),
+    categoria TEXT NOT NULL CHECK (categoria IN ('VENTA', 'GASTO', 'SUELDO', 'RETIRO', 'APORTE', 'OTRO')),
+    monto NUMERIC NOT NULL,
+    metodo_pago TEXT NOT NULL CHECK (metodo_pago IN ({metodos})),
+    concepto TEXT NOT NULL,
+    referencia_id TEXT,
+    referencia_tabla TEXT,
+    saldo_anterior NUMERIC NOT NULL,
+    saldo_nuevo NUMERIC NOT NULL,
+    responsable TEXT,
+    notas TEXT
+);
+""".replace('{metodos}', ', '.join(f"'{m}'" for m in METODOS_PAGO))
+
+
+def _valor_sqlite(texto):
+    valor = parsear_valor_copy(texto)
+    if valor == 't':
+        return 1
+    if valor == 'f':
+        return 0
+    return valor
+
+
+def cargar_sqlite(directorio=DIRECTORIO_COPY, db_path=':memory:'):
+    """
+    Carga los archivos COPY en un espejo SQLite de las tablas (FK activadas) en una
+    única transacción y devuelve la conexión con la cantidad de filas por tabla.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(ESQUEMA_SQLITE)
+    filas = {}
+    with conn:
+        for archivo, tabla, columnas in TABLAS:
+            marcadores = ', '.join('?' * len(columnas))
+            sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({marcadores})"
+            with open(Path(directorio) / archivo, encoding='utf-8', newline='\n') as f:
+                valores = ([_valor_sqlite(v) for v in linea.rstrip('\n').split('\t')] for linea in f)
+                filas[tabla] = conn.executemany(sql, valores).rowcount
+    return conn, filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archivos COPY de la migración y su carga")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_exportar = sub.add_parser('exportar', help="Genera los TSV y load.sql desde una salida existente")
+    p_exportar.add_argument('--entrada', default='datos_migrados.json',
+                            help="datos_migrados.json o directorio NDJSON")
+    p_exportar.add_argument('--directorio', default=DIRECTORIO_COPY)
+
+    p_postgres = sub.add_parser('postgres', help="Carga los TSV en Postgres con psql")
+    p_postgres.add_argument('--dsn', default=None, help="Cadena de conexión (por defecto las variables PG*)")
+    p_postgres.add_argument('--directorio', default=DIRECTORIO_COPY)
+
+    p_sqlite = sub.add_parser('sqlite', help="Carga los TSV en un espejo SQLite para verificarlos")
+    p_sqlite.add_argument('--db', default=':memory:')
+    p_sqlite.add_argument('--directorio', default=DIRECTORIO_COPY)
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'exportar':
+        resumen = exportar_copy(args.entrada, args.directorio)
+        print(f"Archivos COPY generados en {resumen['directorio']}:")
+        for tabla, cantidad in resumen['filas'].items():
+            print(f"  - {tabla}: {cantidad}")
+    elif args.comando == 'postgres':
+        cargar_postgres(args.directorio, args.dsn)
+        print("Carga en Postgres completada")
+    else:
+        conn, filas = cargar_sqlite(args.directorio, args.db)
+        conn.close()
+        print("Carga en SQLite completada:")
+        for tabla, cantidad in filas.items():
+            print(f"  - {tabla}: {cantidad}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,556 @@
+"""
+Subida concurrente de la migración a una API REST estilo PostgREST (Supabase)
+
+scripts/importToFirebase.ts sube con importService.importarLote una colección
+detrás de otra. Este script sube las mismas entidades a las tablas de
+001_initial_schema.sql con asyncio:
+
+- las entidades se convierten en filas con el ConversorFilas de bulk_load.py (mismos
+  UUID v5 deterministas que la carga por COPY)
+- cada tabla se parte en lotes con tope de filas y de bytes, que se envían como
+  POST <url>/<tabla>?on_conflict=id con Prefer: resolution=merge-duplicates: es un
+  upsert por id, así reenviar un lote no duplica filas
+- un pool acotado de conexiones HTTP/1.1 keep-alive (asyncio streams, sin
+  dependencias externas) reparte los lotes de todas las tablas
+- las tablas se suben en paralelo y cada una espera a las que referencia
+  (REFERENCIAS: socios antes que ventas, ventas antes que items_venta, ...)
+- errores de red, 408, 429 y 5xx se reintentan con backoff exponencial y jitter
+  (respetando Retry-After); el resto de los 4xx corta la subida
+- cada lote confirmado queda en un checkpoint JSON: al volver a correr se saltean los
+  lotes ya subidos (si cambian la entrada o el tamaño de lote, el checkpoint se ignora)
+
+`servidor` levanta un sustituto local de PostgREST (upsert en memoria, chequeo de FK
+y fallos simulados) y `prueba` corre una subida completa contra él: primero sin
+reintentos, para que quede a medias, y después reanudando desde el checkpoint.
+
+Uso:
+    python bulk_upload.py subir --url https://<proyecto>.supabase.co/rest/v1 [--clave KEY]
+                                [--entrada datos_migrados.json] [--conexiones 6] [--lote 500]
+                                [--checkpoint ARCHIVO] [--reintentos 5]
+    python bulk_upload.py servidor [--puerto 8787] [--fallos 0.1]
+    python bulk_upload.py prueba [--entrada datos_migrados.json] [--fallos 0.3]
+
+La clave por defecto es la variable SUPABASE_SERVICE_ROLE_KEY.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import ssl
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from bulk_load import COLUMNAS, ConversorFilas, convertir_salida
+
+CONEXIONES = 6
+FILAS_POR_LOTE = 500
+BYTES_POR_LOTE = 1 << 20
+REINTENTOS = 5
+ESPERA_BASE = 0.5
+ESPERA_MAXIMA = 30.0
+TIMEOUT = 60.0
+
+# Claves foráneas de cada tabla (columna -> tabla referenciada), de 001_initial_schema.sql
+REFERENCIAS = {
+    'categorias_productos': {},
+    'productos': {'categoria_id': 'categorias_productos'},
+    'categorias_gastos': {},
+    'inversores': {},
+    'gastos_inversion': {'inversor_id': 'inversores'},
+    'socios': {},
+    'ventas': {'socio_id': 'socios'},
+    'items_venta': {'venta_id': 'ventas', 'producto_id': 'productos'},
+    'gastos': {'categoria_id': 'categorias_gastos'},
+    'movimientos_cuenta_corriente': {'socio_id': 'socios'},
+    'pagos': {'socio_id': 'socios', 'venta_id': 'ventas'},
+    'movimientos_stock': {'producto_id': 'productos'},
+    'movimientos_caja': {},
+}
+DEPENDENCIAS = {tabla: sorted(set(refs.values())) for tabla, refs in REFERENCIAS.items()}
+
+
+class ErrorHttp(Exception):
+    """Respuesta HTTP de error; reintentable para 408, 429 y 5xx"""
+
+    def __init__(self, status, cuerpo, espera=None):
+        super().__init__(f"HTTP {status}: {cuerpo[:300]!r}")
+        self.status = status
+        self.espera = espera
+        self.reintentable = status in (408, 429) or status >= 500
+
+
+class ErrorSubida(Exception):
+    """Un lote que no se pudo subir (error no reintentable o reintentos agotados)"""
+
+# ============================================================================
+# FILAS Y LOTES
+# ============================================================================
+
+class RecolectorFilas(ConversorFilas):
+    """Junta en memoria las filas de cada tabla como dicts {columna: valor}"""
+
+    def __init__(self):
+        super().__init__()
+        self.filas = {tabla: [] for tabla in COLUMNAS}
+
+    def _escribir(self, tabla, fila):
+        self.filas[tabla].append(dict(zip(COLUMNAS[tabla], fila)))
+        self.filas_por_tabla[tabla] += 1
+
+    def cerrar(self):
+        self._escribir_referencias()
+        return self.filas
+
+
+def filas_por_tabla(entrada):
+    """{tabla: [filas]} de una salida de la migración (JSON o directorio NDJSON)"""
+    return convertir_salida(entrada, RecolectorFilas()).cerrar()
+
+
+def partir_en_lotes(filas, max_filas=FILAS_POR_LOTE, max_bytes=BYTES_POR_LOTE):
+    """Cuerpos JSON (bytes) de hasta max_filas filas y, salvo filas sueltas más grandes, max_bytes"""
+    lotes = []
+    actual, tamano = [], 2
+    for fila in filas:
+        codificada = json.dumps(fila, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if actual and (len(actual) >= max_filas or tamano + len(codificada) + 1 > max_bytes):
+            lotes.append(b'[' + b','.join(actual) + b']')
+            actual, tamano = [], 2
+        actual.append(codificada)
+        tamano += len(codificada) + 1
+    if actual:
+        lotes.append(b'[' + b','.join(actual) + b']')
+    return lotes
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+async def leer_respuesta(reader):
+    """(status, cabeceras, cuerpo, keep_alive) de una respuesta HTTP/1.1"""
+    linea = await reader.readline()
+    if not linea:
+        raise ConnectionResetError("El servidor cerró la conexión")
+    partes = linea.split(None, 2)
+    version, status = partes[0], int(partes[1])
+    cabeceras = {}
+    while True:
+        linea = await reader.readline()
+        if linea in (b'\r\n', b'\n', b''):
+            break
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        cabeceras[nombre.strip().lower()] = valor.strip()
+
+    keep_alive = version == b'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+    if 'content-length' in cabeceras:
+        cuerpo = await reader.readexactly(int(cabeceras['content-length']))
+    elif cabeceras.get('transfer-encoding', '').lower() == 'chunked':
+        trozos = []
+        while True:
+            tamano = int((await reader.readline()).split(b';')[0], 16)
+            if tamano == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            trozos.append(await reader.readexactly(tamano))
+            await reader.readline()
+        cuerpo = b''.join(trozos)
+    elif status in (204, 304) or 100 <= status < 200:
+        cuerpo = b''
+    else:
+        cuerpo = await reader.read()
+        keep_alive = False
+    return status, cabeceras, cuerpo, keep_alive
+
+
+class PoolConexiones:
+    """Hasta `maximo` conexiones keep-alive al mismo host, reutilizadas entre solicitudes"""
+
+    def __init__(self, url, maximo=CONEXIONES, timeout=TIMEOUT):
+        partes = urlsplit(url)
+        self.host = partes.hostname
+        self.https = partes.scheme == 'https'
+        self.puerto = partes.port or (443 if self.https else 80)
+        self.ruta_base = partes.path.rstrip('/')
+        self.timeout = timeout
+        self._cupos = asyncio.Semaphore(maximo)
+        self._libres = []
+        self.abiertas = 0
+
+    async def _conectar(self):
+        contexto = ssl.create_default_context() if self.https else None
+        conexion = await asyncio.open_connection(self.host, self.puerto, ssl=contexto)
+        self.abiertas += 1
+        return conexion
+
+    async def solicitud(self, metodo, ruta, cabeceras, cuerpo=b''):
+        """Envía la solicitud por una conexión libre (o nueva); devuelve (status, cabeceras, cuerpo)"""
+        async with self._cupos:
+            reader, writer = self._libres.pop() if self._libres else await self._conectar()
+            try:
+                encabezado = [f"{metodo} {self.ruta_base}{ruta} HTTP/1.1", f"Host: {self.host}",
+                              f"Content-Length: {len(cuerpo)}", "Connection: keep-alive"]
+                encabezado += [f"{nombre}: {valor}" for nombre, valor in cabeceras.items()]
+                writer.write(('\r\n'.join(encabezado) + '\r\n\r\n').encode('latin-1') + cuerpo)
+                await writer.drain()
+                status, respuesta, datos, keep_alive = await asyncio.wait_for(leer_respuesta(reader), self.timeout)
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._libres.append((reader, writer))
+            else:
+                writer.close()
+            return status, respuesta, datos
+
+    async def cerrar(self):
+        for _, writer in self._libres:
+            writer.close()
+        for _, writer in self._libres:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        self._libres = []
+
+# ============================================================================
+# CHECKPOINT
+# ============================================================================
+
+class Checkpoint:
+    """Lotes confirmados por tabla, guardados en JSON después de cada uno"""
+
+    def __init__(self, path, huella):
+        self.path = Path(path) if path else None
+        self.huella = huella
+        self.lotes = {}
+        if self.path and self.path.is_file():
+            with open(self.path, encoding='utf-8') as f:
+                datos = json.load(f)
+            if datos.get('huella') == huella:
+                self.lotes = {tabla: set(indices) for tabla, indices in datos['lotes'].items()}
+
+    def hechos(self, tabla):
+        return self.lotes.get(tabla, set())
+
+    def marcar(self, tabla, indice):
+        self.lotes.setdefault(tabla, set()).add(indice)
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'huella': self.huella, 'lotes': {t: sorted(i) for t, i in self.lotes.items()}}, f)
+        os.replace(tmp, self.path)
+
+
+def huella_lotes(lotes_por_tabla):
+    """Hash de los cuerpos de todos los lotes: cambia si cambian la entrada o el tamaño de lote"""
+    h = hashlib.sha256()
+    for tabla, lotes in lotes_por_tabla.items():
+        h.update(tabla.encode())
+        for cuerpo in lotes:
+            h.update(hashlib.sha256(cuerpo).digest())
+    return h.hexdigest()
+
+# ============================================================================
+# SUBIDA
+# ============================================================================
+
+class Subida:
+    """Sube los lotes de todas las tablas respetando REFERENCIAS, con reintentos y checkpoint"""
+
+    def __init__(self, pool, lotes_por_tabla, checkpoint, clave=None, reintentos=REINTENTOS,
+                 espera_base=ESPERA_BASE):
+        self.pool = pool
+        self.lotes = lotes_por_tabla
+        self.checkpoint = checkpoint
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.cabeceras = {'Content-Type': 'application/json',
+                          'Prefer': 'resolution=merge-duplicates,return=minimal'}
+        if clave:
+            self.cabeceras.update({'apikey': clave, 'Authorization': f'Bearer {clave}'})
+        self.enviados = 0
+        self.salteados = 0
+        self.reintentados = 0
+        self.segundos = {}
+
+    async def _subir_lote(self, tabla, indice, cuerpo):
+        for intento in range(self.reintentos + 1):
+            try:
+                status, cabeceras, respuesta = await self.pool.solicitud(
+                    'POST', f'/{tabla}?on_conflict=id', self.cabeceras, cuerpo)
+                if status >= 300:
+                    espera = cabeceras.get('retry-after')
+                    raise ErrorHttp(status, respuesta.decode('utf-8', 'replace'),
+                                    float(espera) if espera and espera.isdigit() else None)
+                break
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, ErrorHttp) as e:
+                if isinstance(e, ErrorHttp) and not e.reintentable:
+                    raise ErrorSubida(f"{tabla}, lote {indice + 1}: {e}") from e
+                if intento == self.reintentos:
+                    raise ErrorSubida(f"{tabla}, lote {indice + 1}: {e!r} ({intento + 1} intentos)") from e
+                self.reintentados += 1
+                espera = getattr(e, 'espera', None)
+                if espera is None:
+                    espera = min(ESPERA_MAXIMA, self.espera_base * 2 ** intento) * random.uniform(0.5, 1.0)
+                await asyncio.sleep(espera)
+        self.enviados += 1
+        self.checkpoint.marcar(tabla, indice)
+
+    async def _subir_tabla(self, tabla, listas):
+        for referenciada in DEPENDENCIAS[tabla]:
+            await listas[referenciada].wait()
+        inicio = time.perf_counter()
+        hechos = self.checkpoint.hechos(tabla)
+        pendientes = [(i, cuerpo) for i, cuerpo in enumerate(self.lotes[tabla]) if i not in hechos]
+        self.salteados += len(self.lotes[tabla]) - len(pendientes)
+        async with asyncio.TaskGroup() as grupo:
+            for indice, cuerpo in pendientes:
+                grupo.create_task(self._subir_lote(tabla, indice, cuerpo))
+        self.segundos[tabla] = time.perf_counter() - inicio
+        listas[tabla].set()
+
+    async def correr(self):
+        """Sube todo; si un lote falla se cancela el resto y se propaga ErrorSubida"""
+        listas = {tabla: asyncio.Event() for tabla in self.lotes}
+        try:
+            async with asyncio.TaskGroup() as grupo:
+                for tabla in self.lotes:
+                    grupo.create_task(self._subir_tabla(tabla, listas))
+        except* ErrorSubida as grupo_errores:
+            raise _primer_error(grupo_errores) from None
+        finally:
+            await self.pool.cerrar()
+
+
+def _primer_error(grupo):
+    """Primer ErrorSubida de un ExceptionGroup (anidado por los TaskGroup de cada tabla)"""
+    while isinstance(grupo, BaseExceptionGroup):
+        grupo = grupo.exceptions[0]
+    return grupo
+
+
+def preparar(entrada, max_filas=FILAS_POR_LOTE, max_bytes=BYTES_POR_LOTE):
+    """(filas por tabla, lotes por tabla) de una salida de la migración"""
+    filas = filas_por_tabla(entrada)
+    lotes = {tabla: partir_en_lotes(filas[tabla], max_filas, max_bytes) for tabla in REFERENCIAS}
+    return filas, lotes
+
+
+async def subir(url, lotes_por_tabla, clave=None, conexiones=CONEXIONES, checkpoint_path=None,
+                reintentos=REINTENTOS, espera_base=ESPERA_BASE):
+    """Sube los lotes a url (base REST) y devuelve la Subida con sus contadores"""
+    checkpoint = Checkpoint(checkpoint_path, huella_lotes(lotes_por_tabla))
+    subida = Subida(PoolConexiones(url, conexiones), lotes_por_tabla, checkpoint, clave, reintentos, espera_base)
+    await subida.correr()
+    return subida
+
+
+def imprimir_subida(subida, filas):
+    for tabla, lotes in subida.lotes.items():
+        if tabla in subida.segundos:
+            print(f"  - {tabla:<30} {len(filas[tabla]):>6} filas  {len(lotes):>3} lotes  "
+                  f"{subida.segundos[tabla]:6.2f}s")
+    print(f"Lotes enviados: {subida.enviados} | salteados (checkpoint): {subida.salteados} | "
+          f"reintentos: {subida.reintentados} | conexiones abiertas: {subida.pool.abiertas}")
+
+# ============================================================================
+# SERVIDOR DE PRUEBA
+# ============================================================================
+
+class ServidorPrueba:
+    """
+    Sustituto local de PostgREST: POST /<tabla> con un array JSON hace upsert por id
+    en memoria, rechaza con 409 (23503) las filas cuya FK no existe todavía y con
+    `fallos` devuelve 503 o corta la conexión en esa proporción de solicitudes.
+    """
+
+    def __init__(self, fallos=0.0, clave=None, semilla=None):
+        self.fallos = fallos
+        self.clave = clave
+        self.tablas = {tabla: {} for tabla in REFERENCIAS}
+        self.solicitudes = 0
+        self.conexiones = 0
+        self.fallos_simulados = 0
+        self._azar = random.Random(semilla)
+        self._servidor = None
+        self._atendiendo = set()
+
+    async def iniciar(self, host='127.0.0.1', puerto=0):
+        """Empieza a escuchar; devuelve la URL base"""
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        puerto = self._servidor.sockets[0].getsockname()[1]
+        return f"http://{host}:{puerto}"
+
+    async def detener(self):
+        """Deja de escuchar y espera a que terminen las conexiones abiertas (los clientes ya cerraron)"""
+        self._servidor.close()
+        if self._atendiendo:
+            await asyncio.wait(self._atendiendo, timeout=5)
+        await self._servidor.wait_closed()
+
+    async def _atender(self, reader, writer):
+        self.conexiones += 1
+        tarea = asyncio.current_task()
+        self._atendiendo.add(tarea)
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, objetivo, _ = linea.decode('latin-1').split(' ', 2)
+                cabeceras = {}
+                while (linea := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                cuerpo = await reader.readexactly(int(cabeceras.get('content-length', 0)))
+                self.solicitudes += 1
+
+                if self.fallos and self._azar.random() < self.fallos:
+                    self.fallos_simulados += 1
+                    if self._azar.random() < 0.5:
+                        break  # Conexión cortada sin respuesta
+                    self._responder(writer, 503, {'message': 'Servicio no disponible (simulado)'},
+                                    {'Retry-After': '0'})
+                else:
+                    status, respuesta = self._procesar(metodo, objetivo, cabeceras, cuerpo)
+                    self._responder(writer, status, respuesta)
+                await writer.drain()
+                if cabeceras.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._atendiendo.discard(tarea)
+            writer.close()
+
+    def _responder(self, writer, status, cuerpo=None, cabeceras=None):
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b''
+        lineas = [f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}", f"Content-Length: {len(datos)}"]
+        if datos:
+            lineas.append("Content-Type: application/json")
+        lineas += [f"{nombre}: {valor}" for nombre, valor in (cabeceras or {}).items()]
+        writer.write(('\r\n'.join(lineas) + '\r\n\r\n').encode('latin-1') + datos)
+
+    def _procesar(self, metodo, objetivo, cabeceras, cuerpo):
+        if self.clave and cabeceras.get('apikey') != self.clave:
+            return 401, {'message': 'apikey inválida'}
+        tabla = urlsplit(objetivo).path.rstrip('/').rsplit('/', 1)[-1]
+        if metodo != 'POST' or tabla not in self.tablas:
+            return 404, {'message': f'{metodo} {objetivo} no existe'}
+        try:
+            filas = json.loads(cuerpo)
+        except ValueError:
+            return 400, {'message': 'JSON inválido'}
+        for fila in filas:
+            for columna, referenciada in REFERENCIAS[tabla].items():
+                valor = fila.get(columna)
+                if valor is not None and valor not in self.tablas[referenciada]:
+                    return 409, {'code': '23503', 'message': f'{tabla}.{columna} referencia a '
+                                                             f'{referenciada} {valor} inexistente'}
+        for fila in filas:
+            self.tablas[tabla][fila['id']] = fila
+        return 201, None
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+async def _servir(puerto, fallos, clave):
+    servidor = ServidorPrueba(fallos, clave)
+    url = await servidor.iniciar(puerto=puerto)
+    print(f"Servidor de prueba en {url} (Ctrl+C para terminar)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(f"\nSolicitudes: {servidor.solicitudes} | conexiones: {servidor.conexiones} | "
+              f"fallos simulados: {servidor.fallos_simulados}")
+        for tabla, filas in servidor.tablas.items():
+            print(f"  - {tabla}: {len(filas)}")
+
+
+async def _prueba(entrada, fallos, conexiones, lote):
+    """Sube contra el servidor local: una vez sin reintentos y otra reanudando desde el checkpoint"""
+    filas, lotes = preparar(entrada, lote)
+    servidor = ServidorPrueba(fallos, clave='prueba', semilla=0)
+    url = await servidor.iniciar()
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = Path(tmp) / 'subida.checkpoint.json'
+        try:
+            print(f"1) Sin reintentos, con {fallos:.0%} de fallos simulados")
+            subida = await subir(url, lotes, 'prueba', conexiones, checkpoint, reintentos=0)
+            imprimir_subida(subida, filas)
+        except ErrorSubida as e:
+            print(f"   Cortada: {e}")
+        print("2) Reanudando desde el checkpoint, con reintentos")
+        subida = await subir(url, lotes, 'prueba', conexiones, checkpoint, espera_base=0.01)
+        imprimir_subida(subida, filas)
+    await servidor.detener()
+
+    distintas = [tabla for tabla in REFERENCIAS if len(servidor.tablas[tabla]) != len(filas[tabla])]
+    print(f"\nServidor: {servidor.solicitudes} solicitudes en {servidor.conexiones} conexiones, "
+          f"{servidor.fallos_simulados} fallos simulados")
+    print("Filas en el servidor: " + ("OK, iguales a la salida" if not distintas
+                                      else f"DISTINTAS en {', '.join(distintas)}"))
+    return 0 if not distintas else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Subida concurrente de la migración a una API PostgREST")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_subir = sub.add_parser('subir', help="Sube la salida de la migración")
+    p_subir.add_argument('--url', required=True, help="Base REST, p. ej. https://<proyecto>.supabase.co/rest/v1")
+    p_subir.add_argument('--clave', default=os.environ.get('SUPABASE_SERVICE_ROLE_KEY'),
+                         help="apikey (por defecto SUPABASE_SERVICE_ROLE_KEY)")
+    p_subir.add_argument('--checkpoint', help="Por defecto <entrada>.checkpoint.json")
+    p_subir.add_argument('--reintentos', type=int, default=REINTENTOS)
+
+    p_servidor = sub.add_parser('servidor', help="Levanta el sustituto local de PostgREST")
+    p_servidor.add_argument('--puerto', type=int, default=8787)
+    p_servidor.add_argument('--fallos', type=float, default=0.0, help="Proporción de solicitudes que fallan")
+    p_servidor.add_argument('--clave', default=None, help="apikey exigida (por defecto ninguna)")
+
+    p_prueba = sub.add_parser('prueba', help="Subida completa contra el servidor local, con fallos y reanudación")
+    p_prueba.add_argument('--fallos', type=float, default=0.3)
+
+    for p in (p_subir, p_prueba):
+        p.add_argument('--entrada', default='datos_migrados.json', help="JSON o directorio NDJSON de la migración")
+        p.add_argument('--conexiones', type=int, default=CONEXIONES)
+        p.add_argument('--lote', type=int, default=FILAS_POR_LOTE, help="Filas por lote")
+    args = parser.parse_args(argv)
+
+    if args.comando == 'servidor':
+        try:
+            asyncio.run(_servir(args.puerto, args.fallos, args.clave))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.comando == 'prueba':
+        return asyncio.run(_prueba(args.entrada, args.fallos, args.conexiones, args.lote))
+
+    filas, lotes = preparar(args.entrada, args.lote)
+    checkpoint = args.checkpoint or f"{Path(args.entrada).with_suffix('')}.checkpoint.json"
+    print(f"Subiendo {sum(len(f) for f in filas.values())} filas en {sum(len(l) for l in lotes.values())} "
+          f"lotes a {args.url} ({args.conexiones} conexiones)")
+    inicio = time.perf_counter()
+    try:
+        subida = asyncio.run(subir(args.url, lotes, args.clave, args.conexiones, checkpoint, args.reintentos))
+    except ErrorSubida as e:
+        print(f"ERROR: {e}\nLos lotes confirmados quedaron en {checkpoint}: volver a correr para reanudar")
+        return 1
+    imprimir_subida(subida, filas)
+    print(f"Subida completa en {time.perf_counter() - inicio:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Flujo de caja de la migración (tabla movimientos_caja) con saldo por medio de pago
+
+Las entradas y salidas de plata están repartidas en varias colecciones; cada una es una
+fuente de movimientos de caja (tipo INGRESO / EGRESO y categoría del enum del esquema):
+
+- ventas: INGRESO / VENTA por lo cobrado en el momento (montoPagado, lo mismo que el
+  pago de la cuenta corriente); lo fiado (saldoPendiente) no entra a la caja
+- gastosInversion: cada gasto lo pagó un inversor con su plata, así que es un
+  INGRESO / APORTE del inversor y el EGRESO / GASTO del mismo monto en pesos
+- gastosOperativos: EGRESO / GASTO (SUELDO para la mano de obra)
+- gastosFijos: EGRESO / GASTO en su fecha (no se inventan las cuotas de los meses
+  siguientes: la hoja no registra cuándo se pagó cada una)
+
+El medio de pago se lleva al enum metodo_pago como en la carga COPY ('EFECTIVO/TRAN' ->
+EFECTIVO, ver bulk_load.metodo_pago_sql). Lo pagado en especie (WEED) no mueve caja.
+La hoja de inversión no tiene medio de pago: los aportes y sus gastos van en efectivo.
+
+Cada fuente se guarda completa en memoria, como una lista de tuplas compactas (una o
+dos por venta o gasto), y se ordena una vez por fecha. La hoja casi siempre viene
+ordenada: hay unas pocas filas fuera de lugar, como fechas mal tipeadas, así que el
+sort es casi lineal. Guardarlas es inevitable: la migración envía cada entidad al
+destino a medida que la produce y los movimientos de caja se emiten recién al final,
+después de todas las colecciones. La memoria es proporcional a la historia (tuplas,
+no registros). movimientos() intercala las fuentes ya ordenadas con heapq.merge y va
+acumulando el saldo de cada medio de pago: no se arma una lista intercalada ni los
+MovimientoCaja de todo el período, que se generan de a uno a medida que el destino
+los consume. A igual fecha van primero los aportes, después las ventas y al final
+los gastos.
+
+Como en el libro de stock, el saldo refleja lo registrado: la hoja anota varios cobros
+mixtos como efectivo y casi ningún ingreso por transferencia, así que el saldo de
+TRANSFERENCIA queda negativo. Los IDs salen del ID de la entidad de origen y de la
+categoría del movimiento.
+
+Uso:
+    python cash_flow.py [--entrada datos_migrados.json] [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD]
+"""
+
+import argparse
+import heapq
+import sys
+from itertools import groupby
+from operator import itemgetter
+
+from bulk_load import metodo_pago_sql
+from content_ids import id_contenido
+from records import MovimientoCaja, clave_fecha
+
+INGRESO = "INGRESO"
+EGRESO = "EGRESO"
+
+VENTA = "VENTA"
+GASTO = "GASTO"
+SUELDO = "SUELDO"
+APORTE = "APORTE"
+
+# Pagos en especie: no son movimientos de caja
+PAGOS_EN_ESPECIE = frozenset({"WEED"})
+METODO_INVERSION = "EFECTIVO"
+CATEGORIAS_SUELDO = frozenset({"cat-mano-obra"})
+
+
+def metodo_caja(valor):
+    """Medio de pago del enum para la caja, o None si el pago fue en especie"""
+    if (valor or '').upper() in PAGOS_EN_ESPECIE:
+        return None
+    return metodo_pago_sql(valor)
+
+# ============================================================================
+# FUENTES
+# ============================================================================
+# Cada fuente da tuplas (fecha, tipo, categoria, monto, metodo, concepto, referenciaId,
+# referenciaTabla, responsable) de una entidad (registro o dict con las claves JSON)
+
+def _desde_venta(venta):
+    cobrado = venta["montoPagado"] or 0
+    metodo = metodo_caja(venta["metodoPago"])
+    if cobrado and metodo:
+        yield (venta["fecha"], INGRESO, VENTA, cobrado, metodo, f"Cobro venta #{venta['numero']}",
+               venta["id"], "ventas", None)
+
+
+def _desde_gasto_inversion(gasto):
+    monto = gasto["montoPesos"] or 0
+    if monto > 0:
+        detalle = gasto["detalle"] or "Gasto de inversión"
+        yield (gasto["fecha"], INGRESO, APORTE, monto, METODO_INVERSION, f"Aporte para {detalle}",
+               gasto["id"], "gastos_inversion", gasto["inversorId"])
+        yield (gasto["fecha"], EGRESO, GASTO, monto, METODO_INVERSION, detalle,
+               gasto["id"], "gastos_inversion", gasto["inversorId"])
+
+
+def _desde_gasto(gasto):
+    metodo = metodo_caja(gasto["metodoPago"])
+    if gasto["monto"] and gasto["pagado"] and metodo:
+        categoria = SUELDO if gasto["categoriaId"] in CATEGORIAS_SUELDO else GASTO
+        yield (gasto["fecha"], EGRESO, categoria, gasto["monto"], metodo, gasto["detalle"],
+               gasto["id"], "gastos", None)
+
+
+# Orden de las fuentes: define qué va primero a igual fecha
+FUENTES = {
+    "gastosInversion": _desde_gasto_inversion,
+    "ventas": _desde_venta,
+    "gastosOperativos": _desde_gasto,
+    "gastosFijos": _desde_gasto,
+}
+
+# ============================================================================
+# FLUJO DE CAJA
+# ============================================================================
+
+class FlujoCaja:
+    """
+    Flujo de caja de la migración. Se alimenta con agregar (en el orden de la
+    migración, con las entidades de cualquier colección), que guarda en memoria las
+    tuplas de cada fuente, y movimientos() genera la línea de tiempo con los saldos
+    por medio de pago.
+    """
+
+    def __init__(self):
+        self._fuentes = {coleccion: [] for coleccion in FUENTES}
+        self.saldos = {}
+
+    def agregar(self, coleccion, entidad):
+        """Registra los movimientos de caja de la entidad; las colecciones sin caja se ignoran"""
+        fuente = self._fuentes.get(coleccion)
+        if fuente is not None and entidad["fecha"]:
+            fuente.extend(FUENTES[coleccion](entidad))
+
+    def movimientos(self):
+        """
+        Genera los MovimientoCaja en orden de fecha intercalando las fuentes, con
+        saldoAnterior / saldoNuevo del medio de pago de cada uno. Consume lo agregado.
+        """
+        clave = itemgetter(0)
+        for fuente in self._fuentes.values():
+            fuente.sort(key=clave)
+        fuentes = list(self._fuentes.values())
+        self._fuentes = {coleccion: [] for coleccion in FUENTES}
+
+        saldos = self.saldos
+        for fecha, tipo, categoria, monto, metodo, concepto, referencia_id, tabla, responsable in \
+                heapq.merge(*fuentes, key=clave):
+            anterior = saldos.get(metodo, 0)
+            saldos[metodo] = round(anterior + (monto if tipo == INGRESO else -monto), 2)
+            yield MovimientoCaja(
+                id=id_contenido("caja", referencia_id, categoria),
+                fecha=clave_fecha(fecha),
+                tipo=tipo,
+                categoria=categoria,
+                monto=monto,
+                metodo_pago=metodo,
+                concepto=concepto,
+                referencia_id=referencia_id,
+                referencia_tabla=tabla,
+                saldo_anterior=anterior,
+                saldo_nuevo=saldos[metodo],
+                responsable=responsable
+            )
+
+# ============================================================================
+# CONSULTAS SOBRE UNA SALIDA
+# ============================================================================
+
+def iter_movimientos_caja(entrada):
+    """Itera los movimientosCaja de una salida de la migración (ya vienen en orden de fecha)"""
+    from ndjson_output import iter_salida
+
+    for coleccion, registro in iter_salida(entrada):
+        if coleccion == "movimientosCaja":
+            yield registro
+
+
+def por_dia(movimientos):
+    """
+    Agrupa movimientos ordenados por fecha en (día, ingresos, egresos, saldos), con los
+    saldos de cada medio de pago al cierre del día. Recorre los movimientos en streaming.
+    """
+    saldos = {}
+    for dia, del_dia in groupby(movimientos, key=lambda m: m["fecha"][:10]):
+        ingresos = egresos = 0
+        for movimiento in del_dia:
+            if movimiento["tipo"] == INGRESO:
+                ingresos += movimiento["monto"]
+            else:
+                egresos += movimiento["monto"]
+            saldos[movimiento["metodoPago"]] = movimiento["saldoNuevo"]
+        yield dia, ingresos, egresos, dict(saldos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flujo de caja diario de una salida migrada")
+    parser.add_argument('--entrada', default='datos_migrados.json',
+                        help="JSON o directorio NDJSON de la migración")
+    parser.add_argument('--desde', help="Primer día a listar (AAAA-MM-DD)")
+    parser.add_argument('--hasta', help="Último día a listar (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
+    metodos = ("EFECTIVO", "TRANSFERENCIA")
+    print(f"{'DIA':<12} {'INGRESOS':>14} {'EGRESOS':>14}" + ''.join(f" {m:>14}" for m in metodos))
+    dias = 0
+    cierre = {}
+    for dia, ingresos, egresos, saldos in por_dia(iter_movimientos_caja(args.entrada)):
+        if args.hasta and dia > args.hasta:
+            break
+        cierre = saldos
+        if args.desde and dia < args.desde:
+            continue
+        dias += 1
+        print(f"{dia:<12} {ingresos:>14,.0f} {egresos:>14,.0f}"
+              + ''.join(f" {saldos.get(m, 0):>14,.0f}" for m in metodos))
+    print(f"\nDías con movimientos: {dias}")
+    for metodo, saldo in cierre.items():
+        print(f"  - Saldo {metodo}: ${saldo:,.2f}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
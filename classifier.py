@@ -0,0 +1,123 @@
+"""
+Clasificación de filas por reglas de palabras clave
+
+Las reglas (palabra -> tipo, categoriaId, productoId o categoria) se leen de
+reglas_clasificacion.json, con una sección por hoja ("stock" e "inversion"). Cada
+sección se compila una sola vez en un único regex de alternativas, así un DETALLE se
+recorre una vez sin importar cuántas reglas haya, y el resultado se memoriza por
+DETALLE distinto (la mayoría se repiten).
+
+Si varias reglas coinciden, cada campo lo define la primera regla del archivo que lo
+tenga. Los DETALLE que no resuelven el campo pedido se cuentan en `sin_regla` para
+poder completar las reglas.
+
+Uso:
+    python classifier.py [--excel ARCHIVO] [--reglas reglas_clasificacion.json]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+REGLAS_PATH = 'reglas_clasificacion.json'
+
+# Sin archivo de reglas se conserva la clasificación original de ventas por palabra clave
+REGLAS_POR_DEFECTO = {
+    "stock": [{"palabra": p, "tipo": "VENTA"} for p in ('WEED', 'ESQUEJE', 'KIT')],
+    "inversion": [],
+}
+
+
+class Clasificador:
+    """Reglas de una hoja compiladas en un regex con todas las palabras clave"""
+
+    def __init__(self, reglas):
+        self.reglas = list(reglas)
+        self._reglas_por_palabra = defaultdict(list)
+        for orden, regla in enumerate(self.reglas):
+            self._reglas_por_palabra[regla["palabra"].upper()].append(orden)
+
+        # Lookahead para encontrar también coincidencias superpuestas ('MANO DE OBRA' y 'OBRA');
+        # las palabras más largas primero para que ganen en la misma posición
+        palabras = sorted(self._reglas_por_palabra, key=len, reverse=True)
+        self._patron = re.compile(
+            '(?=(' + '|'.join(map(re.escape, palabras)) + '))') if palabras else None
+        self._cache = {}
+        self.sin_regla = Counter()
+
+    def resolver(self, detalle):
+        """Devuelve {campo: valor} de las reglas que coinciden con el DETALLE"""
+        if not detalle or self._patron is None:
+            return {}
+        texto = detalle.upper()
+        campos = self._cache.get(texto)
+        if campos is None:
+            ordenes = sorted({o for m in self._patron.finditer(texto) for o in self._reglas_por_palabra[m.group(1)]})
+            campos = {}
+            for orden in ordenes:
+                for campo, valor in self.reglas[orden].items():
+                    if campo != "palabra":
+                        campos.setdefault(campo, valor)
+            self._cache[texto] = campos
+        return campos
+
+    def valor(self, detalle, campo, defecto=None):
+        """Valor de un campo para el DETALLE; si ninguna regla lo define lo cuenta en sin_regla"""
+        valor = self.resolver(detalle).get(campo)
+        if valor is None:
+            self.sin_regla[detalle or ''] += 1
+            return defecto
+        return valor
+
+
+def cargar_reglas(path=REGLAS_PATH):
+    """Devuelve {hoja: Clasificador}; sin archivo usa REGLAS_POR_DEFECTO"""
+    secciones = REGLAS_POR_DEFECTO
+    if path and Path(path).exists():
+        with open(path, encoding='utf-8') as f:
+            secciones = json.load(f)
+    return {hoja: Clasificador(secciones.get(hoja, [])) for hoja in REGLAS_POR_DEFECTO}
+
+
+def huella_reglas(reglas):
+    """SHA-256 de las reglas cargadas, para invalidar la migración incremental"""
+    contenido = json.dumps({hoja: c.reglas for hoja, c in reglas.items()}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def imprimir_sin_regla(clasificador, titulo, limite=None):
+    """Lista los DETALLE sin regla, de más a menos frecuente"""
+    pendientes = clasificador.sin_regla.most_common(limite)
+    print(f"{titulo}: {len(clasificador.sin_regla)} detalles sin regla "
+          f"({sum(clasificador.sin_regla.values())} filas)")
+    for detalle, cantidad in pendientes:
+        print(f"  {cantidad:>4}  {detalle or '(vacío)'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lista los DETALLE que no cubre ninguna regla")
+    parser.add_argument('--excel', default='Sheets actual 19-01-26.xlsx')
+    parser.add_argument('--reglas', default=REGLAS_PATH)
+    args = parser.parse_args(argv)
+
+    from migrate_excel_to_new_model import migrar_inversion, iter_registros_stock
+    from workbook_cache import cargar_snapshot
+
+    reglas = cargar_reglas(args.reglas)
+    wb = cargar_snapshot(args.excel)
+    migrar_inversion(wb['INVERSION  GASTOS'].iter_rows(values_only=True), reglas=reglas["inversion"])
+    for _ in iter_registros_stock(wb['STOCK Y VENTAS'].iter_rows(values_only=True), reglas=reglas["stock"]):
+        pass
+
+    imprimir_sin_regla(reglas["stock"], "STOCK Y VENTAS (gastos)")
+    print()
+    imprimir_sin_regla(reglas["inversion"], "INVERSION GASTOS")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,180 @@
+"""
+Punto de entrada único de las herramientas de migración y análisis del Excel
+
+    python cli.py migrate [opciones de migrate_excel_to_new_model.py]
+    python cli.py analyze [hojas|detallado|interpretacion|columnar] [--excel ARCHIVO] [--por mes|cliente|...]
+                          [--usd]
+    python cli.py report [SALIDA] [--informe ARCHIVO]
+    python cli.py upload subir|servidor|prueba [opciones de bulk_upload.py]
+    python cli.py diff ANTERIOR NUEVA [--salida cambios.ndjson] [--colecciones ...]
+    python cli.py simulate [opciones de scenario_sim.py]
+    python cli.py validate [--entrada SALIDA] [--excel ARCHIVO] [--salida violaciones.json]
+    python cli.py query [--entrada SALIDA] construir|consultar|deudores [opciones de query_index.py]
+
+Los módulos se importan recién al elegir el subcomando (openpyxl y NumPy solo cuando
+hacen falta), así --help y `report`, que lee una salida ya generada sin abrir el Excel,
+arrancan al instante. Cada módulo sigue sirviendo como script y como librería: la
+migración completa es migrate_excel_to_new_model.migrar(), que se puede llamar
+repetidas veces desde un mismo proceso.
+"""
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+SALIDA_PATH = 'datos_migrados.json'
+
+# Análisis disponibles: nombre -> (módulo, función que recibe el workbook)
+ANALISIS = {
+    'hojas': ('analyze_excel', 'analizar_hojas'),
+    'detallado': ('analyze_detailed', 'analisis_detallado'),
+    'interpretacion': ('final_analysis', 'interpretacion'),
+    'columnar': ('analytics', 'main'),
+}
+
+# ============================================================================
+# SUBCOMANDOS
+# ============================================================================
+
+def cmd_migrate(args, resto):
+    """Delega en el main de la migración con el resto de los argumentos"""
+    from migrate_excel_to_new_model import main
+
+    return main(resto)
+
+def cmd_analyze(args, resto):
+    """Corre uno de los análisis del Excel"""
+    modulo, funcion = ANALISIS[args.analisis]
+    if args.analisis == 'columnar':
+        argv = ['--excel', args.excel] + [f'--por={por}' for por in args.por or ()]
+        if args.usd:
+            argv.append('--usd')
+        return getattr(importlib.import_module(modulo), funcion)(argv)
+    if args.por or args.usd:
+        raise SystemExit("--por y --usd solo aplican al análisis columnar")
+
+    from workbook_cache import cargar_snapshot
+
+    wb = cargar_snapshot(args.excel)
+    getattr(importlib.import_module(modulo), funcion)(wb)
+    wb.close()
+
+def cmd_report(args, resto):
+    """Estadísticas de una salida ya generada (y del informe de ejecución, si se pide)"""
+    from migrate_excel_to_new_model import imprimir_estadisticas
+
+    salida = Path(args.salida)
+    if salida.is_dir():
+        from ndjson_output import leer_manifiesto
+
+        manifiesto = leer_manifiesto(salida)
+        if manifiesto is None:
+            raise SystemExit(f"{salida} no tiene manifest.json")
+        estadisticas = manifiesto["estadisticas"]
+    elif salida.exists():
+        import json
+
+        with open(salida, encoding='utf-8') as f:
+            estadisticas = json.load(f)["estadisticas"]
+    else:
+        raise SystemExit(f"No existe la salida {salida}: correr primero `cli.py migrate`")
+    imprimir_estadisticas(estadisticas, salida)
+
+    if args.informe:
+        from run_report import cargar_informe, imprimir_etapas
+
+        informe = cargar_informe(args.informe)
+        print(f"\nINFORME DE EJECUCIÓN ({informe['inicio']}, {informe['total']['segundos']:.2f}s)")
+        imprimir_etapas(informe["etapas"], "memoria_pico_mb" in informe["total"])
+
+def cmd_diff(args, resto):
+    """Delega en el main del change set entre dos salidas (migration_diff.py)"""
+    from migration_diff import main
+
+    return main(resto)
+
+def cmd_simulate(args, resto):
+    """Delega en el main del simulador de escenarios (scenario_sim.py)"""
+    from scenario_sim import main
+
+    return main(resto)
+
+def cmd_validate(args, resto):
+    """Delega en el main del validador de la salida (output_validator.py)"""
+    from output_validator import main
+
+    return main(resto)
+
+def cmd_query(args, resto):
+    """Delega en el main de las consultas indexadas (query_index.py)"""
+    from query_index import main
+
+    return main(resto)
+
+def cmd_upload(args, resto):
+    """Delega en el main de la subida concurrente (bulk_upload.py)"""
+    from bulk_upload import main
+
+    return main(resto)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description="Migración y análisis del Excel del club")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_migrate = sub.add_parser('migrate', add_help=False,
+                               help="Migra el Excel al nuevo modelo (ver `migrate --help`)")
+    p_migrate.set_defaults(funcion=cmd_migrate, reenviar=True)
+
+    p_analyze = sub.add_parser('analyze', help="Análisis del Excel actual")
+    p_analyze.add_argument('analisis', nargs='?', choices=ANALISIS, default='hojas')
+    p_analyze.add_argument('--excel', default=EXCEL_PATH)
+    p_analyze.add_argument('--por', action='append',
+                           help="Agrupación del análisis columnar (mes, cliente, entregador, modo_pago)")
+    p_analyze.add_argument('--usd', action='store_true',
+                           help="Ingresos y egresos del análisis columnar también en dólares (fx_rates.py)")
+    p_analyze.set_defaults(funcion=cmd_analyze, reenviar=False)
+
+    p_report = sub.add_parser('report', help="Estadísticas de una salida ya migrada, sin abrir el Excel")
+    p_report.add_argument('salida', nargs='?', default=SALIDA_PATH,
+                          help=f"JSON o directorio NDJSON de la migración; por defecto {SALIDA_PATH}")
+    p_report.add_argument('--informe', help="Informe de ejecución guardado con `migrate --informe`")
+    p_report.set_defaults(funcion=cmd_report, reenviar=False)
+
+    p_upload = sub.add_parser('upload', add_help=False,
+                              help="Sube la salida a una API PostgREST (ver `upload --help`)")
+    p_upload.set_defaults(funcion=cmd_upload, reenviar=True)
+
+    p_diff = sub.add_parser('diff', add_help=False,
+                            help="Change set entre dos salidas de la migración (ver `diff --help`)")
+    p_diff.set_defaults(funcion=cmd_diff, reenviar=True)
+
+    p_simulate = sub.add_parser('simulate', add_help=False,
+                                help="Escenarios de producción y rentabilidad (ver `simulate --help`)")
+    p_simulate.set_defaults(funcion=cmd_simulate, reenviar=True)
+
+    p_validate = sub.add_parser('validate', add_help=False,
+                                help="Integridad y calidad de datos de una salida (ver `validate --help`)")
+    p_validate.set_defaults(funcion=cmd_validate, reenviar=True)
+
+    p_query = sub.add_parser('query', add_help=False,
+                             help="Consultas indexadas sobre una salida migrada (ver `query --help`)")
+    p_query.set_defaults(funcion=cmd_query, reenviar=True)
+    return parser
+
+def main(argv=None):
+    parser = crear_parser()
+    args, resto = parser.parse_known_args(argv)
+    if resto and not args.reenviar:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    return args.funcion(args, resto)
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+IDs derivados del contenido de las filas de origen
+
+Los IDs de la migración ("venta-3f9a0c52d1e87b44") son un hash estable de la identidad
+de la fila en el Excel (hoja, fecha, detalle, cliente, total, ...) más su ocurrencia
+entre filas idénticas, en lugar de salir de contadores compartidos:
+
+- una fila da el mismo ID sin importar en qué orden ni en qué proceso se migre, así la
+  hoja se puede partir en bloques que se migran por separado y se combinan sin renumerar
+- volver a migrar un Excel editado conserva los IDs de las filas que no cambiaron (una
+  fila insertada en el medio ya no corre los IDs de todas las siguientes)
+
+Las entidades derivadas parten del ID de su origen: el item de una venta comparte el hash
+de la venta, un movimiento de stock suma la columna de la cantidad y uno de cuenta
+corriente el tipo. Los socios se identifican por el nombre. Los campos `numero` (Venta #n)
+siguen siendo correlativos: son para mostrar y se asignan en el orden de las filas.
+
+La ocurrencia (0 para la primera fila con esa identidad, 1 para la segunda...) es lo único
+que depende de las filas anteriores. Un worker que migra un bloque suelto arranca su
+Ocurrencias con contar() sobre las claves de las filas previas, sin clasificarlas.
+"""
+
+import hashlib
+from datetime import date
+
+# Se guarda en las huellas de la marca de agua: una salida con otro esquema de IDs
+# no se puede continuar en modo incremental
+ESQUEMA_IDS = "contenido-1"
+LARGO_HASH = 16
+
+
+def _canonico(valor):
+    """Texto estable de un valor de celda (1 y 1.0 dan lo mismo; fechas en ISO)"""
+    if valor is None:
+        return ''
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return repr(float(valor))
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return str(valor).strip()
+
+
+def huella(*partes):
+    """Hash hexadecimal de LARGO_HASH caracteres de los valores dados"""
+    datos = '\x1f'.join(_canonico(parte) for parte in partes).encode('utf-8')
+    return hashlib.sha256(datos).hexdigest()[:LARGO_HASH]
+
+
+def id_contenido(prefijo, *partes):
+    """ID '<prefijo>-<huella>' de los valores dados"""
+    return f"{prefijo}-{huella(*partes)}"
+
+
+class Ocurrencias:
+    """Cuenta cuántas veces apareció cada identidad de fila para distinguir filas idénticas"""
+
+    def __init__(self):
+        self._vistas = {}
+
+    def siguiente(self, clave):
+        """Ocurrencia de la clave (tupla de valores) y la registra"""
+        n = self._vistas.get(clave, 0)
+        self._vistas[clave] = n + 1
+        return n
+
+    def contar(self, claves):
+        """Registra claves de filas previas (para arrancar un bloque en el medio); devuelve self"""
+        for clave in claves:
+            self.siguiente(clave)
+        return self
+
+    def huella(self, *clave):
+        """Huella de la fila: su identidad más la ocurrencia"""
+        return huella(*clave, self.siguiente(clave))
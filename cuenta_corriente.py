@@ -0,0 +1,186 @@
+"""
+Cuenta corriente de los socios a partir de las ventas migradas
+
+Cada venta con socio genera sus movimientos (tabla movimientos_cuenta_corriente):
+
+- CARGO por el total de la venta
+- PAGO por lo cobrado en el momento (montoPagado: el total menos la columna DEUDAS en
+  las ventas PAGADO y PARCIAL), que además queda como registro de la tabla pagos
+
+El saldo sigue la convención del modelo: positivo a favor del socio, negativo si debe.
+La hoja no tiene filas de pago de deudas, así que lo fiado queda como saldo deudor.
+
+Los movimientos se ordenan una vez por fecha (a igual fecha, en el orden de las ventas)
+y los saldos se acumulan en una sola pasada. Por socio quedan las fechas y los saldos
+de sus movimientos en listas paralelas, y los saldos finales ordenados: "saldo del
+socio X al día D" y "socios que pasan el límite de crédito" se resuelven con bisect.
+Los IDs de movimientos y pagos salen del ID de la venta (y del tipo de movimiento), así
+no cambian al agregar ventas anteriores.
+
+Uso:
+    python cuenta_corriente.py [--entrada datos_migrados.json] [--socio NOMBRE] [--fecha AAAA-MM-DD]
+                               [--limite 50000]
+"""
+
+import argparse
+import sys
+from bisect import bisect_left, bisect_right
+
+from content_ids import id_contenido
+from records import MovimientoCuentaCorriente, Pago, Socio, clave_fecha
+
+CARGO = "CARGO"
+PAGO = "PAGO"
+LIMITE_CREDITO = Socio.FIJOS["limiteCredito"]
+
+
+class CuentaCorriente:
+    """
+    Libro de cuenta corriente. Se alimenta con agregar_venta (en el orden de la
+    migración) y cerrar() genera movimientos, pagos y el índice de saldos.
+    """
+
+    def __init__(self):
+        self._ventas = []
+        self.movimientos = []
+        self.pagos = []
+        self._fechas = {}       # socio -> fechas de sus movimientos (ordenadas)
+        self._saldos = {}       # socio -> saldo después de cada movimiento
+        self._indices = {}      # socio -> posición de cada movimiento en self.movimientos
+        self._finales = []      # [(saldo final, socio)] de menor a mayor
+        self._claves_finales = []
+
+    def agregar_venta(self, venta):
+        """Registra una venta (registro o dict con las claves JSON); sin socio no mueve cuenta"""
+        socio_id = venta["socioId"]
+        if socio_id is None:
+            return
+        total = venta["total"] or 0
+        pagado = venta["montoPagado"] or 0
+        self._ventas.append((clave_fecha(venta["fecha"]), len(self._ventas), socio_id, venta["id"],
+                             venta["numero"], total, pagado, venta["metodoPago"]))
+
+    def _mover(self, socio_id, fecha, tipo, concepto, monto, venta_id):
+        saldos = self._saldos.setdefault(socio_id, [])
+        anterior = saldos[-1] if saldos else 0
+        nuevo = round(anterior + (monto if tipo == PAGO else -monto), 2)
+        self.movimientos.append(MovimientoCuentaCorriente(
+            id=id_contenido("mcc", venta_id, tipo),
+            socio_id=socio_id,
+            fecha=fecha,
+            tipo=tipo,
+            concepto=concepto,
+            monto=monto,
+            saldo_anterior=anterior,
+            saldo_nuevo=nuevo,
+            referencia_id=venta_id
+        ))
+        saldos.append(nuevo)
+        self._fechas.setdefault(socio_id, []).append(fecha)
+        self._indices.setdefault(socio_id, []).append(len(self.movimientos) - 1)
+
+    def cerrar(self):
+        """Ordena por fecha y acumula los saldos en una pasada; devuelve self"""
+        self._ventas.sort()
+        for fecha, _, socio_id, venta_id, numero, total, pagado, metodo in self._ventas:
+            self._mover(socio_id, fecha, CARGO, f"Venta #{numero}", total, venta_id)
+            if pagado:
+                self._mover(socio_id, fecha, PAGO, f"Pago venta #{numero}", pagado, venta_id)
+                self.pagos.append(Pago(
+                    id=id_contenido("pago", venta_id),
+                    fecha=fecha,
+                    socio_id=socio_id,
+                    venta_id=venta_id,
+                    monto=pagado,
+                    metodo_pago=metodo,
+                    concepto=f"Pago venta #{numero}"
+                ))
+        self._ventas = []
+        self._finales = sorted((saldos[-1], socio_id) for socio_id, saldos in self._saldos.items())
+        self._claves_finales = [saldo for saldo, _ in self._finales]
+        return self
+
+    # ------------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------------
+
+    def saldo(self, socio_id, fecha=None):
+        """Saldo del socio después de sus movimientos hasta fecha (por defecto, el final)"""
+        saldos = self._saldos.get(socio_id)
+        if not saldos:
+            return 0
+        if fecha is None:
+            return saldos[-1]
+        i = bisect_right(self._fechas[socio_id], clave_fecha(fecha))
+        return saldos[i - 1] if i else 0
+
+    def historial(self, socio_id, desde=None, hasta=None):
+        """Movimientos del socio entre desde y hasta (inclusive), en orden"""
+        fechas = self._fechas.get(socio_id, [])
+        inicio = bisect_left(fechas, clave_fecha(desde, fin_del_dia=False)) if desde is not None else 0
+        fin = bisect_right(fechas, clave_fecha(hasta)) if hasta is not None else len(fechas)
+        return [self.movimientos[i] for i in self._indices.get(socio_id, [])[inicio:fin]]
+
+    def socios_sobre_limite(self, limite=LIMITE_CREDITO):
+        """[(socio, saldo)] de los socios que deben más que el límite, el más deudor primero"""
+        hasta = bisect_left(self._claves_finales, -limite)
+        return [(socio_id, saldo) for saldo, socio_id in self._finales[:hasta]]
+
+    def saldos(self):
+        """{socio: saldo final}"""
+        return {socio_id: saldo for saldo, socio_id in self._finales}
+
+    def asignar_saldos(self, socios):
+        """Pone el saldo final en cada socio (registros de records.py o dicts de una corrida previa)"""
+        for socio in socios:
+            saldo = self.saldo(socio["id"])
+            if isinstance(socio, dict):
+                socio["saldo"] = saldo
+            else:
+                socio.saldo = saldo
+
+
+def cargar_cuenta(entrada):
+    """Arma la cuenta corriente desde una salida de la migración; devuelve (cuenta, socios por id)"""
+    from ndjson_output import iter_salida
+
+    cuenta = CuentaCorriente()
+    socios = {}
+    for coleccion, registro in iter_salida(entrada):
+        if coleccion == "ventas":
+            cuenta.agregar_venta(registro)
+        elif coleccion == "socios":
+            socios[registro["id"]] = registro
+    return cuenta.cerrar(), socios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Saldos de cuenta corriente de una salida migrada")
+    parser.add_argument('--entrada', default='datos_migrados.json',
+                        help="JSON o directorio NDJSON de la migración")
+    parser.add_argument('--socio', help="Nombre o ID del socio a detallar")
+    parser.add_argument('--fecha', help="Saldo a esta fecha (AAAA-MM-DD); por defecto el final")
+    parser.add_argument('--limite', type=float, default=LIMITE_CREDITO)
+    args = parser.parse_args(argv)
+
+    cuenta, socios = cargar_cuenta(args.entrada)
+    print(f"Movimientos: {len(cuenta.movimientos)} | Pagos: {len(cuenta.pagos)}")
+
+    excedidos = cuenta.socios_sobre_limite(args.limite)
+    print(f"\nSOCIOS QUE PASAN EL LÍMITE DE ${args.limite:,.0f}: {len(excedidos)}")
+    for socio_id, saldo in excedidos:
+        print(f"  {socios.get(socio_id, {}).get('nombre', socio_id):<30} ${saldo:>14,.0f}")
+
+    if args.socio:
+        buscado = args.socio.strip().upper()
+        socio_id = next((s["id"] for s in socios.values() if s["nombre"] == buscado), args.socio)
+        print(f"\n{buscado}: saldo ${cuenta.saldo(socio_id, args.fecha):,.0f}"
+              + (f" al {args.fecha}" if args.fecha else ""))
+        for mov in cuenta.historial(socio_id, hasta=args.fecha):
+            print(f"  {mov['fecha'][:10]}  {mov['tipo']:<6} {mov['concepto']:<20} "
+                  f"${mov['monto']:>12,.0f}  saldo ${mov['saldoNuevo']:>12,.0f}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,215 @@
+"""
+Tabla de cotizaciones del dólar indexada por fecha para pasar montos en pesos a USD
+
+Las ventas y los gastos operativos solo tienen pesos; el único dato de cotización del
+Excel es el precioDolar de cada gasto de INVERSION GASTOS (si vino en 0 se deriva de
+montoPesos / montoUSD). Con esas observaciones, más un CSV externo opcional
+(fecha,tasa; sus días reemplazan a los del Excel), se arma una tabla ordenada por
+día con una tasa por fecha (promedio de las observaciones del día).
+
+La conversión es vectorizada: tasas() ubica todas las fechas de una columna con un
+único np.searchsorted y completa los huecos por interpolación lineal entre las dos
+observaciones vecinas o con la más cercana. Antes de la primera y después de la
+última observación se usa la tasa del extremo: para fechas posteriores a los gastos
+de inversión conviene pasar un CSV con las cotizaciones del período.
+
+La tabla se guarda en .cache/fx como .npz identificado por el hash del Excel y del
+CSV (y por la ruta del Excel, como los snapshots de workbook_cache.py), así las
+corridas siguientes no vuelven a leer las hojas.
+
+Uso:
+    python fx_rates.py [--excel ARCHIVO] [--csv cotizaciones.csv] [--metodo lineal|cercano]
+                       [--entrada datos_migrados.json]
+"""
+
+import argparse
+import csv
+import hashlib
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+CACHE_DIR = Path('.cache') / 'fx'
+FORMATO_CACHE = 1
+METODOS = ('lineal', 'cercano')
+
+
+def observaciones_inversion(gastos):
+    """(fecha, tasa) de cada gasto de inversión (registro o dict) con cotización utilizable"""
+    for gasto in gastos:
+        tasa = gasto["precioDolar"]
+        if not tasa and gasto["montoUSD"] and gasto["montoPesos"]:
+            tasa = gasto["montoPesos"] / gasto["montoUSD"]
+        if gasto["fecha"] and tasa and tasa > 0:
+            yield gasto["fecha"], tasa
+
+
+def leer_csv(path):
+    """(fecha, tasa) de un CSV fecha,tasa (fecha ISO; se saltean encabezados y filas inválidas)"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for fila in csv.reader(f):
+            if len(fila) < 2:
+                continue
+            try:
+                fecha = datetime.fromisoformat(fila[0].strip())
+                tasa = float(fila[1].replace(',', '.'))
+            except ValueError:
+                continue
+            if tasa > 0:
+                yield fecha, tasa
+
+
+def a_dias(fechas):
+    """Array datetime64[D] a partir de datetimes, fechas ISO o un array de NumPy"""
+    if isinstance(fechas, np.ndarray) and np.issubdtype(fechas.dtype, np.datetime64):
+        return fechas.astype('datetime64[D]')
+    return np.array([f[:10] if isinstance(f, str) else f for f in fechas], dtype='datetime64[D]')
+
+
+class TablaCambio:
+    """Cotizaciones ordenadas por día: dias (datetime64[D]) y tasas (pesos por dólar)"""
+
+    def __init__(self, dias, tasas):
+        self.dias = dias
+        self.tasas_dia = tasas
+        self._x = dias.astype(np.int64)
+
+    def __len__(self):
+        return len(self.dias)
+
+    @classmethod
+    def desde_observaciones(cls, observaciones, externas=()):
+        """Arma la tabla promediando por día; los días de `externas` reemplazan a las observaciones"""
+        tablas = []
+        for pares in (observaciones, externas):
+            pares = list(pares)
+            fechas = a_dias([f for f, _ in pares])
+            tasas = np.array([t for _, t in pares], dtype=np.float64)
+            dias, grupo = np.unique(fechas, return_inverse=True)
+            tablas.append((dias, np.bincount(grupo, weights=tasas, minlength=len(dias))
+                           / np.bincount(grupo, minlength=len(dias))))
+        (dias, tasas), (dias_ext, tasas_ext) = tablas
+        propias = ~np.isin(dias, dias_ext)
+        dias = np.concatenate([dias[propias], dias_ext])
+        tasas = np.concatenate([tasas[propias], tasas_ext])
+        if not len(dias):
+            raise ValueError("No hay cotizaciones para armar la tabla")
+        orden = np.argsort(dias, kind='stable')
+        return cls(dias[orden], tasas[orden])
+
+    def tasas(self, fechas, metodo='lineal'):
+        """Tasa de cada fecha (NaN si la fecha falta) con una sola búsqueda binaria vectorizada"""
+        if metodo not in METODOS:
+            raise ValueError(f"Método desconocido: {metodo}")
+        dias = a_dias(fechas)
+        x = dias.astype(np.int64)
+        ultimo = len(self._x) - 1
+        derecha = np.clip(np.searchsorted(self._x, x, side='left'), 0, ultimo)
+        izquierda = np.clip(derecha - 1, 0, ultimo)
+        # En una observación exacta (o fuera del rango) los dos vecinos son el mismo punto
+        exacta = self._x[derecha] <= x
+        izquierda = np.where(exacta, derecha, izquierda)
+        x0, x1 = self._x[izquierda], self._x[derecha]
+        y0, y1 = self.tasas_dia[izquierda], self.tasas_dia[derecha]
+        if metodo == 'cercano':
+            resultado = np.where(x - x0 <= x1 - x, y0, y1)
+        else:
+            ancho = np.where(x1 > x0, x1 - x0, 1)
+            resultado = y0 + (y1 - y0) * np.clip((x - x0) / ancho, 0, 1)
+        return np.where(np.isnat(dias), np.nan, resultado)
+
+    def a_usd(self, montos, fechas, metodo='lineal'):
+        """Convierte una columna de montos en pesos a USD según la fecha de cada uno"""
+        return np.asarray(montos, dtype=np.float64) / self.tasas(fechas, metodo)
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+def _clave_cache(excel_path, csv_path):
+    from workbook_cache import hash_archivo
+
+    h = hashlib.sha256(hash_archivo(excel_path).encode())
+    if csv_path:
+        h.update(hash_archivo(csv_path).encode())
+    return h.hexdigest()
+
+
+def construir_tabla(excel_path=EXCEL_PATH, csv_path=None):
+    """Arma la tabla desde los gastos de INVERSION GASTOS (snapshot del Excel) y el CSV"""
+    from migrate_excel_to_new_model import migrar_inversion
+    from workbook_cache import cargar_snapshot
+
+    wb = cargar_snapshot(excel_path)
+    _, gastos = migrar_inversion(wb['INVERSION  GASTOS'].iter_rows(values_only=True))
+    externas = leer_csv(csv_path) if csv_path else ()
+    return TablaCambio.desde_observaciones(observaciones_inversion(gastos), externas)
+
+
+def cargar_tabla_cambio(excel_path=EXCEL_PATH, csv_path=None, cache_dir=CACHE_DIR):
+    """Devuelve la TablaCambio del Excel (y el CSV), desde el cache si ninguno cambió"""
+    from workbook_cache import borrar_viejos, guardar_atomico, prefijo_cache
+
+    clave = _clave_cache(excel_path, csv_path)
+    ruta = Path(cache_dir) / f"{prefijo_cache(excel_path)}.{clave[:16]}.npz"
+    if ruta.exists():
+        try:
+            with np.load(ruta) as datos:
+                if int(datos['formato']) == FORMATO_CACHE and str(datos['clave']) == clave:
+                    return TablaCambio(datos['dias'], datos['tasas'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    tabla = construir_tabla(excel_path, csv_path)
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    guardar_atomico(ruta, lambda f: np.savez(f, formato=FORMATO_CACHE, clave=clave, dias=tabla.dias,
+                                             tasas=tabla.tasas_dia))
+    borrar_viejos(excel_path, ruta, cache_dir, '.npz')
+    return tabla
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def columnas_en_pesos(entrada):
+    """{coleccion: (fechas, montos)} de ventas (total) y gastos operativos (monto) de una salida"""
+    from ndjson_output import iter_salida
+
+    columnas = {"ventas": ([], []), "gastosOperativos": ([], [])}
+    campo = {"ventas": "total", "gastosOperativos": "monto"}
+    for coleccion, registro in iter_salida(entrada):
+        if coleccion in columnas:
+            fechas, montos = columnas[coleccion]
+            fechas.append(registro["fecha"])
+            montos.append(registro[campo[coleccion]] or 0)
+    return columnas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cotización del dólar por fecha y montos en USD")
+    parser.add_argument('--excel', default=EXCEL_PATH)
+    parser.add_argument('--csv', help="Cotizaciones externas (fecha,tasa) que completan las del Excel")
+    parser.add_argument('--metodo', choices=METODOS, default='lineal',
+                        help="Completar huecos interpolando o con la cotización más cercana")
+    parser.add_argument('--entrada', default='datos_migrados.json',
+                        help="JSON o directorio NDJSON de la migración a pasar a USD")
+    args = parser.parse_args(argv)
+
+    tabla = cargar_tabla_cambio(args.excel, args.csv)
+    print(f"Cotizaciones: {len(tabla)} días, del {tabla.dias[0]} al {tabla.dias[-1]} "
+          f"(${tabla.tasas_dia.min():,.0f} a ${tabla.tasas_dia.max():,.0f})")
+
+    if not Path(args.entrada).exists():
+        return
+    print(f"\n{'COLECCION':<18} {'REGISTROS':>9} {'PESOS':>18} {'USD':>14}")
+    for coleccion, (fechas, montos) in columnas_en_pesos(args.entrada).items():
+        usd = tabla.a_usd(montos, fechas, args.metodo)
+        print(f"{coleccion:<18} {len(montos):>9} {sum(montos):>18,.0f} {np.nansum(usd):>14,.2f}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
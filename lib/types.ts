@@ -190,6 +190,7 @@ export interface Venta {
   fecha: Date;
   socioId: string;
   vendedorId?: string; // EmpleadoId de quien entregó
+  entregador?: string; // Quien entregó, tal como figura en la hoja (migración)
   subtotal: number;
   descuento: number;
   total: number;
@@ -1,18 +1,81 @@
 """
 Script de migración de datos del Excel al nuevo modelo de datos
 Convierte "Sheets actual 19-01-26.xlsx" al formato del nuevo modelo TypeScript
+
+Uso:
+    python migrate_excel_to_new_model.py [--excel ARCHIVO] [--salida ARCHIVO] [--streaming]
+                                         [--sin-cache] [--incremental]
+                                         [--formato json|ndjson|copy] [--compresion gzip|lzma]
+                                         [--alias-socios ARCHIVO] [--sin-alias] [--reglas ARCHIVO]
+                                         [--informe ARCHIVO] [--memoria] [--perfil ARCHIVO]
+
+Por defecto las hojas se leen del snapshot cacheado (ver workbook_cache.py), que se
+regenera solo cuando cambia el contenido del Excel.
+
+Con --streaming el workbook se lee directo del xlsx (xlsx_reader.py, sin snapshot) y
+las filas se procesan con un pipeline de generadores (fila -> registro clasificado -> entidades),
+sin materializar las hojas en memoria. El resultado es idéntico al modo normal.
+
+Con --incremental solo se migran las filas posteriores a las marcas de agua de la
+corrida anterior (ver watermark.py) y se agregan a la salida existente continuando
+la numeración de ventas y gastos. Si se editó una fila ya migrada se rehace todo.
+
+Los IDs no son correlativos: salen de un hash de la identidad de cada fila (hoja, fecha,
+detalle, cliente, total y ocurrencia entre filas idénticas, ver content_ids.py), así una
+fila conserva su ID aunque se inserten o editen otras y un bloque de filas se puede
+migrar por separado. Solo el `numero` de ventas y gastos sigue el orden de las filas.
+
+Con --formato ndjson cada colección se escribe en su propio archivo NDJSON (opcionalmente
+comprimido) a medida que se producen los registros, más un manifest.json con los totales
+(ver ndjson_output.py). La salida por defecto es entonces el directorio datos_migrados/.
+
+Con --formato copy se generan archivos TSV para COPY de Postgres, uno por tabla de
+001_initial_schema.sql, y un load.sql para cargarlos (ver bulk_load.py).
+
+Si existe socios_alias.json (generado con socios_dedup.py) los nombres de clientes se
+reemplazan por su variante canónica antes de crear los socios, así "MATÍAS" y "MATIAS"
+terminan en el mismo socioId. Con --sin-alias se migran los nombres tal cual.
+
+Las ventas, sus productos y las categorías de los gastos se asignan con las reglas de
+palabras clave de reglas_clasificacion.json (ver classifier.py); lo que no cubre ninguna
+regla queda en cat-varios / OTROS y se reporta al final de cada hoja.
+
+Las ventas alimentan la cuenta corriente de cada socio (ver cuenta_corriente.py): se
+generan las colecciones movimientosCuentaCorriente y pagos, y el saldo de cada socio
+queda con lo que debe de sus ventas fiadas (columna DEUDAS). Las cantidades de
+CANTIDAD GR y ESQUE/KITS forman el libro de stock por producto (movimientosStock, ver
+stock_ledger.py). Lo cobrado de las ventas, los gastos y los aportes de los inversores
+forman el flujo de caja con el saldo por medio de pago (movimientosCaja, ver cash_flow.py).
+
+Con --informe se guarda un JSON con el tiempo, las filas procesadas y salteadas (por
+motivo) y las entidades de cada etapa (ver run_report.py); --memoria agrega el pico de
+tracemalloc por etapa y --perfil guarda un volcado de cProfile de toda la corrida.
 """
 
-import openpyxl
+import argparse
 import json
 import sys
+from collections import namedtuple
 from datetime import datetime
-from collections import defaultdict
-
-sys.stdout.reconfigure(encoding='utf-8')
-
-# Cargar el Excel
-wb = openpyxl.load_workbook('Sheets actual 19-01-26.xlsx', data_only=True)
+from itertools import islice
+from pathlib import Path
+
+from cash_flow import FlujoCaja
+from classifier import REGLAS_PATH, cargar_reglas, huella_reglas, imprimir_sin_regla
+from content_ids import ESQUEMA_IDS, Ocurrencias, id_contenido
+from cuenta_corriente import CuentaCorriente
+from records import (
+    PAGADO, PARCIAL, PENDIENTE, GastoInversion, GastoOperativo, ItemVenta, Socio, Venta, a_json,
+)
+from run_report import SIN_INFORME, Informe
+from socios_dedup import ALIAS_PATH, cargar_alias, huella_alias, mapa_por_plegado, plegar_nombre
+from stock_ledger import AJUSTE, EGRESO, INGRESO, LibroStock
+from watermark import MarcaAgua, PrefijoModificado, cargar_marca, guardar_marca
+from workbook_cache import cargar_snapshot
+from xlsx_reader import abrir_xlsx
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+SALIDA_PATH = 'datos_migrados.json'
 
 # ============================================================================
 # FUNCIONES AUXILIARES
@@ -37,296 +100,851 @@ def to_iso_date(date_obj):
         return date_obj.isoformat()
     return None
 
-def generate_id(prefix, counter):
-    """Genera ID único"""
-    return f"{prefix}-{counter:04d}"
+def to_float(valor):
+    """Convierte a float si es numérico, si no devuelve 0"""
+    return float(valor) if valor and isinstance(valor, (int, float)) else 0
+
+def load_workbook(path, streaming=False, usar_cache=True):
+    """
+    Abre el Excel. Por defecto devuelve el snapshot cacheado; en modo streaming (o con
+    usar_cache=False) lee las hojas directo del xlsx con xlsx_reader, fila a fila.
+    """
+    if usar_cache and not streaming:
+        return cargar_snapshot(path)
+    return abrir_xlsx(path)
+
+def iter_filas(wb, nombre_hoja):
+    """Itera las filas de una hoja como tuplas de valores"""
+    return wb[nombre_hoja].iter_rows(values_only=True)
 
 # ============================================================================
 # MIGRACIÓN HOJA 1: INVERSIÓN GASTOS
 # ============================================================================
 
-print("=" * 100)
-print("MIGRACIÓN HOJA 1: INVERSIÓN GASTOS")
-print("=" * 100)
-
-ws_inversion = wb['INVERSION  GASTOS']
-rows_inversion = list(ws_inversion.iter_rows(values_only=True))
-
-# Inversores (hardcoded basado en el análisis)
-inversores = [
-    {
-        "id": "inv-facu",
-        "nombre": "Facu",
-        "montoInvertidoUSD": float(rows_inversion[1][13]) if rows_inversion[1][13] else 0,
-        "montoInvertidoPesos": float(rows_inversion[1][14]) if rows_inversion[1][14] else 0,
-        "porcentajeParticipacion": 58.0,
-        "fechaIngreso": "2023-11-01T00:00:00",
-        "activo": True
-    },
-    {
-        "id": "inv-tony",
-        "nombre": "Tony",
-        "montoInvertidoUSD": float(rows_inversion[1][5]) if rows_inversion[1][5] else 0,
-        "montoInvertidoPesos": float(rows_inversion[1][6]) if rows_inversion[1][6] else 0,
-        "porcentajeParticipacion": 42.0,
-        "fechaIngreso": "2023-11-01T00:00:00",
-        "activo": True
+HOJA_INVERSION = 'INVERSION  GASTOS'
+HOJA_STOCK = 'STOCK Y VENTAS'
+HOJA_GASTOS_FIJOS = 'GASTOS FIJOS Y OTROS'
+
+def _gasto_inversion(inversor_id, row, col, origen, reglas):
+    """Arma un gasto de inversión a partir del bloque de columnas de un inversor"""
+    detalle = clean_string(row[col + 1]) if row[col + 1] else ""
+    return GastoInversion(
+        id=f"gi-{origen}",
+        inversor_id=inversor_id,
+        fecha=row[col],
+        detalle=detalle,
+        categoria=reglas.valor(detalle, "categoria", "OTROS"),
+        monto_usd=to_float(row[col + 4]),
+        monto_pesos=to_float(row[col + 5]),
+        precio_dolar=to_float(row[col + 6])
+    )
+
+def marcas_inversion(previas=None):
+    """Marcas de agua de los bloques de gastos de Tony (B-H) y de Facu (J-P)"""
+    previas = previas or {}
+    return {
+        "tony": MarcaAgua("INVERSION GASTOS (Tony)", slice(1, 8), previas.get("tony")),
+        "facu": MarcaAgua("INVERSION GASTOS (Facu)", slice(9, 16), previas.get("facu")),
     }
-]
 
-print(f"\nInversores creados: {len(inversores)}")
-
-# Gastos de inversión
-gastos_inversion = []
-gi_counter = 1
-
-# Gastos de Tony (columnas B-H, desde fila 4)
-for i, row in enumerate(rows_inversion[3:], 4):
-    if row[1] and isinstance(row[1], datetime):  # Si hay fecha en columna B
-        gasto = {
-            "id": generate_id("gi", gi_counter),
-            "inversorId": "inv-tony",
-            "fecha": to_iso_date(row[1]),
-            "detalle": clean_string(row[2]) if row[2] else "",
-            "categoria": "OTROS",  # Categorizar manualmente después
-            "montoUSD": float(row[5]) if row[5] and isinstance(row[5], (int, float)) else 0,
-            "montoPesos": float(row[6]) if row[6] and isinstance(row[6], (int, float)) else 0,
-            "precioDolar": float(row[7]) if row[7] and isinstance(row[7], (int, float)) else 0
-        }
-        gastos_inversion.append(gasto)
-        gi_counter += 1
-
-# Gastos de Facu (columnas J-P, desde fila 4)
-for i, row in enumerate(rows_inversion[3:], 4):
-    if row[9] and isinstance(row[9], datetime):  # Si hay fecha en columna J
-        gasto = {
-            "id": generate_id("gi", gi_counter),
-            "inversorId": "inv-facu",
-            "fecha": to_iso_date(row[9]),
-            "detalle": clean_string(row[10]) if row[10] else "",
-            "categoria": "OTROS",
-            "montoUSD": float(row[13]) if row[13] and isinstance(row[13], (int, float)) else 0,
-            "montoPesos": float(row[14]) if row[14] and isinstance(row[14], (int, float)) else 0,
-            "precioDolar": float(row[15]) if row[15] and isinstance(row[15], (int, float)) else 0
+def migrar_inversion(rows, marcas=None, reglas=None, informe=SIN_INFORME, filas_origen=None):
+    """
+    Migra la hoja INVERSION GASTOS en una sola pasada sobre las filas.
+    Con marcas de agua previas solo devuelve los gastos nuevos.
+    reglas: Clasificador de la sección "inversion" para la categoría de cada gasto.
+    El ID de cada gasto es la huella de inversor, fecha, detalle y montos (content_ids.py).
+    filas_origen: dict opcional que se completa con {origen: (hoja, fila)} de cada gasto.
+    """
+    reglas = reglas or cargar_reglas(None)["inversion"]
+    ocurrencias = Ocurrencias()
+    totales = None
+    gastos_tony = []
+    gastos_facu = []
+
+    for i, row in enumerate(rows):
+        if i == 1:
+            totales = row
+        if i < 3:
+            continue
+        informe.fila()
+        # Gastos de Tony (columnas B-H) y de Facu (columnas J-P), desde fila 4
+        fecha_tony = row[1] if row[1] and isinstance(row[1], datetime) else None
+        fecha_facu = row[9] if row[9] and isinstance(row[9], datetime) else None
+        nueva_tony = marcas["tony"].ver(i + 1, row, fecha_tony) if marcas else True
+        nueva_facu = marcas["facu"].ver(i + 1, row, fecha_facu) if marcas else True
+
+        for fecha, nueva, bloque in ((fecha_tony, nueva_tony, "tony"), (fecha_facu, nueva_facu, "facu")):
+            if not fecha:
+                informe.saltar(f"{bloque}_sin_fecha")
+            elif not nueva:
+                informe.saltar(f"{bloque}_ya_migrada")
+
+        # Las filas ya migradas también cuentan para la ocurrencia de las idénticas
+        for fecha, nueva, inversor_id, col, gastos in ((fecha_tony, nueva_tony, "inv-tony", 1, gastos_tony),
+                                                       (fecha_facu, nueva_facu, "inv-facu", 9, gastos_facu)):
+            if fecha:
+                origen = ocurrencias.huella(HOJA_INVERSION, inversor_id, fecha, row[col + 1],
+                                            row[col + 4], row[col + 5])
+                if filas_origen is not None:
+                    filas_origen[origen] = (HOJA_INVERSION, i + 1)
+                if nueva:
+                    gastos.append(_gasto_inversion(inversor_id, row, col, origen, reglas))
+
+    if marcas:
+        for marca in marcas.values():
+            marca.cerrar()
+
+    # Inversores (hardcoded basado en el análisis)
+    inversores = [
+        {
+            "id": "inv-facu",
+            "nombre": "Facu",
+            "montoInvertidoUSD": float(totales[13]) if totales[13] else 0,
+            "montoInvertidoPesos": float(totales[14]) if totales[14] else 0,
+            "porcentajeParticipacion": 58.0,
+            "fechaIngreso": "2023-11-01T00:00:00",
+            "activo": True
+        },
+        {
+            "id": "inv-tony",
+            "nombre": "Tony",
+            "montoInvertidoUSD": float(totales[5]) if totales[5] else 0,
+            "montoInvertidoPesos": float(totales[6]) if totales[6] else 0,
+            "porcentajeParticipacion": 42.0,
+            "fechaIngreso": "2023-11-01T00:00:00",
+            "activo": True
         }
-        gastos_inversion.append(gasto)
-        gi_counter += 1
+    ]
 
-print(f"Gastos de inversión migrados: {len(gastos_inversion)}")
+    # Primero los de Tony y luego los de Facu
+    return inversores, gastos_tony + gastos_facu
 
 # ============================================================================
 # MIGRACIÓN HOJA 2: STOCK Y VENTAS
 # ============================================================================
 
-print("\n" + "=" * 100)
-print("MIGRACIÓN HOJA 2: STOCK Y VENTAS")
-print("=" * 100)
-
-ws_stock = wb['STOCK Y VENTAS']
-rows_stock = list(ws_stock.iter_rows(values_only=True))
-
-# Analizar y separar datos
-socios_dict = {}
-ventas = []
-gastos_operativos = []
-items_venta = []
-
-socio_counter = 1
-venta_counter = 1
-gasto_counter = 1
-item_counter = 1
-
-# Procesar cada fila (desde fila 3, índice 2)
-for i, row in enumerate(rows_stock[2:], 3):
+RegistroStock = namedtuple('RegistroStock', [
+    'fila', 'tipo', 'fecha', 'detalle', 'cliente', 'precio_vta', 'entregador',
+    'modo_pago', 'cantidad_gr', 'cantidad_esquejes', 'total', 'deudas', 'notas',
+    'categoria_id', 'producto_id', 'origen'
+])
+
+# Solo las reglas de venta por palabra clave (WEED, ESQUEJE, KIT), sin categorías de gastos
+REGLAS_STOCK_POR_DEFECTO = cargar_reglas(None)["stock"]
+
+def clasificar_fila(fila, row, alias=None, reglas=None, ocurrencias=None):
+    """
+    Convierte una fila de STOCK Y VENTAS en un RegistroStock (o None si no tiene fecha).
+    alias: {nombre plegado: canónico} para unificar variantes del mismo cliente.
+    reglas: Clasificador de la sección "stock" (tipo de venta, productoId y categoriaId).
+    ocurrencias: content_ids.Ocurrencias de las filas anteriores, para el origen de la fila
+    (huella de fecha, detalle, cliente sin alias y total con la que se arman sus IDs).
+    """
     fecha = row[1]
+    if not fecha or not isinstance(fecha, datetime):
+        return None
+
     detalle = clean_string(row[2])
-    cliente = normalize_cliente(row[3])
-    precio_vta = row[4]
-    entregador = clean_string(row[5])
-    modo_pago = clean_string(row[6])
-    cantidad_gr = row[7]
-    cantidad_esquejes = row[8]
     es_gasto = row[9]
     total = row[10]
-    deudas = row[11]
-    notas = clean_string(row[12])
 
-    if not fecha or not isinstance(fecha, datetime):
-        continue
-
-    # Crear/actualizar socio si no existe
-    if cliente and cliente not in socios_dict:
-        socios_dict[cliente] = {
-            "id": generate_id("socio", socio_counter),
-            "nombre": cliente,
-            "tipo": "CLIENTE_FRECUENTE",
-            "fechaRegistro": to_iso_date(fecha),
-            "activo": True,
-            "saldo": 0,
-            "limiteCredito": 50000
-        }
-        socio_counter += 1
+    cliente = normalize_cliente(row[3])
+    origen = (ocurrencias or Ocurrencias()).huella(HOJA_STOCK, fecha, detalle, cliente, total)
+    if alias and cliente:
+        cliente = alias.get(plegar_nombre(cliente), cliente)
 
-    # Es un gasto?
+    reglas = reglas or REGLAS_STOCK_POR_DEFECTO
+    categoria_id = producto_id = None
     if es_gasto == 1.0:
-        gasto = {
-            "id": generate_id("gasto", gasto_counter),
-            "numero": gasto_counter,
-            "fecha": to_iso_date(fecha),
-            "categoriaId": "cat-varios",  # Categorizar después
-            "detalle": detalle or "Gasto varios",
-            "proveedor": cliente,
-            "monto": abs(float(total)) if total and isinstance(total, (int, float)) else 0,
-            "metodoPago": modo_pago.upper() if modo_pago else "EFECTIVO",
-            "pagado": True,
-            "esRecurrente": False
-        }
-        gastos_operativos.append(gasto)
-        gasto_counter += 1
-
-    # Es una venta?
-    elif detalle and any(word in detalle.upper() for word in ['WEED', 'ESQUEJE', 'KIT']) and total and total > 0:
-        socio_id = socios_dict[cliente]["id"] if cliente and cliente in socios_dict else None
-
-        venta = {
-            "id": generate_id("venta", venta_counter),
-            "numero": venta_counter,
-            "fecha": to_iso_date(fecha),
-            "socioId": socio_id,
-            "vendedorId": None,  # Mapear después
-            "subtotal": float(total) if total and isinstance(total, (int, float)) else 0,
-            "descuento": 0,
-            "total": float(total) if total and isinstance(total, (int, float)) else 0,
-            "estadoPago": "PAGADO" if deudas == 0 else "PENDIENTE",
-            "montoPagado": float(total) if deudas == 0 else 0,
-            "saldoPendiente": float(deudas) if deudas and isinstance(deudas, (int, float)) else 0,
-            "metodoPago": modo_pago.upper() if modo_pago else "EFECTIVO",
-            "entregado": True,
-            "fechaEntrega": to_iso_date(fecha),
-            "notas": notas
-        }
-        ventas.append(venta)
-
-        # Crear item de venta
-        cantidad = 0
-        precio_unitario = 0
-        producto_tipo = "WEED"
+        tipo = "GASTO"
+        categoria_id = reglas.valor(detalle, "categoriaId", "cat-varios")
+    else:
+        campos = reglas.resolver(detalle)
+        tipo = "VENTA" if campos.get("tipo") == "VENTA" and total and total > 0 else None
+        producto_id = campos.get("productoId") if tipo else None
+
+    return RegistroStock(
+        fila=fila,
+        tipo=tipo,
+        fecha=fecha,
+        detalle=detalle,
+        cliente=cliente,
+        precio_vta=row[4],
+        entregador=clean_string(row[5]),
+        modo_pago=clean_string(row[6]),
+        cantidad_gr=row[7],
+        cantidad_esquejes=row[8],
+        total=total,
+        deudas=row[11],
+        notas=clean_string(row[12]),
+        categoria_id=categoria_id,
+        producto_id=producto_id,
+        origen=origen
+    )
+
+def marca_stock(previa=None):
+    """Marca de agua de STOCK Y VENTAS (columnas B-M)"""
+    return MarcaAgua("STOCK Y VENTAS", slice(1, 13), previa)
+
+def motivo_sin_tipo(registro):
+    """Por qué una fila con fecha no generó venta ni gasto"""
+    if registro.total is not None and not isinstance(registro.total, (int, float)):
+        return "total_no_numerico"
+    return "sin_venta_ni_gasto"
+
+def iter_registros_stock(rows, marca=None, alias=None, reglas=None, informe=SIN_INFORME, ocurrencias=None):
+    """
+    Clasifica las filas de STOCK Y VENTAS (desde fila 3, índice 2) de forma perezosa.
+    Si se pasa una marca de agua, solo se devuelven las filas posteriores a la previa
+    (las anteriores igual se clasifican, así cuentan para la ocurrencia de su origen).
+    """
+    ocurrencias = ocurrencias or Ocurrencias()
+    for i, row in enumerate(islice(rows, 2, None), 3):
+        informe.fila()
+        registro = clasificar_fila(i, row, alias, reglas, ocurrencias)
+        if marca is not None:
+            nueva = marca.ver(i, row, registro.fecha if registro else None)
+            if not nueva:
+                informe.saltar("ya_migrada")
+                continue
+        if registro is None:
+            informe.saltar("sin_fecha")
+        else:
+            if registro.tipo is None:
+                informe.saltar(motivo_sin_tipo(registro))
+            yield registro
+    if marca is not None:
+        marca.cerrar()
+
+# Producto de cada columna de cantidades (en las ventas manda el producto del item)
+PRODUCTO_POR_COLUMNA = {"cantidad_gr": "prod-weed", "cantidad_esquejes": "prod-esqueje"}
+
+def registrar_stock(libro, r, motivo, referencia_id=None, referencia_tabla=None, productos=None):
+    """Agrega al libro de stock un movimiento por cada cantidad de CANTIDAD GR y ESQUE/KITS"""
+    for columna, producto_id in PRODUCTO_POR_COLUMNA.items():
+        cantidad = getattr(r, columna)
+        if not cantidad or not isinstance(cantidad, (int, float)):
+            continue
+        if r.cliente == "AJUSTE" or "AJUSTE" in (r.detalle or ""):
+            tipo = AJUSTE
+        else:
+            tipo = INGRESO if cantidad > 0 else EGRESO
+        libro.agregar(id_contenido("mstock", r.origen, columna), (productos or {}).get(columna, producto_id),
+                      r.fecha, float(cantidad), tipo, motivo, referencia_id, referencia_tabla)
+
+def nuevo_estado_stock(socios=(), contadores=None):
+    """Índice de socios por nombre y próximos números de venta y de gasto para STOCK Y VENTAS"""
+    contadores = contadores or {}
+    return {
+        "socios": {socio["nombre"]: socio for socio in socios},
+        "venta": contadores.get("venta", 1),
+        "gasto": contadores.get("gasto", 1),
+    }
 
-        if cantidad_gr and cantidad_gr < 0:
-            cantidad = abs(float(cantidad_gr))
+def construir_entidades_stock(registros, estado=None, libro=None):
+    """
+    Genera (coleccion, entidad) para socios, ventas, itemsVenta y gastosOperativos.
+    Solo mantiene en memoria el índice de socios por nombre. El estado (socios y
+    contadores) se actualiza a medida que avanza, para poder continuar la numeración.
+    Los IDs salen del origen de cada registro (y el del socio, de su nombre), así que
+    no dependen del estado. Con un LibroStock también registra los movimientos de stock.
+    """
+    if estado is None:
+        estado = nuevo_estado_stock()
+    socios_dict = estado["socios"]
+
+    for r in registros:
+        fecha = r.fecha
+        cliente = r.cliente
+        total = r.total
+        modo_pago = r.modo_pago
+
+        # Crear/actualizar socio si no existe
+        if cliente and cliente not in socios_dict:
+            socio = Socio(
+                id=id_contenido("socio", cliente),
+                nombre=cliente,
+                fecha_registro=fecha
+            )
+            socios_dict[cliente] = socio
+            yield "socios", socio
+
+        # Es un gasto?
+        if r.tipo == "GASTO":
+            gasto = GastoOperativo(
+                id=f"gasto-{r.origen}",
+                numero=estado["gasto"],
+                fecha=fecha,
+                categoria_id=r.categoria_id,
+                detalle=r.detalle or "Gasto varios",
+                proveedor=cliente,
+                monto=abs(float(total)) if total and isinstance(total, (int, float)) else 0,
+                metodo_pago=modo_pago.upper() if modo_pago else "EFECTIVO"
+            )
+            estado["gasto"] += 1
+            yield "gastosOperativos", gasto
+            if libro is not None:
+                registrar_stock(libro, r, gasto.detalle, gasto.id, "gastos")
+
+        # Es una venta?
+        elif r.tipo == "VENTA":
+            socio_id = socios_dict[cliente]["id"] if cliente and cliente in socios_dict else None
+            # DEUDAS es lo que quedó fiado: el resto del total se cobró en el momento
+            total_venta, deudas = to_float(total), to_float(r.deudas)
+            if deudas == 0:
+                estado_pago, monto_pagado = PAGADO, total_venta
+            elif 0 < deudas < total_venta:
+                estado_pago, monto_pagado = PARCIAL, round(total_venta - deudas, 2)
+            else:
+                estado_pago, monto_pagado = PENDIENTE, 0
+
+            venta = Venta(
+                id=f"venta-{r.origen}",
+                numero=estado["venta"],
+                fecha=fecha,  # También es la fecha de entrega
+                socio_id=socio_id,
+                total=total_venta,
+                estado_pago=estado_pago,
+                monto_pagado=monto_pagado,
+                saldo_pendiente=deudas,
+                metodo_pago=modo_pago.upper() if modo_pago else "EFECTIVO",
+                notas=r.notas,
+                entregador=r.entregador.upper() if r.entregador else None
+            )
+            yield "ventas", venta
+
+            # Crear item de venta
+            cantidad = 0
+            precio_unitario = 0
             producto_tipo = "WEED"
-            precio_unitario = precio_vta if precio_vta else 6000
-        elif cantidad_esquejes and cantidad_esquejes < 0:
-            cantidad = abs(float(cantidad_esquejes))
-            producto_tipo = "ESQUEJE"
-            precio_unitario = precio_vta if precio_vta else 10000
-
-        if cantidad > 0:
-            item = {
-                "id": generate_id("item", item_counter),
-                "ventaId": venta["id"],
-                "productoId": f"prod-{producto_tipo.lower()}",
-                "descripcion": detalle,
-                "cantidad": cantidad,
-                "precioUnitario": float(precio_unitario),
-                "subtotal": float(total) if total else 0,
-                "descuento": 0,
-                "total": float(total) if total else 0
-            }
-            items_venta.append(item)
-            item_counter += 1
-
-        venta_counter += 1
-
-socios = list(socios_dict.values())
-
-print(f"\nSocios migrados: {len(socios)}")
-print(f"Ventas migradas: {len(ventas)}")
-print(f"Items de venta migrados: {len(items_venta)}")
-print(f"Gastos operativos migrados: {len(gastos_operativos)}")
+            cantidad_gr = r.cantidad_gr
+            cantidad_esquejes = r.cantidad_esquejes
+
+            if cantidad_gr and cantidad_gr < 0:
+                cantidad = abs(float(cantidad_gr))
+                producto_tipo = "WEED"
+                precio_unitario = r.precio_vta if r.precio_vta else 6000
+            elif cantidad_esquejes and cantidad_esquejes < 0:
+                cantidad = abs(float(cantidad_esquejes))
+                producto_tipo = "ESQUEJE"
+                precio_unitario = r.precio_vta if r.precio_vta else 10000
+
+            if libro is not None:
+                columna = "cantidad_gr" if producto_tipo == "WEED" else "cantidad_esquejes"
+                registrar_stock(libro, r, f"Venta #{venta.numero}", venta.id, "ventas",
+                                {columna: r.producto_id or f"prod-{producto_tipo.lower()}"})
+
+            if cantidad > 0:
+                item = ItemVenta(
+                    id=f"item-{r.origen}",
+                    venta_id=venta.id,
+                    producto_id=r.producto_id or f"prod-{producto_tipo.lower()}",
+                    descripcion=r.detalle,
+                    cantidad=cantidad,
+                    precio_unitario=float(precio_unitario),
+                    total=float(total) if total else 0
+                )
+                yield "itemsVenta", item
+
+            estado["venta"] += 1
+
+        elif libro is not None:
+            registrar_stock(libro, r, r.detalle or "Movimiento de stock")
+
+def migrar_stock(rows, destino, marca=None, estado=None, alias=None, reglas=None, informe=SIN_INFORME,
+                 cuenta=None, libro=None, caja=None):
+    """
+    Migra la hoja STOCK Y VENTAS consumiendo el pipeline de generadores y enviando
+    cada entidad al destino a medida que se produce. Devuelve la cantidad por colección.
+    Con una CuentaCorriente las ventas también la alimentan y los socios no se envían:
+    quedan en estado["socios"] hasta emitir_cuenta_corriente, que les pone el saldo.
+    Con un LibroStock se registran los movimientos de stock de cada fila y con un
+    FlujoCaja, lo cobrado de las ventas y los gastos.
+    """
+    cantidades = {"socios": 0, "ventas": 0, "itemsVenta": 0, "gastosOperativos": 0}
+    registros = iter_registros_stock(rows, marca, alias, reglas, informe)
+    for coleccion, entidad in construir_entidades_stock(registros, estado, libro):
+        cantidades[coleccion] += 1
+        if cuenta is not None:
+            if coleccion == "socios":
+                continue
+            if coleccion == "ventas":
+                cuenta.agregar_venta(entidad)
+        if caja is not None:
+            caja.agregar(coleccion, entidad)
+        destino.agregar(coleccion, entidad)
+    return cantidades
+
+def emitir_cuenta_corriente(destino, socios, cuenta):
+    """
+    Cierra la cuenta corriente y envía al destino los socios (con su saldo final),
+    los movimientos y los pagos. Devuelve la cantidad por colección.
+    """
+    cuenta.cerrar()
+    socios = list(socios)
+    cuenta.asignar_saldos(socios)
+    for socio in socios:
+        destino.agregar("socios", socio)
+    for movimiento in cuenta.movimientos:
+        destino.agregar("movimientosCuentaCorriente", movimiento)
+    for pago in cuenta.pagos:
+        destino.agregar("pagos", pago)
+    return {"socios": len(socios), "movimientosCuentaCorriente": len(cuenta.movimientos),
+            "pagos": len(cuenta.pagos)}
+
+def emitir_libro_stock(destino, libro):
+    """Cierra el libro de stock y envía sus movimientos al destino; devuelve la cantidad"""
+    libro.cerrar()
+    for movimiento in libro.movimientos:
+        destino.agregar("movimientosStock", movimiento)
+    return len(libro.movimientos)
+
+def emitir_flujo_caja(destino, caja):
+    """Envía al destino los movimientos de caja a medida que el merge los genera; devuelve la cantidad"""
+    cantidad = 0
+    for movimiento in caja.movimientos():
+        destino.agregar("movimientosCaja", movimiento)
+        cantidad += 1
+    return cantidad
 
 # ============================================================================
 # MIGRACIÓN HOJA 3: GASTOS FIJOS
 # ============================================================================
 
-print("\n" + "=" * 100)
-print("MIGRACIÓN HOJA 3: GASTOS FIJOS")
-print("=" * 100)
+def migrar_gastos_fijos(rows, informe=SIN_INFORME, filas_origen=None):
+    """
+    Migra los gastos fijos mensuales (filas 4 a 15); el ID es la huella del detalle.
+    Las filas sin detalle o sin un monto numérico positivo se cuentan en el informe.
+    filas_origen: dict opcional que se completa con {origen: (hoja, fila)} de cada gasto.
+    """
+    gastos_fijos = []
+    ocurrencias = Ocurrencias()
+    gf_counter = 1
+
+    for i, row in enumerate(islice(rows, 3, 15), 4):
+        informe.fila()
+        if not (row[3] and row[4]):  # Sin detalle o sin monto
+            informe.saltar("sin_detalle_o_monto")
+            continue
+        monto = float(row[4]) if isinstance(row[4], (int, float)) else 0
+        if monto <= 0:
+            informe.saltar("monto_no_numerico")
+            continue
+        origen = ocurrencias.huella(HOJA_GASTOS_FIJOS, row[3])
+        if filas_origen is not None:
+            filas_origen[origen] = (HOJA_GASTOS_FIJOS, i)
+        gastos_fijos.append({
+            "id": f"gfijo-{origen}",
+            "numero": gf_counter,
+            "fecha": "2025-01-10T00:00:00",
+            "categoriaId": "cat-fijo",
+            "detalle": clean_string(row[3]),
+            "monto": monto,
+            "metodoPago": "TRANSFERENCIA",
+            "pagado": True,
+            "esRecurrente": True,
+            "frecuencia": "MENSUAL",
+            "notas": clean_string(row[6]) if row[6] else None
+        })
+        gf_counter += 1
+
+    return gastos_fijos
+
+# ============================================================================
+# DESTINOS DE LA MIGRACIÓN
+# ============================================================================
+
+COLECCIONES = [
+    "inversores", "gastosInversion", "socios", "ventas",
+    "itemsVenta", "gastosOperativos", "gastosFijos",
+    "movimientosCuentaCorriente", "pagos", "movimientosStock", "movimientosCaja",
+]
+
+# Colecciones derivadas de todas las filas (también las de corridas previas): la cuenta
+# corriente, los socios con su saldo y el libro de stock, que se emiten completas al
+# terminar STOCK Y VENTAS, y el flujo de caja, que se emite al final de la migración.
+COLECCIONES_DERIVADAS = ("socios", "movimientosCuentaCorriente", "pagos", "movimientosStock",
+                         "movimientosCaja")
+
+# Colecciones que se recalculan completas en cada corrida (también en modo incremental)
+COLECCIONES_RECALCULADAS = ("inversores", "gastosFijos") + COLECCIONES_DERIVADAS
+
+CLAVES_ESTADISTICAS = {
+    "inversores": "totalInversores",
+    "gastosInversion": "totalGastosInversion",
+    "socios": "totalSocios",
+    "ventas": "totalVentas",
+    "itemsVenta": "totalItemsVenta",
+    "gastosOperativos": "totalGastosOperativos",
+    "gastosFijos": "totalGastosFijos",
+    "movimientosCuentaCorriente": "totalMovimientosCuentaCorriente",
+    "pagos": "totalPagos",
+    "movimientosStock": "totalMovimientosStock",
+    "movimientosCaja": "totalMovimientosCaja",
+}
+
+def calcular_estadisticas(totales):
+    """Arma el bloque estadisticas a partir de la cantidad de registros por colección"""
+    return {CLAVES_ESTADISTICAS[c]: totales[c] for c in COLECCIONES}
+
+class ResultadoJson:
+    """
+    Destino que acumula las entidades en listas para el JSON único clásico.
+    Las entidades quedan como registros compactos (records.py) hasta guardar_resultado.
+    """
+
+    def __init__(self, anterior=None):
+        self.colecciones = {
+            c: list(anterior[c]) if anterior and c not in COLECCIONES_RECALCULADAS else []
+            for c in COLECCIONES
+        }
 
-ws_fijos = wb['GASTOS FIJOS Y OTROS']
-rows_fijos = list(ws_fijos.iter_rows(values_only=True))
+    @property
+    def totales(self):
+        return {c: len(registros) for c, registros in self.colecciones.items()}
+
+    def agregar(self, coleccion, entidad):
+        self.colecciones[coleccion].append(entidad)
+
+    def cerrar(self, estadisticas):
+        resultado = dict(self.colecciones)
+        resultado["estadisticas"] = estadisticas
+        return resultado
+
+    def descartar(self):
+        self.colecciones = {c: [] for c in COLECCIONES}
+
+def crear_destino(formato, salida_path, compresion=None, anterior=None):
+    """
+    Crea el destino de la migración ('json', 'ndjson' o 'copy');
+    anterior continúa una corrida previa (no aplica a 'copy').
+    """
+    if formato == 'copy':
+        from bulk_load import CopyWriter
+        return CopyWriter(salida_path)
+    if formato == 'ndjson':
+        from ndjson_output import NdjsonWriter
+        return NdjsonWriter(salida_path, COLECCIONES, compresion=compresion,
+                            previo=anterior, recalculadas=COLECCIONES_RECALCULADAS)
+    return ResultadoJson(anterior)
+
+# Colecciones de la corrida previa que necesita una corrida incremental
+COLECCIONES_PREVIAS = ("socios", "ventas", "movimientosStock", "gastosInversion", "gastosOperativos")
+
+def cargar_anterior(formato, salida_path, compresion=None):
+    """
+    Devuelve (anterior, previas) de la corrida previa sobre salida_path, o (None, None)
+    si no hay una compatible. previas es {coleccion: registros} de COLECCIONES_PREVIAS;
+    para NDJSON `anterior` es el manifiesto y las colecciones se leen en streaming.
+    """
+    if formato == 'ndjson':
+        from ndjson_output import iter_coleccion, leer_manifiesto
+        manifiesto = leer_manifiesto(salida_path)
+        if (manifiesto is None or manifiesto.get('compresion') != compresion
+                or not all(c in manifiesto['colecciones'] for c in COLECCIONES_PREVIAS)):
+            return None, None
+        return manifiesto, {c: iter_coleccion(salida_path, c, manifiesto) for c in COLECCIONES_PREVIAS}
+
+    if not Path(salida_path).is_file():
+        return None, None
+    with open(salida_path, encoding='utf-8') as f:
+        anterior = json.load(f)
+    if not all(c in anterior for c in COLECCIONES_PREVIAS):
+        return None, None
+    return anterior, {c: anterior[c] for c in COLECCIONES_PREVIAS}
 
-gastos_fijos = []
-gf_counter = 1
+# ============================================================================
+# MIGRACIÓN COMPLETA
+# ============================================================================
 
-for i, row in enumerate(rows_fijos[3:15], 4):
-    if row[3] and row[4]:  # Si hay detalle y monto
+def migrar(excel_path=EXCEL_PATH, streaming=False, usar_cache=True, destino=None,
+           previas=None, marca_previa=None, alias=None, reglas=None, informe=SIN_INFORME):
+    """
+    Ejecuta la migración de las tres hojas enviando las entidades al destino
+    (por defecto un ResultadoJson) y devuelve (destino.cerrar(), marca de agua).
+
+    Con marca_previa solo migra las filas nuevas de INVERSION GASTOS y STOCK Y VENTAS,
+    continuando la numeración de ventas y gastos y el índice de socios de la corrida
+    anterior; el destino debe haberse creado a partir de esa corrida y previas tiene sus
+    socios, ventas, movimientosStock y gastos (ver cargar_anterior). Los inversores y los gastos fijos
+    (bloque acotado de 12 filas) se recalculan siempre, igual que las COLECCIONES_DERIVADAS,
+    que combinan lo previo con las filas nuevas.
+    alias: mapa {variante: canónico} de socios_dedup.py.
+    reglas: {hoja: Clasificador} de classifier.cargar_reglas (por defecto solo las de venta).
+    informe: run_report.Informe donde se mide cada etapa.
+    Lanza PrefijoModificado si cambiaron filas ya migradas, el mapa de alias, las reglas o
+    el esquema de IDs (content_ids.ESQUEMA_IDS).
+    """
+    destino = destino if destino is not None else ResultadoJson()
+    incremental = marca_previa is not None
+    bloques_previos = marca_previa["bloques"] if incremental else {}
+    contadores = dict(marca_previa["contadores"]) if incremental else {}
+    reglas = reglas or cargar_reglas(None)
+    huellas = {"alias": huella_alias(alias), "reglas": huella_reglas(reglas), "ids": ESQUEMA_IDS}
+    if incremental and marca_previa.get("huellas") != huellas:
+        destino.descartar()
+        raise PrefijoModificado("cambiaron el mapa de alias, las reglas de clasificación o el esquema de IDs")
+    alias_plegado = mapa_por_plegado(alias) if alias else None
+    for clasificador in reglas.values():
+        clasificador.sin_regla.clear()
+
+    with informe.etapa("carga_workbook"):
+        wb = load_workbook(excel_path, streaming=streaming, usar_cache=usar_cache)
+
+    previas = previas or {}
+    caja = FlujoCaja()
+    # Los gastos de corridas previas van antes que los nuevos, como en una migración completa
+    for coleccion in ("gastosInversion", "gastosOperativos"):
+        for entidad in previas.get(coleccion, ()):
+            caja.agregar(coleccion, entidad)
+
+    try:
+        print("=" * 100)
+        print("MIGRACIÓN HOJA 1: INVERSIÓN GASTOS")
+        print("=" * 100)
+
+        marcas = marcas_inversion(bloques_previos)
+        with informe.etapa("hoja1_inversion"):
+            inversores, gastos_inversion = migrar_inversion(
+                iter_filas(wb, HOJA_INVERSION), marcas, reglas=reglas["inversion"], informe=informe
+            )
+            for inversor in inversores:
+                destino.agregar("inversores", inversor)
+            for gasto in gastos_inversion:
+                caja.agregar("gastosInversion", gasto)
+                destino.agregar("gastosInversion", gasto)
+            informe.entidades({"inversores": len(inversores), "gastosInversion": len(gastos_inversion)})
+
+        print(f"\nInversores creados: {len(inversores)}")
+        print(f"Gastos de inversión migrados: {len(gastos_inversion)}")
+        imprimir_sin_regla(reglas["inversion"], "Categorías de inversión", limite=5)
+
+        print("\n" + "=" * 100)
+        print("MIGRACIÓN HOJA 2: STOCK Y VENTAS")
+        print("=" * 100)
+
+        marcas["stock"] = marca_stock(bloques_previos.get("stock"))
+        estado = nuevo_estado_stock(previas.get("socios", ()), contadores)
+        cuenta = CuentaCorriente()
+        for venta in previas.get("ventas", ()):
+            cuenta.agregar_venta(venta)
+            caja.agregar("ventas", venta)
+        libro = LibroStock()
+        for movimiento in previas.get("movimientosStock", ()):
+            libro.agregar_registro(movimiento)
+        libro.cerrar()
+        with informe.etapa("hoja2_stock_ventas"):
+            cantidades = migrar_stock(iter_filas(wb, HOJA_STOCK), destino, marcas["stock"], estado,
+                                      alias_plegado, reglas["stock"], informe, cuenta, libro, caja)
+            informe.entidades(cantidades)
+        contadores.update({k: estado[k] for k in ("venta", "gasto")})
+
+        print(f"\nSocios migrados: {cantidades['socios']}")
+        print(f"Ventas migradas: {cantidades['ventas']}")
+        print(f"Items de venta migrados: {cantidades['itemsVenta']}")
+        print(f"Gastos operativos migrados: {cantidades['gastosOperativos']}")
+        imprimir_sin_regla(reglas["stock"], "Categorías de gastos", limite=5)
+
+        with informe.etapa("cuenta_corriente"):
+            cantidades_cuenta = emitir_cuenta_corriente(destino, estado["socios"].values(), cuenta)
+            informe.entidades({c: n for c, n in cantidades_cuenta.items() if c != "socios"})
+        print(f"\nMovimientos de cuenta corriente: {cantidades_cuenta['movimientosCuentaCorriente']}")
+        print(f"Pagos: {cantidades_cuenta['pagos']}")
+        print(f"Socios que pasan el límite de crédito: {len(cuenta.socios_sobre_limite())}")
+
+        with informe.etapa("libro_stock"):
+            informe.entidades({"movimientosStock": emitir_libro_stock(destino, libro)})
+        print(f"Movimientos de stock: {len(libro.movimientos)}")
+        for producto_id in libro.productos():
+            print(f"  - Stock de {producto_id}: {libro.stock(producto_id):,.2f}")
+
+        print("\n" + "=" * 100)
+        print("MIGRACIÓN HOJA 3: GASTOS FIJOS")
+        print("=" * 100)
+
+        with informe.etapa("hoja3_gastos_fijos"):
+            gastos_fijos = migrar_gastos_fijos(iter_filas(wb, HOJA_GASTOS_FIJOS), informe)
+            for gasto in gastos_fijos:
+                caja.agregar("gastosFijos", gasto)
+                destino.agregar("gastosFijos", gasto)
+            informe.entidades({"gastosFijos": len(gastos_fijos)})
+
+        print(f"Gastos fijos migrados: {len(gastos_fijos)}")
+
+        with informe.etapa("flujo_caja"):
+            cantidad_caja = emitir_flujo_caja(destino, caja)
+            informe.entidades({"movimientosCaja": cantidad_caja})
+        print(f"\nMovimientos de caja: {cantidad_caja}")
+        for metodo, saldo in caja.saldos.items():
+            print(f"  - Saldo {metodo}: ${saldo:,.2f}")
+    except BaseException:
+        destino.descartar()
+        raise
+    finally:
+        wb.close()
+
+    with informe.etapa("cierre_destino"):
+        resultado = destino.cerrar(calcular_estadisticas(destino.totales))
+    return resultado, {"bloques": marcas, "contadores": contadores, "huellas": huellas}
+
+def migrar_incremental(excel_path=EXCEL_PATH, salida_path=SALIDA_PATH, streaming=False,
+                       usar_cache=True, formato='json', compresion=None, alias=None, reglas=None,
+                       informe=SIN_INFORME):
+    """
+    Migra solo las filas nuevas desde la última corrida sobre salida_path.
+    Si no hay corrida previa o cambiaron filas ya migradas, hace la migración completa.
+    """
+    marca_previa = cargar_marca(salida_path)
+    anterior, previas = (None, None) if marca_previa is None else \
+        cargar_anterior(formato, salida_path, compresion)
+
+    if anterior is not None:
         try:
-            monto = float(row[4]) if isinstance(row[4], (int, float)) else 0
-            if monto > 0:
-                gasto = {
-                    "id": generate_id("gfijo", gf_counter),
-                    "numero": gf_counter,
-                    "fecha": "2025-01-10T00:00:00",
-                    "categoriaId": "cat-fijo",
-                    "detalle": clean_string(row[3]),
-                    "monto": monto,
-                    "metodoPago": "TRANSFERENCIA",
-                    "pagado": True,
-                    "esRecurrente": True,
-                    "frecuencia": "MENSUAL",
-                    "notas": clean_string(row[6]) if row[6] else None
-                }
-                gastos_fijos.append(gasto)
-                gf_counter += 1
-        except:
-            pass
-
-print(f"Gastos fijos migrados: {len(gastos_fijos)}")
+            return migrar(excel_path, streaming=streaming, usar_cache=usar_cache,
+                          destino=crear_destino(formato, salida_path, compresion, anterior),
+                          previas=previas, marca_previa=marca_previa, alias=alias, reglas=reglas,
+                          informe=informe)
+        except PrefijoModificado as e:
+            print(f"\n{e}: se rehace la migración completa\n")
+    else:
+        print("Sin una corrida previa compatible: se hace la migración completa\n")
+
+    return migrar(excel_path, streaming=streaming, usar_cache=usar_cache,
+                  destino=crear_destino(formato, salida_path, compresion), alias=alias, reglas=reglas,
+                  informe=informe)
 
 # ============================================================================
 # GUARDAR RESULTADOS
 # ============================================================================
 
-print("\n" + "=" * 100)
-print("GUARDANDO RESULTADOS")
-print("=" * 100)
-
-resultado = {
-    "inversores": inversores,
-    "gastosInversion": gastos_inversion,
-    "socios": socios,
-    "ventas": ventas,
-    "itemsVenta": items_venta,
-    "gastosOperativos": gastos_operativos,
-    "gastosFijos": gastos_fijos,
-    "estadisticas": {
-        "totalInversores": len(inversores),
-        "totalGastosInversion": len(gastos_inversion),
-        "totalSocios": len(socios),
-        "totalVentas": len(ventas),
-        "totalItemsVenta": len(items_venta),
-        "totalGastosOperativos": len(gastos_operativos),
-        "totalGastosFijos": len(gastos_fijos)
+def imprimir_estadisticas(stats, salida_path):
+    """Imprime las estadísticas finales de la corrida"""
+    print(f"\nArchivo generado: {salida_path}")
+    print(f"\nESTADÍSTICAS FINALES:")
+    print(f"  - Inversores: {stats['totalInversores']}")
+    print(f"  - Gastos de inversión: {stats['totalGastosInversion']}")
+    print(f"  - Socios: {stats['totalSocios']}")
+    print(f"  - Ventas: {stats['totalVentas']}")
+    print(f"  - Items de venta: {stats['totalItemsVenta']}")
+    print(f"  - Gastos operativos: {stats['totalGastosOperativos']}")
+    print(f"  - Gastos fijos: {stats['totalGastosFijos']}")
+    if "totalMovimientosCuentaCorriente" in stats:  # Salidas anteriores a la cuenta corriente
+        print(f"  - Movimientos de cuenta corriente: {stats['totalMovimientosCuentaCorriente']}")
+        print(f"  - Pagos: {stats['totalPagos']}")
+    if "totalMovimientosStock" in stats:
+        print(f"  - Movimientos de stock: {stats['totalMovimientosStock']}")
+    if "totalMovimientosCaja" in stats:
+        print(f"  - Movimientos de caja: {stats['totalMovimientosCaja']}")
+
+def guardar_resultado(resultado, salida_path=SALIDA_PATH):
+    """Guarda el resultado como JSON e imprime las estadísticas finales"""
+    print("\n" + "=" * 100)
+    print("GUARDANDO RESULTADOS")
+    print("=" * 100)
+
+    with open(salida_path, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2, default=a_json)
+
+    imprimir_estadisticas(resultado["estadisticas"], salida_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migra el Excel al nuevo modelo de datos")
+    parser.add_argument('--excel', default=EXCEL_PATH, help="Workbook de origen")
+    parser.add_argument('--salida', default=None,
+                        help=f"Archivo JSON (o directorio NDJSON) de salida; por defecto {SALIDA_PATH}")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Lee el Excel directo, sin snapshot, y procesa las filas en streaming")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="Ignora el snapshot cacheado y lee el Excel directo (xlsx_reader.py)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Migra solo las filas nuevas desde la última corrida")
+    parser.add_argument('--formato', choices=['json', 'ndjson', 'copy'], default='json',
+                        help="json: un único archivo indentado; ndjson: un archivo por colección; "
+                             "copy: TSV por tabla para COPY de Postgres")
+    parser.add_argument('--compresion', choices=['gzip', 'lzma'], default=None,
+                        help="Compresión de los archivos NDJSON")
+    parser.add_argument('--alias-socios', default=ALIAS_PATH,
+                        help=f"Mapa de alias de clientes (socios_dedup.py); por defecto {ALIAS_PATH} si existe")
+    parser.add_argument('--sin-alias', action='store_true',
+                        help="No unifica variantes de nombres de clientes")
+    parser.add_argument('--reglas', default=REGLAS_PATH,
+                        help=f"Reglas de clasificación por palabra clave; por defecto {REGLAS_PATH}")
+    parser.add_argument('--informe', default=None,
+                        help="Guarda el informe de ejecución por etapas en este JSON")
+    parser.add_argument('--memoria', action='store_true',
+                        help="Agrega al informe el pico de memoria (tracemalloc) de cada etapa")
+    parser.add_argument('--perfil', default=None,
+                        help="Guarda un volcado de cProfile de la corrida (ver con python -m pstats)")
+    args = parser.parse_args(argv)
+
+    if args.compresion and args.formato != 'ndjson':
+        parser.error("--compresion solo aplica con --formato ndjson")
+    if args.incremental and args.formato == 'copy':
+        parser.error("--incremental no aplica con --formato copy")
+    salidas_por_defecto = {
+        'json': SALIDA_PATH,
+        'ndjson': str(Path(SALIDA_PATH).with_suffix('')),
+        'copy': 'copy_migracion',
     }
-}
-
-# Guardar JSON
-with open('datos_migrados.json', 'w', encoding='utf-8') as f:
-    json.dump(resultado, f, ensure_ascii=False, indent=2)
-
-print(f"\nArchivo generado: datos_migrados.json")
-print(f"\nESTADÍSTICAS FINALES:")
-print(f"  - Inversores: {len(inversores)}")
-print(f"  - Gastos de inversión: {len(gastos_inversion)}")
-print(f"  - Socios: {len(socios)}")
-print(f"  - Ventas: {len(ventas)}")
-print(f"  - Items de venta: {len(items_venta)}")
-print(f"  - Gastos operativos: {len(gastos_operativos)}")
-print(f"  - Gastos fijos: {len(gastos_fijos)}")
-
-print("\n" + "=" * 100)
-print("MIGRACIÓN COMPLETADA")
-print("=" * 100)
-
-wb.close()
+    salida = args.salida or salidas_por_defecto[args.formato]
+    informe = Informe(memoria=args.memoria) if args.informe or args.memoria else SIN_INFORME
+    informe.contexto.update(excel=args.excel, salida=str(salida), formato=args.formato,
+                            compresion=args.compresion, incremental=args.incremental,
+                            streaming=args.streaming, cache=not args.sin_cache)
+
+    if args.perfil:
+        import cProfile
+        perfil = cProfile.Profile()
+        perfil.runcall(ejecutar, args, salida, informe)
+        perfil.dump_stats(args.perfil)
+    else:
+        ejecutar(args, salida, informe)
+
+    if informe.activo:
+        print("\n" + "=" * 100)
+        print("INFORME DE EJECUCIÓN")
+        print("=" * 100)
+        informe.imprimir()
+        if args.informe:
+            informe.guardar(args.informe)
+            print(f"\nInforme guardado en {args.informe}")
+    if args.perfil:
+        print(f"Perfil de cProfile guardado en {args.perfil}")
+
+    print("\n" + "=" * 100)
+    print("MIGRACIÓN COMPLETADA")
+    print("=" * 100)
+
+def ejecutar(args, salida, informe=SIN_INFORME):
+    """Corre la migración con las opciones de la línea de comandos y guarda la salida"""
+    alias = None if args.sin_alias else cargar_alias(args.alias_socios)
+    opciones = dict(streaming=args.streaming, usar_cache=not args.sin_cache, alias=alias,
+                    reglas=cargar_reglas(args.reglas), informe=informe)
+
+    if args.incremental:
+        resultado, marca = migrar_incremental(args.excel, salida, formato=args.formato,
+                                              compresion=args.compresion, **opciones)
+    else:
+        destino = crear_destino(args.formato, salida, args.compresion)
+        resultado, marca = migrar(args.excel, destino=destino, **opciones)
+
+    if args.formato == 'ndjson':
+        print("\n" + "=" * 100)
+        print("RESULTADOS GUARDADOS (NDJSON)")
+        print("=" * 100)
+        imprimir_estadisticas(resultado["estadisticas"], Path(salida) / 'manifest.json')
+    elif args.formato == 'copy':
+        print("\n" + "=" * 100)
+        print("ARCHIVOS COPY GENERADOS")
+        print("=" * 100)
+        imprimir_estadisticas(resultado["estadisticas"], Path(salida) / 'load.sql')
+    else:
+        with informe.etapa("salida_json"):
+            guardar_resultado(resultado, salida)
+            informe.fila(sum(resultado["estadisticas"].values()))
+    guardar_marca(salida, marca["bloques"], marca["contadores"], marca["huellas"])
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
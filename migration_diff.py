@@ -0,0 +1,153 @@
+"""
+Diferencias entre dos salidas de la migración, como change set para sincronizar
+
+Compara una salida anterior con una nueva (JSON único o directorio NDJSON) entidad por
+entidad y genera los cambios mínimos por colección:
+
+- insert: el registro no existía (va completo)
+- update: existía con otro contenido (van solo los campos que cambiaron)
+- delete: ya no está en la salida nueva (va solo el id)
+
+La identidad de cada registro es su id: desde content_ids.py es un hash de la fila de
+origen, así una fila que no cambió conserva su id entre corridas. Si cambia una columna
+de la identidad (fecha, detalle, cliente, total) la fila es otra: delete + insert. Si
+cambia el resto (DEUDAS, modo de pago, notas, reglas de clasificación...) es un update.
+
+Todo se hace en streaming y en tiempo lineal, sin tener ninguna de las dos salidas
+completa en memoria:
+
+1. nueva: índice {id: huella} por colección (la huella es un hash de 16 bytes del
+   registro en JSON canónico, no el registro)
+2. anterior: cada registro se busca en el índice; los que no están son deletes y los de
+   huella distinta se guardan (son los únicos registros completos en memoria)
+3. nueva otra vez: se emiten los inserts y, contra el registro anterior guardado, los
+   updates, en el orden de la salida (colecciones referenciadas primero). Los deletes
+   van al final, en el orden inverso de las colecciones.
+
+El change set es un NDJSON con una línea por cambio:
+    {"coleccion": "ventas", "op": "update", "id": "venta-...", "cambios": {"estadoPago": "PAGADO"}}
+
+Uso:
+    python migration_diff.py ANTERIOR NUEVA [--salida cambios.ndjson] [--colecciones ventas socios ...]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from ndjson_output import iter_salida
+from records import a_json
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+_FALTA = object()
+
+
+def huella_registro(registro):
+    """Hash de 16 bytes del registro en JSON canónico (claves ordenadas)"""
+    texto = json.dumps(registro, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=a_json)
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest()
+
+
+def _filtrar(salida, colecciones):
+    for coleccion, registro in iter_salida(salida):
+        if colecciones is None or coleccion in colecciones:
+            yield coleccion, registro
+
+
+def campos_cambiados(anterior, nuevo):
+    """{campo: valor nuevo} de los campos que cambiaron (None para los que ya no están)"""
+    cambios = {campo: valor for campo, valor in nuevo.items() if anterior.get(campo, _FALTA) != valor}
+    cambios.update((campo, None) for campo in anterior if campo not in nuevo)
+    return cambios
+
+
+def diferencias(anterior, nueva, colecciones=None):
+    """
+    Genera los cambios (dicts coleccion/op/id y registro o cambios) para pasar de la
+    salida anterior a la nueva. colecciones limita la comparación a esas colecciones.
+    """
+    colecciones = set(colecciones) if colecciones else None
+
+    indice = {}
+    for coleccion, registro in _filtrar(nueva, colecciones):
+        indice.setdefault(coleccion, {})[registro["id"]] = huella_registro(registro)
+
+    borrados = {}
+    distintos = {}
+    for coleccion, registro in _filtrar(anterior, colecciones):
+        huellas = indice.get(coleccion, {})
+        huella = huellas.pop(registro["id"], None)
+        if huella is None:
+            borrados.setdefault(coleccion, []).append(registro["id"])
+        elif huella != huella_registro(registro):
+            distintos[(coleccion, registro["id"])] = registro
+    # Lo que quedó en el índice no estaba en la salida anterior
+    nuevos = {(coleccion, id_) for coleccion, huellas in indice.items() for id_ in huellas}
+    del indice
+
+    orden = []
+    for coleccion, registro in _filtrar(nueva, colecciones):
+        if not orden or orden[-1] != coleccion:
+            orden.append(coleccion)
+        clave = (coleccion, registro["id"])
+        if clave in nuevos:
+            yield {"coleccion": coleccion, "op": INSERT, "id": registro["id"], "registro": registro}
+        elif clave in distintos:
+            cambios = campos_cambiados(distintos.pop(clave), registro)
+            yield {"coleccion": coleccion, "op": UPDATE, "id": registro["id"], "cambios": cambios}
+
+    colecciones_borradas = [c for c in reversed(orden) if c in borrados]
+    colecciones_borradas += [c for c in borrados if c not in orden]
+    for coleccion in colecciones_borradas:
+        for id_ in borrados[coleccion]:
+            yield {"coleccion": coleccion, "op": DELETE, "id": id_}
+
+
+def escribir_cambios(cambios, salida):
+    """Escribe los cambios como NDJSON y devuelve {coleccion: {op: cantidad}}"""
+    resumen = {}
+    with open(salida, 'w', encoding='utf-8') as f:
+        for cambio in cambios:
+            f.write(json.dumps(cambio, ensure_ascii=False, default=a_json))
+            f.write('\n')
+            conteo = resumen.setdefault(cambio["coleccion"], dict.fromkeys((INSERT, UPDATE, DELETE), 0))
+            conteo[cambio["op"]] += 1
+    return resumen
+
+
+def leer_cambios(ruta):
+    """Itera los cambios de un change set NDJSON"""
+    with open(ruta, encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Change set entre dos salidas de la migración")
+    parser.add_argument('anterior', help="Salida anterior (JSON o directorio NDJSON)")
+    parser.add_argument('nueva', help="Salida nueva (JSON o directorio NDJSON)")
+    parser.add_argument('--salida', default='cambios.ndjson', help="Change set NDJSON a generar")
+    parser.add_argument('--colecciones', nargs='+', help="Comparar solo estas colecciones")
+    args = parser.parse_args(argv)
+
+    for ruta in (args.anterior, args.nueva):
+        if not Path(ruta).exists():
+            parser.error(f"No existe la salida {ruta}")
+
+    resumen = escribir_cambios(diferencias(args.anterior, args.nueva, args.colecciones), args.salida)
+    print(f"{'COLECCION':<28} {'INSERTS':>8} {'UPDATES':>8} {'DELETES':>8}")
+    for coleccion, conteo in resumen.items():
+        print(f"{coleccion:<28} {conteo[INSERT]:>8} {conteo[UPDATE]:>8} {conteo[DELETE]:>8}")
+    total = sum(sum(conteo.values()) for conteo in resumen.values())
+    print(f"\nCambios: {total}" + (f" -> {args.salida}" if total else " (las salidas son iguales)"))
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
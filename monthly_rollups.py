@@ -0,0 +1,338 @@
+"""
+Acumulados mensuales materializados para los tableros
+
+Guarda por (dimensión, mes, valor) el monto, la cantidad de registros y las unidades,
+armados desde las ventas, itemsVenta, gastosOperativos y gastosFijos migrados:
+
+- ingresos: total de las ventas, por método de pago
+- entregador: total de las ventas, por entregador (quien entregó, la columna ENTREGADOR
+  de la hoja; vendedorId queda sin asignar porque la hoja no tiene los datos que pide
+  la tabla empleados). Las ventas sin entregador van a SIN ASIGNAR
+- producto: total y cantidad de los items, por productoId (en el mes de su venta)
+- egresos: gastos operativos (y gastos fijos no recurrentes), por categoriaId
+- gastos_fijos: gastos fijos mensuales, por detalle, en el mes desde el que rigen; un
+  mes paga todos los que rigen desde ese mes o antes
+
+Además de los acumulados se guardan los pocos campos de cada registro que los afectan,
+así que aplicar un lote (registros nuevos o el change set de migration_diff.py) solo
+resta el aporte anterior y suma el nuevo en los meses tocados, sin recorrer el resto.
+Las consultas por rango de meses (serie, totales, resumen) leen solo los acumulados.
+
+Se guarda en .cache/rollups/mensuales.json.
+
+Uso:
+    python monthly_rollups.py construir [--entrada datos_migrados.json]
+    python monthly_rollups.py aplicar CAMBIOS.ndjson
+    python monthly_rollups.py consultar [--desde AAAA-MM] [--hasta AAAA-MM]
+                                        [--dimension ingresos|entregador|producto|egresos|gastos_fijos]
+"""
+
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+
+from records import clave_fecha
+
+STORE_PATH = Path('.cache') / 'rollups' / 'mensuales.json'
+FORMATO_STORE = 2
+
+INGRESOS = "ingresos"
+ENTREGADOR = "entregador"
+PRODUCTO = "producto"
+EGRESOS = "egresos"
+GASTOS_FIJOS = "gastos_fijos"
+DIMENSIONES = (INGRESOS, ENTREGADOR, PRODUCTO, EGRESOS, GASTOS_FIJOS)
+
+SIN_ASIGNAR = "SIN ASIGNAR"
+
+# Campos de cada colección que intervienen en los acumulados
+CAMPOS = {
+    "ventas": ("fecha", "total", "metodoPago", "entregador"),
+    "itemsVenta": ("ventaId", "productoId", "total", "cantidad"),
+    "gastosOperativos": ("fecha", "categoriaId", "monto"),
+    "gastosFijos": ("fecha", "detalle", "categoriaId", "monto", "esRecurrente", "frecuencia"),
+}
+
+
+def mes_de(fecha):
+    """'AAAA-MM' de una fecha (datetime, date o ISO)"""
+    return clave_fecha(fecha)[:7]
+
+
+class AcumuladosMensuales:
+    """
+    Acumulados {dimensión: {mes: {valor: [monto, cantidad, unidades]}}} con los campos
+    de cada registro que aportan. Se alimenta con agregar/aplicar en cualquier orden:
+    un item cuya venta todavía no llegó queda sin aportar hasta que llega.
+    """
+
+    def __init__(self):
+        self._acumulados = {dimension: {} for dimension in DIMENSIONES}
+        self._meses = {dimension: [] for dimension in DIMENSIONES}
+        self._registros = {coleccion: {} for coleccion in CAMPOS}
+        self._items_por_venta = {}
+        self.tocados = set()  # (dimensión, mes) modificados desde el último reiniciar_tocados()
+
+    # ------------------------------------------------------------------------
+    # Actualización
+    # ------------------------------------------------------------------------
+
+    def _aportes(self, coleccion, campos):
+        """[(dimensión, mes, valor, monto, cantidad, unidades)] de un registro"""
+        if campos is None:
+            return []
+        if coleccion == "ventas":
+            mes, total = mes_de(campos["fecha"]), campos["total"] or 0
+            return [(INGRESOS, mes, campos["metodoPago"] or SIN_ASIGNAR, total, 1, 0),
+                    (ENTREGADOR, mes, campos["entregador"] or SIN_ASIGNAR, total, 1, 0)]
+        if coleccion == "itemsVenta":
+            venta = self._registros["ventas"].get(campos["ventaId"])
+            if venta is None:
+                return []
+            return [(PRODUCTO, mes_de(venta["fecha"]), campos["productoId"], campos["total"] or 0, 1,
+                     campos["cantidad"] or 0)]
+        if coleccion == "gastosOperativos":
+            return [(EGRESOS, mes_de(campos["fecha"]), campos["categoriaId"], campos["monto"] or 0, 1, 0)]
+        if campos["esRecurrente"] and campos["frecuencia"] == "MENSUAL":
+            return [(GASTOS_FIJOS, mes_de(campos["fecha"]), campos["detalle"], campos["monto"] or 0, 1, 0)]
+        return [(EGRESOS, mes_de(campos["fecha"]), campos["categoriaId"], campos["monto"] or 0, 1, 0)]
+
+    def _sumar(self, aportes, signo):
+        for dimension, mes, valor, monto, cantidad, unidades in aportes:
+            por_mes = self._acumulados[dimension]
+            if mes not in por_mes:
+                por_mes[mes] = {}
+                insort(self._meses[dimension], mes)
+            acumulado = por_mes[mes].setdefault(valor, [0, 0, 0])
+            acumulado[0] = round(acumulado[0] + signo * monto, 2)
+            acumulado[1] += signo * cantidad
+            acumulado[2] = round(acumulado[2] + signo * unidades, 3)
+            if acumulado[1] == 0:
+                del por_mes[mes][valor]
+                if not por_mes[mes]:
+                    del por_mes[mes]
+                    self._meses[dimension].remove(mes)
+            self.tocados.add((dimension, mes))
+
+    def _reemplazar(self, coleccion, id_, campos):
+        """Cambia los campos de un registro (None lo borra) restando y sumando solo su aporte"""
+        afectados = [(coleccion, id_)]
+        if coleccion == "ventas":
+            afectados += [("itemsVenta", item_id) for item_id in self._items_por_venta.get(id_, ())]
+        for c, i in afectados:
+            self._sumar(self._aportes(c, self._registros[c].get(i)), -1)
+
+        anterior = self._registros[coleccion].pop(id_, None)
+        if coleccion == "itemsVenta" and anterior is not None:
+            items = self._items_por_venta.get(anterior["ventaId"], set())
+            items.discard(id_)
+            if not items:
+                self._items_por_venta.pop(anterior["ventaId"], None)
+        if campos is not None:
+            self._registros[coleccion][id_] = campos
+            if coleccion == "itemsVenta":
+                self._items_por_venta.setdefault(campos["ventaId"], set()).add(id_)
+
+        for c, i in afectados:
+            self._sumar(self._aportes(c, self._registros[c].get(i)), 1)
+
+    def agregar(self, coleccion, registro):
+        """Agrega (o reemplaza) un registro; las colecciones que no aportan se ignoran"""
+        if coleccion in CAMPOS:
+            campos = {campo: registro.get(campo) for campo in CAMPOS[coleccion]}
+            self._reemplazar(coleccion, registro["id"], campos)
+
+    def agregar_lote(self, registros):
+        """Agrega (coleccion, registro) de un lote; devuelve los (dimensión, mes) tocados"""
+        self.reiniciar_tocados()
+        for coleccion, registro in registros:
+            self.agregar(coleccion, registro)
+        return set(self.tocados)
+
+    def aplicar(self, cambios):
+        """Aplica un change set de migration_diff.py; devuelve los (dimensión, mes) tocados"""
+        self.reiniciar_tocados()
+        for cambio in cambios:
+            coleccion, id_ = cambio["coleccion"], cambio["id"]
+            if coleccion not in CAMPOS:
+                continue
+            if cambio["op"] == "insert":
+                self.agregar(coleccion, cambio["registro"])
+            elif cambio["op"] == "delete":
+                self._reemplazar(coleccion, id_, None)
+            else:
+                actuales = self._registros[coleccion].get(id_)
+                relevantes = {c: v for c, v in cambio["cambios"].items() if c in CAMPOS[coleccion]}
+                if actuales is not None and relevantes:
+                    self._reemplazar(coleccion, id_, dict(actuales, **relevantes))
+        return set(self.tocados)
+
+    def reiniciar_tocados(self):
+        self.tocados = set()
+
+    # ------------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------------
+
+    def meses(self, dimension=None):
+        """Meses con datos de una dimensión (o de todas), ordenados"""
+        if dimension is not None:
+            return list(self._meses[dimension])
+        return sorted(set().union(*self._meses.values()))
+
+    def _rango(self, dimension, desde, hasta):
+        meses = self._meses[dimension]
+        inicio = bisect_left(meses, desde) if desde else 0
+        fin = bisect_right(meses, hasta) if hasta else len(meses)
+        return meses[inicio:fin]
+
+    def serie(self, dimension, desde=None, hasta=None):
+        """[(mes, {valor: (monto, cantidad, unidades)})] de los meses con datos del rango"""
+        por_mes = self._acumulados[dimension]
+        return [(mes, {valor: tuple(a) for valor, a in por_mes[mes].items()})
+                for mes in self._rango(dimension, desde, hasta)]
+
+    def totales(self, dimension, desde=None, hasta=None):
+        """{valor: (monto, cantidad, unidades)} sumados en el rango, de mayor a menor monto"""
+        suma = {}
+        for _, valores in self.serie(dimension, desde, hasta):
+            for valor, (monto, cantidad, unidades) in valores.items():
+                s = suma.setdefault(valor, [0, 0, 0])
+                s[0] += monto
+                s[1] += cantidad
+                s[2] += unidades
+        return {valor: (round(s[0], 2), s[1], round(s[2], 3))
+                for valor, s in sorted(suma.items(), key=lambda par: -par[1][0])}
+
+    def _monto(self, dimension, mes):
+        return sum(a[0] for a in self._acumulados[dimension].get(mes, {}).values())
+
+    def resumen(self, desde=None, hasta=None):
+        """
+        Por cada mes con datos del rango: ingresos, egresos, gastos fijos vigentes y
+        resultado. Los gastos fijos de un mes son los que rigen desde ese mes o antes.
+        """
+        meses = [mes for mes in self.meses() if (not desde or mes >= desde) and (not hasta or mes <= hasta)]
+        if not meses:
+            return []
+        anteriores = self._meses[GASTOS_FIJOS][:bisect_left(self._meses[GASTOS_FIJOS], meses[0])]
+        fijos = sum(self._monto(GASTOS_FIJOS, mes) for mes in anteriores)
+        filas = []
+        for mes in meses:
+            fijos += self._monto(GASTOS_FIJOS, mes)
+            ingresos, egresos = self._monto(INGRESOS, mes), self._monto(EGRESOS, mes)
+            filas.append({"mes": mes, "ingresos": round(ingresos, 2), "egresos": round(egresos, 2),
+                          "gastosFijos": round(fijos, 2), "resultado": round(ingresos - egresos - fijos, 2)})
+        return filas
+
+    # ------------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------------
+
+    def guardar(self, path=STORE_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"formato": FORMATO_STORE, "acumulados": self._acumulados, "registros": self._registros},
+                      f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+
+    @classmethod
+    def cargar(cls, path=STORE_PATH):
+        """Lee un store guardado; None si no existe o es de otro formato"""
+        path = Path(path)
+        if not path.is_file():
+            return None
+        with open(path, encoding='utf-8') as f:
+            datos = json.load(f)
+        if datos.get("formato") != FORMATO_STORE:
+            return None
+        store = cls()
+        store._acumulados.update(datos["acumulados"])
+        store._meses = {dimension: sorted(por_mes) for dimension, por_mes in store._acumulados.items()}
+        store._registros.update(datos["registros"])
+        for item_id, campos in store._registros["itemsVenta"].items():
+            store._items_por_venta.setdefault(campos["ventaId"], set()).add(item_id)
+        return store
+
+
+def construir(entrada):
+    """Arma los acumulados desde una salida de la migración (JSON o directorio NDJSON)"""
+    from ndjson_output import iter_salida
+
+    store = AcumuladosMensuales()
+    store.agregar_lote(iter_salida(entrada))
+    store.reiniciar_tocados()
+    return store
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def imprimir_resumen(store, desde=None, hasta=None):
+    print(f"{'MES':<8} {'INGRESOS':>15} {'EGRESOS':>15} {'GASTOS FIJOS':>15} {'RESULTADO':>15}")
+    for fila in store.resumen(desde, hasta):
+        print(f"{fila['mes']:<8} {fila['ingresos']:>15,.0f} {fila['egresos']:>15,.0f} "
+              f"{fila['gastosFijos']:>15,.0f} {fila['resultado']:>15,.0f}")
+
+
+def imprimir_dimension(store, dimension, desde=None, hasta=None):
+    print(f"{dimension.upper():<24} {'MONTO':>15} {'REGISTROS':>10} {'UNIDADES':>12}")
+    for valor, (monto, cantidad, unidades) in store.totales(dimension, desde, hasta).items():
+        print(f"{str(valor):<24} {monto:>15,.0f} {cantidad:>10} {unidades:>12,.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Acumulados mensuales para los tableros")
+    parser.add_argument('--store', default=str(STORE_PATH), help="Archivo de los acumulados")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_construir = sub.add_parser('construir', help="Arma los acumulados desde una salida completa")
+    p_construir.add_argument('--entrada', default='datos_migrados.json',
+                             help="JSON o directorio NDJSON de la migración")
+
+    p_aplicar = sub.add_parser('aplicar', help="Aplica un change set de migration_diff.py")
+    p_aplicar.add_argument('cambios', help="Change set NDJSON")
+
+    p_consultar = sub.add_parser('consultar', help="Resumen mensual o totales de una dimensión")
+    p_consultar.add_argument('--desde', help="Primer mes (AAAA-MM)")
+    p_consultar.add_argument('--hasta', help="Último mes (AAAA-MM)")
+    p_consultar.add_argument('--dimension', choices=DIMENSIONES, help="Totales por valor de esta dimensión")
+    args = parser.parse_args(argv)
+
+    if args.comando == 'construir':
+        store = construir(args.entrada)
+        store.guardar(args.store)
+        print(f"Acumulados de {len(store.meses())} meses guardados en {args.store}")
+        imprimir_resumen(store)
+        return 0
+
+    store = AcumuladosMensuales.cargar(args.store)
+    if store is None:
+        print(f"No hay acumulados en {args.store}: correr primero `construir`")
+        return 1
+
+    if args.comando == 'aplicar':
+        from migration_diff import leer_cambios
+
+        tocados = store.aplicar(leer_cambios(args.cambios))
+        store.guardar(args.store)
+        meses = sorted({mes for _, mes in tocados})
+        print(f"Acumulados actualizados: {len(tocados)} (dimensión, mes) en {len(meses)} meses"
+              + (f" ({', '.join(meses)})" if meses else ""))
+        return 0
+
+    if args.dimension:
+        imprimir_dimension(store, args.dimension, args.desde, args.hasta)
+    else:
+        imprimir_resumen(store, args.desde, args.hasta)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
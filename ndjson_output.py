@@ -0,0 +1,254 @@
+"""
+Salida NDJSON por entidad para la migración
+
+En lugar de un único JSON indentado, cada colección (inversores, gastosInversion,
+socios, ventas, itemsVenta, gastosOperativos, gastosFijos) se escribe en su propio
+archivo con un registro JSON por línea, a medida que la migración los produce.
+Opcionalmente se comprime con gzip o lzma. Un manifest.json chico guarda el nombre
+de cada archivo, la cantidad de registros y las estadísticas de la corrida.
+
+Estructura:
+    datos_migrados/
+        manifest.json
+        socios.ndjson.gz
+        ventas.ndjson.gz
+        ...
+"""
+
+import gzip
+import json
+import lzma
+import os
+import shutil
+from pathlib import Path
+
+from records import a_json
+
+MANIFIESTO = 'manifest.json'
+FORMATO_NDJSON = 1
+
+COMPRESIONES = {
+    None: ('', open),
+    'gzip': ('.gz', gzip.open),
+    'lzma': ('.xz', lzma.open),
+}
+
+
+def nombre_archivo(coleccion, compresion=None):
+    """Nombre del archivo NDJSON de una colección"""
+    extension, _ = COMPRESIONES[compresion]
+    return f"{coleccion}.ndjson{extension}"
+
+
+def _abrir(ruta, modo, compresion):
+    _, abrir = COMPRESIONES[compresion]
+    return abrir(ruta, modo + 't', encoding='utf-8')
+
+
+class NdjsonWriter:
+    """
+    Escribe cada colección en su propio archivo NDJSON a medida que llegan los registros.
+
+    Los registros se escriben en archivos temporales y recién se publican en cerrar(),
+    así una corrida abortada (descartar()) no deja archivos a medias. Con un manifiesto
+    previo (modo incremental) las colecciones no listadas en `recalculadas` se agregan
+    al final del archivo existente en lugar de reemplazarlo.
+    """
+
+    def __init__(self, directorio, colecciones, compresion=None, previo=None, recalculadas=()):
+        if compresion not in COMPRESIONES:
+            raise ValueError(f"Compresión no soportada: {compresion}")
+        self.directorio = Path(directorio)
+        self.colecciones = list(colecciones)
+        self.compresion = compresion
+        self._agregar_a_existente = set()
+        self._archivos = {}
+        self.totales = dict.fromkeys(self.colecciones, 0)
+
+        if previo is not None:
+            for coleccion in self.colecciones:
+                if coleccion not in recalculadas and coleccion in previo['colecciones']:
+                    self.totales[coleccion] = previo['colecciones'][coleccion]['registros']
+                    self._agregar_a_existente.add(coleccion)
+
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+    def _ruta(self, coleccion):
+        return self.directorio / nombre_archivo(coleccion, self.compresion)
+
+    def _archivo(self, coleccion):
+        f = self._archivos.get(coleccion)
+        if f is None:
+            tmp = self._ruta(coleccion).with_name(self._ruta(coleccion).name + '.tmp')
+            f = self._archivos[coleccion] = _abrir(tmp, 'w', self.compresion)
+        return f
+
+    def agregar(self, coleccion, registro):
+        """Escribe un registro en el archivo de su colección"""
+        f = self._archivo(coleccion)
+        f.write(json.dumps(registro, ensure_ascii=False, default=a_json))
+        f.write('\n')
+        self.totales[coleccion] += 1
+
+    def cerrar(self, estadisticas=None):
+        """Publica los archivos, escribe el manifiesto y lo devuelve"""
+        for coleccion in self.colecciones:
+            self._archivo(coleccion)  # Las colecciones vacías también tienen archivo
+        for coleccion, f in self._archivos.items():
+            f.close()
+            ruta = self._ruta(coleccion)
+            tmp = ruta.with_name(ruta.name + '.tmp')
+            if coleccion in self._agregar_a_existente and ruta.exists():
+                # gzip y xz admiten concatenar miembros: se anexan los bytes tal cual
+                with open(ruta, 'ab') as destino, open(tmp, 'rb') as nuevos:
+                    shutil.copyfileobj(nuevos, destino)
+                tmp.unlink()
+            else:
+                os.replace(tmp, ruta)
+        self._archivos = {}
+
+        manifiesto = {
+            "formato": "ndjson",
+            "version": FORMATO_NDJSON,
+            "compresion": self.compresion,
+            "colecciones": {
+                coleccion: {
+                    "archivo": nombre_archivo(coleccion, self.compresion),
+                    "registros": self.totales[coleccion],
+                }
+                for coleccion in self.colecciones
+            },
+            "estadisticas": estadisticas or {},
+        }
+        with open(self.directorio / MANIFIESTO, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+        return manifiesto
+
+    def descartar(self):
+        """Cierra y borra los archivos temporales sin tocar la salida existente"""
+        for coleccion, f in self._archivos.items():
+            f.close()
+            ruta = self._ruta(coleccion)
+            ruta.with_name(ruta.name + '.tmp').unlink(missing_ok=True)
+        self._archivos = {}
+
+
+def leer_manifiesto(directorio):
+    """Lee el manifest.json de una salida NDJSON (None si no existe)"""
+    ruta = Path(directorio) / MANIFIESTO
+    if not ruta.exists():
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_coleccion(directorio, coleccion, manifiesto=None):
+    """Itera los registros de una colección sin cargar el archivo completo"""
+    manifiesto = manifiesto or leer_manifiesto(directorio)
+    info = manifiesto['colecciones'].get(coleccion)
+    if info is None:
+        return
+    with _abrir(Path(directorio) / info['archivo'], 'r', manifiesto['compresion']) as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def iter_ndjson(directorio):
+    """Itera (coleccion, registro) de todas las colecciones en el orden del manifiesto"""
+    manifiesto = leer_manifiesto(directorio)
+    for coleccion in manifiesto['colecciones']:
+        for registro in iter_coleccion(directorio, coleccion, manifiesto):
+            yield coleccion, registro
+
+
+class _LectorJson:
+    """Decodifica valores JSON sucesivos de un archivo leyéndolo por bloques"""
+
+    BLOQUE = 1 << 16
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, f):
+        self.f = f
+        self.texto = ''
+        self.pos = 0
+        self.fin = False
+
+    def _leer(self):
+        bloque = self.f.read(self.BLOQUE)
+        self.texto = self.texto[self.pos:] + bloque
+        self.pos = 0
+        self.fin = not bloque
+
+    def caracter(self):
+        """Siguiente carácter que no es espacio (sin consumirlo); '' al final del archivo"""
+        while True:
+            while self.pos < len(self.texto) and self.texto[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.texto) or self.fin:
+                return self.texto[self.pos:self.pos + 1]
+            self._leer()
+
+    def esperar(self, caracteres):
+        """Consume el siguiente carácter, que tiene que ser uno de `caracteres`"""
+        c = self.caracter()
+        if not c or c not in caracteres:
+            raise ValueError(f"JSON inválido: se esperaba {caracteres!r} y vino {c!r}")
+        self.pos += 1
+        return c
+
+    def valor(self):
+        """Decodifica el próximo valor; solo lo acepta si el bloque sigue después (o es el final)"""
+        self.caracter()
+        while True:
+            try:
+                valor, fin = self._decoder.raw_decode(self.texto, self.pos)
+                if fin < len(self.texto) or self.fin:
+                    self.pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self.fin:
+                    raise
+            self._leer()
+
+
+def iter_json(ruta):
+    """
+    Itera (coleccion, registro) del JSON único sin cargarlo completo: los arrays de cada
+    colección se decodifican registro a registro (las estadísticas se saltean).
+    """
+    with open(ruta, encoding='utf-8') as f:
+        lector = _LectorJson(f)
+        lector.esperar('{')
+        if lector.caracter() == '}':
+            return
+        while True:
+            coleccion = lector.valor()
+            lector.esperar(':')
+            if lector.caracter() == '[':
+                lector.esperar('[')
+                if lector.caracter() == ']':
+                    lector.esperar(']')
+                else:
+                    while True:
+                        registro = lector.valor()
+                        if coleccion != 'estadisticas':
+                            yield coleccion, registro
+                        if lector.esperar(',]') == ']':
+                            break
+            else:
+                lector.valor()
+            if lector.esperar(',}') == '}':
+                return
+
+
+def iter_salida(ruta):
+    """
+    Itera (coleccion, registro) de una salida de la migración, sea el JSON único
+    (datos_migrados.json) o un directorio NDJSON con manifest.json. En los dos casos
+    se lee en streaming.
+    """
+    if Path(ruta).is_dir():
+        yield from iter_ndjson(ruta)
+    else:
+        yield from iter_json(ruta)
@@ -0,0 +1,331 @@
+"""
+Validación de integridad referencial y calidad de datos de una salida de la migración
+
+Antes de subir una salida (JSON único o directorio NDJSON) a Firebase o Supabase se
+recorre una sola vez en streaming, armando a medida que pasan los registros un índice
+(set) de IDs por colección, y se controla:
+
+- IDs repetidos dentro de cada colección
+- claves foráneas (REFERENCIAS): itemsVenta.ventaId, ventas.socioId,
+  gastosInversion.inversorId, pagos, movimientos de cuenta corriente, de stock y de
+  caja. productoId y categoriaId se buscan en las filas de referencia de la carga
+  (bulk_load.PRODUCTOS y CATEGORIAS_GASTOS), que son las que existen en la base.
+  Una referencia a una colección que todavía no pasó queda pendiente y se resuelve al
+  final, así el orden de las colecciones no importa.
+- invariantes de las ventas: saldoPendiente entre 0 y el total, montoPagado +
+  saldoPendiente = total y los items suman el total de su venta (las sumas por venta se
+  acumulan en un dict y se comparan al final)
+- montos no negativos (en cero es advertencia) y saldos encadenados (saldoAnterior =
+  saldoNuevo anterior) por socio en la cuenta corriente y por medio de pago en la caja
+- el motivo de los movimientos de stock de una venta ("Venta #n") nombra el numero de
+  esa venta (en las salidas en lote las ventas se renumeran)
+
+Cada violación se informa con la colección, la posición del registro en ella (la línea
+del archivo NDJSON) y su ID. Con --excel además se ubica la fila del Excel de origen:
+los IDs son la huella de su fila (content_ids.py), así que se rearma el índice
+{huella: (hoja, fila)} clasificando las hojas, y los movimientos derivados se ubican
+por la venta o el gasto que referencian. También se informan las filas de costos fijos
+(hasta la fila TOTAL) que la migración saltea: sin monto numérico o fuera de las filas 4
+a 15 que lee.
+
+Sale con código 1 si hay errores (las advertencias no cortan).
+
+Uso:
+    python output_validator.py [--entrada datos_migrados.json] [--excel ARCHIVO]
+                               [--salida violaciones.ndjson] [--limite 10]
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from itertools import islice
+
+from bulk_load import CATEGORIAS_GASTOS, PRODUCTOS
+from ndjson_output import iter_salida
+
+ERROR = "error"
+ADVERTENCIA = "advertencia"
+
+# regla -> (severidad, descripción)
+REGLAS = {
+    "id_duplicado": (ERROR, "ID repetido en la colección"),
+    "referencia_rota": (ERROR, "Referencia a un registro que no existe"),
+    "venta_sin_socio": (ADVERTENCIA, "Venta sin socio: no genera cuenta corriente ni pago"),
+    "saldo_mayor_al_total": (ERROR, "saldoPendiente mayor que el total de la venta"),
+    "monto_negativo": (ERROR, "Total, saldo o monto negativo"),
+    "monto_en_cero": (ADVERTENCIA, "Venta o gasto con total o monto en cero"),
+    "pago_inconsistente": (ADVERTENCIA, "montoPagado + saldoPendiente no da el total de la venta"),
+    "items_no_suman_total": (ERROR, "Los items no suman el total de su venta"),
+    "venta_sin_items": (ADVERTENCIA, "Venta sin items (sin cantidad de gramos ni esquejes)"),
+    "saldo_discontinuo": (ERROR, "saldoAnterior distinto del saldoNuevo del movimiento anterior"),
+    "motivo_no_coincide": (ERROR, "El motivo del movimiento de stock no nombra el numero de su venta"),
+    "gasto_fijo_no_migrado": (ADVERTENCIA, "Fila de costos fijos que la migración no toma"),
+}
+
+# Filas de referencia que la carga crea en la base (no son colecciones de la salida)
+REFERENCIA_FIJA = {
+    "productos": frozenset(PRODUCTOS),
+    "categoriasGastos": frozenset(CATEGORIAS_GASTOS),
+}
+
+# coleccion -> {campo: colecciones donde tiene que estar el ID}; None se acepta
+REFERENCIAS = {
+    "gastosInversion": {"inversorId": ("inversores",)},
+    "ventas": {"socioId": ("socios",)},
+    "itemsVenta": {"ventaId": ("ventas",), "productoId": ("productos",)},
+    "gastosOperativos": {"categoriaId": ("categoriasGastos",)},
+    "gastosFijos": {"categoriaId": ("categoriasGastos",)},
+    "movimientosCuentaCorriente": {"socioId": ("socios",), "referenciaId": ("ventas",)},
+    "pagos": {"socioId": ("socios",), "ventaId": ("ventas",)},
+    "movimientosStock": {"productoId": ("productos",)},
+}
+
+# referenciaTabla -> colecciones, para los movimientos que apuntan a varias tablas
+COLECCIONES_DE_TABLA = {
+    "ventas": ("ventas",),
+    "gastos": ("gastosOperativos", "gastosFijos"),
+    "gastos_inversion": ("gastosInversion",),
+}
+CON_REFERENCIA_TABLA = ("movimientosStock", "movimientosCaja")
+
+# Libros con saldo encadenado: coleccion -> campo que separa las cuentas
+SALDOS = {"movimientosCuentaCorriente": "socioId", "movimientosCaja": "metodoPago"}
+
+TOLERANCIA = 0.01
+
+# ============================================================================
+# FILAS DE ORIGEN
+# ============================================================================
+
+def indice_filas_origen(excel_path):
+    """
+    {huella de origen: (hoja, fila)} de las filas del Excel, clasificando las tres hojas
+    como la migración, y las filas de costos fijos que no se migran [(fila, detalle, motivo)].
+    """
+    from migrate_excel_to_new_model import (
+        HOJA_GASTOS_FIJOS, HOJA_INVERSION, HOJA_STOCK, iter_filas, iter_registros_stock, load_workbook,
+        migrar_gastos_fijos, migrar_inversion,
+    )
+
+    filas = {}
+    wb = load_workbook(excel_path)
+    try:
+        migrar_inversion(iter_filas(wb, HOJA_INVERSION), filas_origen=filas)
+        for registro in iter_registros_stock(iter_filas(wb, HOJA_STOCK)):
+            filas[registro.origen] = (HOJA_STOCK, registro.fila)
+        migrar_gastos_fijos(iter_filas(wb, HOJA_GASTOS_FIJOS), filas_origen=filas)
+        no_migradas = list(_gastos_fijos_no_migrados(iter_filas(wb, HOJA_GASTOS_FIJOS)))
+    finally:
+        wb.close()
+    return filas, no_migradas
+
+
+def _gastos_fijos_no_migrados(rows):
+    """(fila, detalle, motivo) de las filas del bloque de costos fijos que migrar_gastos_fijos no toma"""
+    for i, row in enumerate(islice(rows, 3, None), 4):
+        detalle = str(row[3]).strip() if row[3] else ''
+        if detalle.upper() == 'TOTAL':
+            break
+        if not detalle or detalle.upper() == 'DETALLE':
+            continue
+        if not (isinstance(row[4], (int, float)) and row[4] > 0):
+            yield i, detalle, "sin monto numérico"
+        elif i > 15:
+            yield i, detalle, "fuera de las filas 4 a 15"
+
+# ============================================================================
+# VALIDACIÓN
+# ============================================================================
+
+class Validador:
+    """
+    Recorre los registros de una salida (validar) y junta las violaciones. Cada una es
+    un dict con regla, severidad, coleccion, posicion, id, detalle y, si se conoce, la
+    hoja y la fila del Excel.
+    """
+
+    def __init__(self, filas_origen=None):
+        self.filas_origen = filas_origen or {}
+        self.violaciones = []
+        self.registros = Counter()
+        self._ids = {coleccion: set(ids) for coleccion, ids in REFERENCIA_FIJA.items()}
+        self._pendientes = []    # (violación, colecciones, valor) a resolver al final
+        self._ventas = {}        # venta -> (total, posición)
+        self._numeros = {}       # venta -> numero
+        self._motivos = []       # (posición, movimiento de stock de una venta) a comparar al final
+        self._items = Counter()  # venta -> suma de sus items
+        self._saldos = {}        # (coleccion, cuenta) -> último saldoNuevo
+
+    def _violacion(self, regla, coleccion, posicion, registro, detalle):
+        violacion = {
+            "regla": regla,
+            "severidad": REGLAS[regla][0],
+            "coleccion": coleccion,
+            "posicion": posicion,
+            "id": registro.get("id"),
+            "detalle": detalle,
+        }
+        for campo in ("id", "ventaId", "referenciaId"):
+            origen = (registro.get(campo) or '').partition('-')[2]
+            if origen in self.filas_origen:
+                violacion["hoja"], violacion["fila"] = self.filas_origen[origen]
+                break
+        return violacion
+
+    def _reportar(self, *args):
+        self.violaciones.append(self._violacion(*args))
+
+    def _referencia(self, coleccion, posicion, registro, campo, destinos):
+        valor = registro.get(campo)
+        if valor is None or any(valor in self._ids.get(destino, ()) for destino in destinos):
+            return
+        violacion = self._violacion("referencia_rota", coleccion, posicion, registro,
+                                    f"{campo}={valor} no está en {'/'.join(destinos)}")
+        self._pendientes.append((violacion, destinos, valor))
+
+    def agregar(self, coleccion, posicion, registro):
+        """Controla un registro (posicion: su número dentro de la colección, desde 1)"""
+        self.registros[coleccion] += 1
+        ids = self._ids.setdefault(coleccion, set())
+        if registro["id"] in ids:
+            self._reportar("id_duplicado", coleccion, posicion, registro, f"{registro['id']} ya apareció")
+        ids.add(registro["id"])
+
+        for campo, destinos in REFERENCIAS.get(coleccion, {}).items():
+            self._referencia(coleccion, posicion, registro, campo, destinos)
+        if coleccion in CON_REFERENCIA_TABLA and registro.get("referenciaId") is not None:
+            tabla = registro.get("referenciaTabla")
+            destinos = COLECCIONES_DE_TABLA.get(tabla, (tabla,))
+            self._referencia(coleccion, posicion, registro, "referenciaId", destinos)
+            if coleccion == "movimientosStock" and tabla == "ventas":
+                self._motivos.append((posicion, {k: registro.get(k) for k in ("id", "referenciaId", "motivo")}))
+
+        if coleccion == "ventas":
+            self._venta(posicion, registro)
+        elif coleccion == "itemsVenta":
+            self._items[registro["ventaId"]] += registro["total"] or 0
+        elif coleccion in ("gastosOperativos", "gastosFijos"):
+            monto = registro["monto"] or 0
+            if monto <= 0:
+                regla = "monto_negativo" if monto < 0 else "monto_en_cero"
+                self._reportar(regla, coleccion, posicion, registro, f"monto={registro['monto']}")
+        if coleccion in SALDOS:
+            self._saldo(coleccion, posicion, registro)
+
+    def _venta(self, posicion, venta):
+        total = venta["total"] or 0
+        saldo = venta["saldoPendiente"] or 0
+        if venta["socioId"] is None:
+            self._reportar("venta_sin_socio", "ventas", posicion, venta, f"Venta #{venta['numero']}")
+        if total < 0 or saldo < 0:
+            self._reportar("monto_negativo", "ventas", posicion, venta, f"total={total} saldoPendiente={saldo}")
+        elif total == 0:
+            self._reportar("monto_en_cero", "ventas", posicion, venta, f"Venta #{venta['numero']}")
+        elif saldo > total + TOLERANCIA:
+            self._reportar("saldo_mayor_al_total", "ventas", posicion, venta,
+                           f"total={total} saldoPendiente={saldo}")
+        elif abs((venta["montoPagado"] or 0) + saldo - total) > TOLERANCIA:
+            self._reportar("pago_inconsistente", "ventas", posicion, venta,
+                           f"total={total} montoPagado={venta['montoPagado']} saldoPendiente={saldo}")
+        self._ventas[venta["id"]] = (total, posicion)
+        self._numeros[venta["id"]] = venta["numero"]
+
+    def _saldo(self, coleccion, posicion, movimiento):
+        cuenta = (coleccion, movimiento[SALDOS[coleccion]])
+        anterior = self._saldos.get(cuenta, 0)
+        if abs((movimiento["saldoAnterior"] or 0) - anterior) > TOLERANCIA:
+            self._reportar("saldo_discontinuo", coleccion, posicion, movimiento,
+                           f"{cuenta[1]}: saldoAnterior={movimiento['saldoAnterior']}, se esperaba {anterior}")
+        self._saldos[cuenta] = movimiento["saldoNuevo"] or 0
+
+    def cerrar(self):
+        """Resuelve las referencias pendientes y compara las ventas con sus items; devuelve self"""
+        for violacion, destinos, valor in self._pendientes:
+            if not any(valor in self._ids.get(destino, ()) for destino in destinos):
+                self.violaciones.append(violacion)
+        self._pendientes = []
+        for venta_id, (total, posicion) in self._ventas.items():
+            venta = {"id": venta_id}
+            if venta_id not in self._items:
+                self._reportar("venta_sin_items", "ventas", posicion, venta, f"total={total}")
+            elif abs(self._items[venta_id] - total) > TOLERANCIA:
+                self._reportar("items_no_suman_total", "ventas", posicion, venta,
+                               f"items={self._items[venta_id]} total={total}")
+        for posicion, movimiento in self._motivos:
+            numero = self._numeros.get(movimiento["referenciaId"])
+            if numero is not None and movimiento["motivo"] != f"Venta #{numero}":
+                self._reportar("motivo_no_coincide", "movimientosStock", posicion, movimiento,
+                               f"motivo={movimiento['motivo']!r}, la venta es #{numero}")
+        self._ventas = {}
+        self._items = Counter()
+        self._numeros = {}
+        self._motivos = []
+        return self
+
+    def errores(self):
+        return sum(1 for v in self.violaciones if v["severidad"] == ERROR)
+
+
+def validar(entrada, filas_origen=None):
+    """Valida una salida (JSON o directorio NDJSON) en una pasada; devuelve el Validador cerrado"""
+    validador = Validador(filas_origen)
+    posiciones = Counter()
+    for coleccion, registro in iter_salida(entrada):
+        posiciones[coleccion] += 1
+        validador.agregar(coleccion, posiciones[coleccion], registro)
+    return validador.cerrar()
+
+
+def _ubicacion(violacion):
+    if violacion["posicion"] is None:
+        return f"{violacion['hoja']} fila {violacion['fila']}"
+    texto = f"{violacion['coleccion']} #{violacion['posicion']}"
+    if "fila" in violacion:
+        texto += f" ({violacion['hoja']} fila {violacion['fila']})"
+    return texto
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Integridad referencial y calidad de una salida migrada")
+    parser.add_argument('--entrada', default='datos_migrados.json',
+                        help="JSON o directorio NDJSON de la migración")
+    parser.add_argument('--excel', help="Excel de origen, para ubicar la fila de cada violación")
+    parser.add_argument('--salida', help="Guarda todas las violaciones como NDJSON")
+    parser.add_argument('--limite', type=int, default=10, help="Ejemplos por regla en pantalla")
+    args = parser.parse_args(argv)
+
+    filas_origen, no_migradas = indice_filas_origen(args.excel) if args.excel else (None, [])
+    validador = validar(args.entrada, filas_origen)
+    for fila, detalle, motivo in no_migradas:
+        validador.violaciones.append({
+            "regla": "gasto_fijo_no_migrado", "severidad": REGLAS["gasto_fijo_no_migrado"][0],
+            "coleccion": "gastosFijos", "posicion": None, "id": None, "detalle": f"{detalle}: {motivo}",
+            "hoja": "GASTOS FIJOS Y OTROS", "fila": fila,
+        })
+
+    print(f"Registros: {sum(validador.registros.values()):,} en {len(validador.registros)} colecciones")
+    por_regla = Counter(v["regla"] for v in validador.violaciones)
+    if not por_regla:
+        print("Sin violaciones")
+    for regla, cantidad in por_regla.most_common():
+        severidad, descripcion = REGLAS[regla]
+        print(f"\n[{severidad.upper()}] {regla}: {cantidad} - {descripcion}")
+        ejemplos = (v for v in validador.violaciones if v["regla"] == regla)
+        for violacion in islice(ejemplos, args.limite):
+            print(f"  - {_ubicacion(violacion)}: {violacion['detalle']}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            for violacion in validador.violaciones:
+                f.write(json.dumps(violacion, ensure_ascii=False) + '\n')
+        print(f"\nViolaciones guardadas en {args.salida}")
+
+    errores = validador.errores()
+    print(f"\nErrores: {errores} | Advertencias: {len(validador.violaciones) - errores}")
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
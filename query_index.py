@@ -0,0 +1,590 @@
+"""
+Consultas indexadas sobre la salida de la migración
+
+Cada pregunta a los datos migrados ("ventas del socio X en el último trimestre",
+"gastos con LUZ en el detalle", "socios que más deben") era cargar el JSON completo y
+escribir otro loop como los de final_analysis.py. Este módulo arma una vez índices
+secundarios sobre la salida (JSON o directorio NDJSON) y los guarda al lado, en
+<salida>.indice/:
+
+- registros.ndjson: los registros compactos, uno por línea; el número de registro es
+  su posición en la salida y cada colección ocupa un rango contiguo de números
+- indice.bin: arrays binarios (módulo array) alineados a 8 bytes:
+    offsets       inicio de cada registro en registros.ndjson
+    fechas        clave ISO de ancho fijo de cada registro (fecha o fechaRegistro)
+    orden_fecha   números de registro ordenados por fecha, por colección
+    montos        monto de cada registro (NaN si no tiene) y orden_monto, su orden
+    tabla         hash table de direccionamiento abierto: huella de 64 bits de la
+                  clave -> (inicio, cantidad) en postings
+    postings      números de registro ordenados de cada clave
+- indice.json: manifiesto con los rangos de cada colección, las secciones de
+  indice.bin y la huella de la salida de origen (tamaño y mtime)
+
+Las claves de la hash table son "campo=valor" para los campos de CAMPOS_HASH y
+"campo~TOKEN" para cada palabra plegada (sin acentos, en mayúsculas, como en
+socios_dedup.py) de los campos de CAMPOS_TEXTO: el índice invertido de detalle.
+
+Al abrir, los dos archivos se mapean con mmap y los arrays se leen como memoryview
+sin copiar ni parsear nada: el arranque no depende del tamaño de la salida. Un rango
+de fechas o de montos es un bisect sobre el orden (O(log n + k)), un campo o una
+palabra es un lookup en la hash table (O(1 + k)); con varios filtros se recorre la
+lista más corta y el resto se verifica por registro. Los registros se parsean recién
+al devolverlos. Si la salida cambió desde que se armó el índice, se rearma al abrir.
+
+Uso (--entrada también va antes del subcomando, como en `cli.py query`):
+    python query_index.py construir [--entrada datos_migrados.json]
+    python query_index.py consultar COLECCION [--entrada ...] [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD]
+                                    [--socio NOMBRE] [--campo CAMPO=VALOR ...] [--texto PALABRAS]
+                                    [--minimo MONTO] [--maximo MONTO] [--limite 20]
+    python query_index.py deudores [--entrada ...] [--limite 10]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from records import clave_fecha
+from socios_dedup import plegar_nombre
+
+SALIDA_PATH = 'datos_migrados.json'
+FORMATO_INDICE = 1
+
+MANIFIESTO = 'indice.json'
+REGISTROS = 'registros.ndjson'
+BINARIO = 'indice.bin'
+
+# Campos con índice hash (igualdad) y con índice invertido de palabras
+CAMPOS_HASH = ("id", "socioId", "ventaId", "inversorId", "categoriaId", "productoId", "metodoPago")
+CAMPOS_TEXTO = ("detalle", "nombre")
+
+# Campo de fecha y campo de monto de cada colección (por defecto "fecha" y "monto")
+CAMPO_FECHA = {"socios": "fechaRegistro"}
+CAMPO_MONTO = {
+    "socios": "saldo",
+    "ventas": "total",
+    "itemsVenta": "total",
+    "gastosInversion": "montoPesos",
+    "movimientosStock": "cantidad",
+}
+
+
+def ruta_indice(salida):
+    """Directorio del índice de una salida: datos_migrados.json -> datos_migrados.json.indice"""
+    salida = Path(salida)
+    return salida.with_name(salida.name + '.indice')
+
+
+def tokens(texto):
+    """Palabras plegadas de un texto: 'Pago luz/agua' -> {'PAGO', 'LUZ', 'AGUA'}"""
+    return set(plegar_nombre(texto).split())
+
+
+def _huella_clave(clave):
+    """Huella de 64 bits (nunca 0, que marca los lugares libres de la tabla)"""
+    huella = int.from_bytes(hashlib.blake2b(clave.encode('utf-8'), digest_size=8).digest(), 'little')
+    return huella or 1
+
+
+def _huella_origen(salida):
+    """Ruta, tamaño y mtime de la salida (del manifest.json si es un directorio NDJSON)"""
+    salida = Path(salida)
+    archivo = salida / 'manifest.json' if salida.is_dir() else salida
+    estado = archivo.stat()
+    return [str(salida.resolve()), estado.st_size, estado.st_mtime_ns]
+
+
+def _numero(valor):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        return math.nan
+    return float(valor)
+
+
+def _contiene(ordenados, valor):
+    i = bisect_left(ordenados, valor)
+    return i < len(ordenados) and ordenados[i] == valor
+
+# ============================================================================
+# CONSTRUCCIÓN
+# ============================================================================
+
+def _orden(rango, clave, incluir):
+    return [n for n in sorted(range(*rango), key=clave) if incluir(n)]
+
+
+def _tabla_hash(claves):
+    """Hash table de direccionamiento abierto (sondeo lineal) sobre las postings de cada clave"""
+    slots = 8
+    while slots < 2 * len(claves):
+        slots *= 2
+    mascara = slots - 1
+    tabla = array('Q', bytes(16 * slots))
+    postings = array('I')
+    for clave, numeros in claves.items():
+        huella = _huella_clave(clave)
+        i = huella & mascara
+        while tabla[2 * i]:
+            i = (i + 1) & mascara
+        tabla[2 * i] = huella
+        tabla[2 * i + 1] = (len(postings) << 32) | len(numeros)
+        postings.extend(numeros)
+    return slots, tabla, postings
+
+
+def _escribir_secciones(ruta, secciones):
+    """Escribe los arrays alineados a 8 bytes; devuelve {nombre: [offset, bytes, typecode]}"""
+    ubicaciones = {}
+    with open(ruta, 'wb') as f:
+        for nombre, datos in secciones.items():
+            crudo = datos.tobytes() if isinstance(datos, array) else bytes(datos)
+            ubicaciones[nombre] = [f.tell(), len(crudo), datos.typecode if isinstance(datos, array) else 'B']
+            f.write(crudo + bytes(-len(crudo) % 8))
+    return ubicaciones
+
+
+def construir_indice(salida=SALIDA_PATH, directorio=None):
+    """Arma el índice de una salida de la migración en una pasada; devuelve su directorio"""
+    from ndjson_output import iter_salida
+
+    directorio = Path(directorio or ruta_indice(salida))
+    directorio.mkdir(parents=True, exist_ok=True)
+    # Sin manifiesto el índice no es válido: si la construcción se corta, se rearma
+    (directorio / MANIFIESTO).unlink(missing_ok=True)
+    origen = _huella_origen(salida)
+
+    offsets = array('Q', [0])
+    fechas = []
+    montos = array('d')
+    claves = {}
+    rangos = {}
+    registros_tmp = directorio / (REGISTROS + '.tmp')
+    with open(registros_tmp, 'wb') as f:
+        for n, (coleccion, registro) in enumerate(iter_salida(salida)):
+            rangos.setdefault(coleccion, [n, n])[1] = n + 1
+            linea = json.dumps(registro, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+            f.write(linea)
+            offsets.append(offsets[-1] + len(linea))
+            fechas.append(registro.get(CAMPO_FECHA.get(coleccion, "fecha")) or '')
+            montos.append(_numero(registro.get(CAMPO_MONTO.get(coleccion, "monto"))))
+            for campo in CAMPOS_HASH:
+                if registro.get(campo) is not None:
+                    claves.setdefault(f"{campo}={registro[campo]}", []).append(n)
+            for campo in CAMPOS_TEXTO:
+                for token in tokens(registro.get(campo)):
+                    claves.setdefault(f"{campo}~{token}", []).append(n)
+
+    ancho = max(map(len, fechas), default=0)
+    columna_fechas = b''.join(fecha.ljust(ancho).encode('ascii') for fecha in fechas)
+    orden_fecha, orden_monto = array('I'), array('I')
+    colecciones = {}
+    for coleccion, rango in rangos.items():
+        por_fecha = _orden(rango, fechas.__getitem__, fechas.__getitem__)
+        por_monto = _orden(rango, montos.__getitem__, lambda n: not math.isnan(montos[n]))
+        colecciones[coleccion] = {
+            "registros": rango,
+            "fecha": [len(orden_fecha), len(orden_fecha) + len(por_fecha)],
+            "monto": [len(orden_monto), len(orden_monto) + len(por_monto)],
+        }
+        orden_fecha.extend(por_fecha)
+        orden_monto.extend(por_monto)
+    slots, tabla, postings = _tabla_hash(claves)
+
+    binario_tmp = directorio / (BINARIO + '.tmp')
+    secciones = _escribir_secciones(binario_tmp, {
+        "offsets": offsets, "tabla": tabla, "montos": montos, "orden_fecha": orden_fecha,
+        "orden_monto": orden_monto, "postings": postings, "fechas": columna_fechas,
+    })
+    os.replace(registros_tmp, directorio / REGISTROS)
+    os.replace(binario_tmp, directorio / BINARIO)
+    manifiesto = {
+        "formato": FORMATO_INDICE,
+        "byteorder": sys.byteorder,
+        "origen": origen,
+        "campos": {"hash": CAMPOS_HASH, "texto": CAMPOS_TEXTO},
+        "total": len(fechas),
+        "ancho_fecha": ancho,
+        "slots": slots,
+        "claves": len(claves),
+        "colecciones": colecciones,
+        "secciones": secciones,
+    }
+    with open(directorio / MANIFIESTO, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    return directorio
+
+
+def _leer_manifiesto(directorio):
+    ruta = Path(directorio) / MANIFIESTO
+    if not ruta.is_file():
+        return None
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def indice_vigente(salida, directorio=None):
+    """True si el índice existe, es de este formato y corresponde a la salida tal como está"""
+    manifiesto = _leer_manifiesto(directorio or ruta_indice(salida))
+    return (manifiesto is not None
+            and manifiesto["formato"] == FORMATO_INDICE
+            and manifiesto["byteorder"] == sys.byteorder
+            and manifiesto["campos"] == {"hash": list(CAMPOS_HASH), "texto": list(CAMPOS_TEXTO)}
+            and manifiesto["origen"] == _huella_origen(salida))
+
+
+def abrir_indice(salida=SALIDA_PATH, reconstruir=False):
+    """Abre el índice de una salida, armándolo antes si falta o quedó viejo"""
+    directorio = ruta_indice(salida)
+    if reconstruir or not indice_vigente(salida, directorio):
+        construir_indice(salida, directorio)
+    return IndiceSalida(directorio)
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+
+class _Claves:
+    """Vista ordenada (para bisect) de las claves de un orden: clave(orden[i])"""
+
+    def __init__(self, orden, clave):
+        self._orden = orden
+        self._clave = clave
+
+    def __len__(self):
+        return len(self._orden)
+
+    def __getitem__(self, i):
+        return self._clave(self._orden[i])
+
+
+class IndiceSalida:
+    """
+    Índice mapeado en memoria de una salida de la migración. Los registros se devuelven
+    como dicts con las claves JSON de siempre, en orden de fecha.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        self.manifiesto = _leer_manifiesto(self.directorio)
+        if self.manifiesto is None:
+            raise FileNotFoundError(f"No hay índice en {self.directorio}")
+        self._mapas = []
+        self._vistas = []
+        self._registros = self._mapear(REGISTROS)
+        binario = self._mapear(BINARIO)
+        secciones = {}
+        for nombre, (offset, largo, typecode) in self.manifiesto["secciones"].items():
+            vista = memoryview(binario)[offset:offset + largo].cast(typecode)
+            self._vistas.append(vista)
+            secciones[nombre] = vista
+        self._offsets = secciones["offsets"]
+        self._fechas = secciones["fechas"]
+        self._montos = secciones["montos"]
+        self._orden_fecha = secciones["orden_fecha"]
+        self._orden_monto = secciones["orden_monto"]
+        self._tabla = secciones["tabla"]
+        self._postings = secciones["postings"]
+        self._ancho = self.manifiesto["ancho_fecha"]
+        self._mascara = self.manifiesto["slots"] - 1
+        self.colecciones = self.manifiesto["colecciones"]
+
+    def _mapear(self, nombre):
+        with open(self.directorio / nombre, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapas.append(mapa)
+        return mapa
+
+    def cerrar(self):
+        for vista in self._vistas:
+            vista.release()
+        for mapa in self._mapas:
+            mapa.close()
+        self._vistas, self._mapas = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def __len__(self):
+        return self.manifiesto["total"]
+
+    # ------------------------------------------------------------------------
+    # Acceso por número de registro
+    # ------------------------------------------------------------------------
+
+    def registro(self, n):
+        return json.loads(self._registros[self._offsets[n]:self._offsets[n + 1]])
+
+    def fecha(self, n):
+        return self._fechas[n * self._ancho:(n + 1) * self._ancho].tobytes().decode('ascii').rstrip()
+
+    def monto(self, n):
+        return self._montos[n]
+
+    def _rango(self, coleccion, indice="registros"):
+        if coleccion not in self.colecciones:
+            raise KeyError(f"Colección desconocida: {coleccion} (hay {', '.join(self.colecciones)})")
+        return self.colecciones[coleccion][indice]
+
+    # ------------------------------------------------------------------------
+    # Índices
+    # ------------------------------------------------------------------------
+
+    def postings(self, clave, coleccion=None):
+        """Números de registro (ordenados) de una clave "campo=valor" o "campo~TOKEN" """
+        huella = _huella_clave(clave)
+        tabla, i = self._tabla, huella & self._mascara
+        while tabla[2 * i]:
+            if tabla[2 * i] == huella:
+                inicio, cantidad = tabla[2 * i + 1] >> 32, tabla[2 * i + 1] & 0xFFFFFFFF
+                numeros = self._postings[inicio:inicio + cantidad]
+                if coleccion is None:
+                    return numeros
+                desde, hasta = self._rango(coleccion)
+                return numeros[bisect_left(numeros, desde):bisect_left(numeros, hasta)]
+            i = (i + 1) & self._mascara
+        return ()
+
+    def _por_valores(self, campo, valores, coleccion):
+        """Postings de campo=valor para uno o varios valores (unión ordenada)"""
+        if isinstance(valores, (str, int, float)):
+            return self.postings(f"{campo}={valores}", coleccion)
+        listas = [self.postings(f"{campo}={valor}", coleccion) for valor in valores]
+        if len(listas) == 1:
+            return listas[0]
+        return sorted({n for numeros in listas for n in numeros})
+
+    def _por_fecha(self, coleccion, desde=None, hasta=None):
+        """Números de registro de la colección en el rango de fechas, en orden de fecha"""
+        inicio, fin = self._rango(coleccion, "fecha")
+        claves = _Claves(self._orden_fecha, self.fecha)
+        if desde is not None:
+            inicio = bisect_left(claves, clave_fecha(desde, fin_del_dia=False), inicio, fin)
+        if hasta is not None:
+            fin = bisect_right(claves, clave_fecha(hasta), inicio, fin)
+        return self._orden_fecha[inicio:fin]
+
+    def _por_monto(self, coleccion, minimo=None, maximo=None):
+        """Números de registro de la colección en el rango de montos, de menor a mayor"""
+        inicio, fin = self._rango(coleccion, "monto")
+        claves = _Claves(self._orden_monto, self.monto)
+        if minimo is not None:
+            inicio = bisect_left(claves, minimo, inicio, fin)
+        if maximo is not None:
+            fin = bisect_right(claves, maximo, inicio, fin)
+        return self._orden_monto[inicio:fin]
+
+    # ------------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------------
+
+    def obtener(self, id_):
+        """Registro con ese ID (de cualquier colección), o None"""
+        numeros = self.postings(f"id={id_}")
+        for n in numeros:
+            registro = self.registro(n)
+            if registro["id"] == id_:
+                return registro
+        return None
+
+    def socios_por_nombre(self, nombre):
+        """
+        IDs de los socios cuyo nombre plegado es igual al buscado; si no hay ninguno,
+        los que tienen todas sus palabras
+        """
+        buscado = plegar_nombre(nombre)
+        candidatos = [self.registro(n) for n in self._interseccion(
+            [self.postings(f"nombre~{token}", "socios") for token in tokens(nombre)])]
+        iguales = [socio["id"] for socio in candidatos if plegar_nombre(socio["nombre"]) == buscado]
+        return iguales or [socio["id"] for socio in candidatos]
+
+    @staticmethod
+    def _interseccion(listas):
+        if not listas:
+            return []
+        listas = sorted(listas, key=len)
+        return [n for n in listas[0] if all(_contiene(otra, n) for otra in listas[1:])]
+
+    def consultar(self, coleccion, desde=None, hasta=None, texto=None, campo_texto="detalle",
+                  minimo=None, maximo=None, **iguales):
+        """
+        Registros de una colección que cumplen todos los filtros, en orden de fecha:
+
+        - desde / hasta: rango de fechas (date, datetime o 'AAAA-MM-DD', inclusive)
+        - texto: todas sus palabras en campo_texto (índice invertido)
+        - minimo / maximo: rango del monto de la colección (CAMPO_MONTO)
+        - iguales: campo=valor (o campo=[valores]) sobre los campos de CAMPOS_HASH
+
+        Se recorre la lista de candidatos más corta (postings de un campo o una palabra,
+        o el rango de fechas o de montos) y el resto de los filtros se verifica por
+        número de registro, sin parsear los registros descartados.
+        """
+        for campo in iguales:
+            if campo not in CAMPOS_HASH:
+                raise ValueError(f"{campo} no tiene índice (campos indexados: {', '.join(CAMPOS_HASH)})")
+        palabras = tokens(texto) if texto else set()
+        if campo_texto not in CAMPOS_TEXTO and palabras:
+            raise ValueError(f"{campo_texto} no tiene índice de palabras ({', '.join(CAMPOS_TEXTO)})")
+
+        # Postings: ordenadas por número de registro, se verifican con bisect
+        postings = [self._por_valores(campo, valores, coleccion) for campo, valores in iguales.items()]
+        postings += [self.postings(f"{campo_texto}~{palabra}", coleccion) for palabra in palabras]
+        # Rangos: en orden de fecha o de monto, se verifican con las columnas
+        rango_fecha = rango_monto = None
+        rangos = []
+        if desde is not None or hasta is not None:
+            rango_fecha = (clave_fecha(desde, fin_del_dia=False) if desde is not None else None,
+                           clave_fecha(hasta) if hasta is not None else None)
+            rangos.append(self._por_fecha(coleccion, desde, hasta))
+        if minimo is not None or maximo is not None:
+            rango_monto = (minimo, maximo)
+            rangos.append(self._por_monto(coleccion, minimo, maximo))
+        if not postings and not rangos:
+            rangos.append(range(*self._rango(coleccion)))
+
+        candidatos = min(postings + rangos, key=len)
+        numeros = [
+            n for n in candidatos
+            if (rango_fecha is None or self._en_rango(self.fecha(n), *rango_fecha))
+            and (rango_monto is None or self._en_rango(self.monto(n), *rango_monto))
+            and all(_contiene(lista, n) for lista in postings if lista is not candidatos)
+        ]
+        numeros.sort(key=self.fecha)
+
+        for n in numeros:
+            registro = self.registro(n)
+            # Verificación sobre el registro: descarta colisiones de la huella de 64 bits
+            if all(self._coincide(registro.get(campo), valores) for campo, valores in iguales.items()) \
+                    and palabras <= tokens(registro.get(campo_texto)):
+                yield registro
+
+    def mayores(self, coleccion, limite=10, descendente=True):
+        """Registros con mayor (o menor) monto de la colección, sin recorrerla"""
+        inicio, fin = self._rango(coleccion, "monto")
+        orden = self._orden_monto[inicio:fin]
+        numeros = orden[::-1] if descendente else orden
+        for n in numeros[:limite]:
+            yield self.registro(n)
+
+    def deudores(self, limite=10):
+        """Socios con saldo deudor (negativo), de mayor a menor deuda"""
+        for socio in self.mayores("socios", limite, descendente=False):
+            if socio["saldo"] >= 0:
+                break
+            yield socio
+
+    @staticmethod
+    def _en_rango(valor, minimo, maximo):
+        if isinstance(valor, float) and math.isnan(valor):
+            return False
+        return (minimo is None or valor >= minimo) and (maximo is None or valor <= maximo)
+
+    @staticmethod
+    def _coincide(valor, valores):
+        if isinstance(valores, (str, int, float)):
+            return str(valor) == str(valores)
+        return str(valor) in {str(v) for v in valores}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _descripcion(indice, registro):
+    texto = next((registro[campo] for campo in ("detalle", "concepto", "descripcion", "nombre", "motivo")
+                  if registro.get(campo)), '')
+    if registro.get("socioId") and "nombre" not in registro:
+        socio = indice.obtener(registro["socioId"])
+        texto = f"{socio['nombre'] if socio else registro['socioId']} {texto}".strip()
+    return texto
+
+
+def imprimir_registros(indice, coleccion, registros, limite):
+    campo_monto = CAMPO_MONTO.get(coleccion, "monto")
+    cantidad = total = 0
+    for registro in registros:
+        cantidad += 1
+        total += _numero(registro.get(campo_monto)) if registro.get(campo_monto) is not None else 0
+        if limite is None or cantidad <= limite:
+            fecha = (registro.get(CAMPO_FECHA.get(coleccion, "fecha")) or '')[:10]
+            print(f"{fecha:<11} {registro['id']:<24} {_descripcion(indice, registro)[:40]:<40} "
+                  f"{registro.get(campo_monto) or 0:>14,.2f}")
+    if limite is not None and cantidad > limite:
+        print(f"... ({cantidad - limite} más)")
+    print(f"\nRegistros: {cantidad} | {campo_monto}: ${total:,.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas indexadas sobre la salida de la migración")
+    parser.add_argument('--entrada', default=SALIDA_PATH, help="JSON o directorio NDJSON de la migración")
+    # --entrada también después del subcomando; SUPPRESS no pisa el valor dado antes
+    entrada = argparse.ArgumentParser(add_help=False)
+    entrada.add_argument('--entrada', default=argparse.SUPPRESS,
+                         help="JSON o directorio NDJSON de la migración")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    sub.add_parser('construir', parents=[entrada], help="Arma (o rearma) el índice de la salida")
+
+    p_consultar = sub.add_parser('consultar', parents=[entrada],
+                                 help="Registros de una colección que cumplen los filtros")
+    p_consultar.add_argument('coleccion')
+    p_consultar.add_argument('--desde', help="Primer día (AAAA-MM-DD)")
+    p_consultar.add_argument('--hasta', help="Último día (AAAA-MM-DD)")
+    p_consultar.add_argument('--socio', help="Nombre del socio (se busca en el índice de nombres)")
+    p_consultar.add_argument('--campo', action='append', default=[], metavar='CAMPO=VALOR',
+                             help=f"Igualdad sobre un campo indexado ({', '.join(CAMPOS_HASH)})")
+    p_consultar.add_argument('--texto', help="Palabras que tienen que estar en el detalle")
+    p_consultar.add_argument('--minimo', type=float, help="Monto mínimo")
+    p_consultar.add_argument('--maximo', type=float, help="Monto máximo")
+    p_consultar.add_argument('--limite', type=int, default=20, help="Registros a listar")
+
+    p_deudores = sub.add_parser('deudores', parents=[entrada],
+                                help="Socios con saldo deudor, de mayor a menor deuda")
+    p_deudores.add_argument('--limite', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    if args.comando == 'construir':
+        directorio = construir_indice(args.entrada)
+        manifiesto = _leer_manifiesto(directorio)
+        print(f"Índice de {manifiesto['total']:,} registros y {manifiesto['claves']:,} claves en {directorio} "
+              f"({time.perf_counter() - inicio:.2f}s)")
+        return 0
+
+    with abrir_indice(args.entrada) as indice:
+        if args.comando == 'deudores':
+            for socio in indice.deudores(args.limite):
+                print(f"{socio['nombre']:<30} {-socio['saldo']:>14,.2f}")
+            return 0
+
+        iguales = {}
+        for filtro in args.campo:
+            campo, separador, valor = filtro.partition('=')
+            if not separador:
+                parser.error(f"--campo espera CAMPO=VALOR: {filtro}")
+            iguales[campo] = valor
+        if args.socio:
+            iguales["socioId"] = indice.socios_por_nombre(args.socio)
+            if not iguales["socioId"]:
+                print(f"No hay socios con el nombre {args.socio}")
+                return 1
+        try:
+            registros = indice.consultar(args.coleccion, desde=args.desde, hasta=args.hasta, texto=args.texto,
+                                         minimo=args.minimo, maximo=args.maximo, **iguales)
+            imprimir_registros(indice, args.coleccion, registros, args.limite)
+        except (KeyError, ValueError) as e:
+            print(f"Error: {e.args[0]}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())
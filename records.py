@@ -0,0 +1,244 @@
+"""
+Registros compactos para las entidades de la migración
+
+Cada venta, item, gasto y socio era un dict propio con todas sus claves. Estas clases
+usan __slots__ (sin __dict__ por instancia) y guardan solo lo que varía por registro:
+
+- Los campos constantes del modelo (vendedorId, descuento, entregado, pagado...) viven
+  en la clase (FIJOS) y no ocupan lugar en cada registro.
+- Las fechas se guardan como datetime y se formatean a ISO recién al leerlas, con un
+  cache por fecha: las fechas repetidas comparten un único string. Los campos que salen
+  del mismo valor (fecha/fechaEntrega, subtotal/total) comparten el atributo.
+- metodoPago, categoriaId y productoId se internan y estadoPago usa las constantes
+  PAGADO / PARCIAL / PENDIENTE, así los valores repetidos son el mismo objeto.
+
+Los registros implementan Mapping con las claves JSON de siempre (registro["socioId"],
+dict(registro), .get), así destinos y consumidores los leen igual que a los dicts.
+La conversión a dict se hace solo al escribir (a_json como `default` de json.dump).
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from functools import lru_cache
+
+PAGADO = sys.intern("PAGADO")
+PARCIAL = sys.intern("PARCIAL")
+PENDIENTE = sys.intern("PENDIENTE")
+
+
+@lru_cache(maxsize=None)
+def fecha_iso(fecha):
+    """ISO de una fecha, un único string por fecha distinta"""
+    return fecha.isoformat()
+
+
+def clave_fecha(fecha, fin_del_dia=True):
+    """
+    Clave ISO comparable con las fechas de los movimientos. Una fecha sin hora
+    (date o "AAAA-MM-DD") cubre todo ese día: se toma su final, o su inicio con
+    fin_del_dia=False.
+    """
+    if isinstance(fecha, datetime):
+        return fecha_iso(fecha)
+    if isinstance(fecha, date):
+        return datetime.combine(fecha, time.max if fin_del_dia else time.min).isoformat()
+    fecha = str(fecha)
+    return clave_fecha(date.fromisoformat(fecha), fin_del_dia) if len(fecha) == 10 else fecha
+
+
+def interno(valor):
+    """Interna strings repetidos (métodos de pago, categorías, productos)"""
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
+class Registro(Mapping):
+    """
+    Base de los registros: CAMPOS es el orden de las claves JSON, ATRIBUTOS mapea cada
+    clave variable a su slot y FIJOS da el valor de las claves constantes.
+    """
+
+    __slots__ = ()
+    CAMPOS = ()
+    ATRIBUTOS = {}
+    FIJOS = {}
+    FECHAS = frozenset()
+
+    def __init__(self, *valores):
+        for atributo, valor in zip(self.__slots__, valores):
+            setattr(self, atributo, valor)
+
+    def __getitem__(self, clave):
+        atributo = self.ATRIBUTOS.get(clave)
+        if atributo is None:
+            return self.FIJOS[clave]
+        valor = getattr(self, atributo)
+        if atributo in self.FECHAS and isinstance(valor, datetime):
+            return fecha_iso(valor)
+        return valor
+
+    def __iter__(self):
+        return iter(self.CAMPOS)
+
+    def __len__(self):
+        return len(self.CAMPOS)
+
+    def a_dict(self):
+        return {clave: self[clave] for clave in self.CAMPOS}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.a_dict()!r})"
+
+
+def _slots(atributos):
+    return tuple(dict.fromkeys(atributos.values()))
+
+
+def a_json(objeto):
+    """`default` para json.dump/dumps: serializa los registros con la forma JSON de siempre"""
+    if isinstance(objeto, Registro):
+        return objeto.a_dict()
+    raise TypeError(f"Object of type {type(objeto).__name__} is not JSON serializable")
+
+
+class Socio(Registro):
+    CAMPOS = ("id", "nombre", "tipo", "fechaRegistro", "activo", "saldo", "limiteCredito")
+    ATRIBUTOS = {"id": "id", "nombre": "nombre", "fechaRegistro": "fecha_registro", "saldo": "saldo"}
+    FIJOS = {"tipo": "CLIENTE_FRECUENTE", "activo": True, "limiteCredito": 50000}
+    FECHAS = frozenset({"fecha_registro"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, nombre, fecha_registro, saldo=0):
+        super().__init__(id, nombre, fecha_registro, saldo)
+
+
+class GastoInversion(Registro):
+    CAMPOS = ("id", "inversorId", "fecha", "detalle", "categoria", "montoUSD", "montoPesos", "precioDolar")
+    ATRIBUTOS = {
+        "id": "id", "inversorId": "inversor_id", "fecha": "fecha", "detalle": "detalle",
+        "categoria": "categoria", "montoUSD": "monto_usd", "montoPesos": "monto_pesos",
+        "precioDolar": "precio_dolar",
+    }
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, inversor_id, fecha, detalle, categoria, monto_usd, monto_pesos, precio_dolar):
+        super().__init__(id, inversor_id, fecha, detalle, interno(categoria), monto_usd, monto_pesos,
+                         precio_dolar)
+
+
+class Venta(Registro):
+    CAMPOS = (
+        "id", "numero", "fecha", "socioId", "vendedorId", "entregador", "subtotal", "descuento", "total",
+        "estadoPago", "montoPagado", "saldoPendiente", "metodoPago", "entregado", "fechaEntrega", "notas",
+    )
+    ATRIBUTOS = {
+        "id": "id", "numero": "numero", "fecha": "fecha", "socioId": "socio_id",
+        "subtotal": "total", "total": "total", "estadoPago": "estado_pago",
+        "montoPagado": "monto_pagado", "saldoPendiente": "saldo_pendiente",
+        "metodoPago": "metodo_pago", "fechaEntrega": "fecha", "notas": "notas", "entregador": "entregador",
+    }
+    FIJOS = {"vendedorId": None, "descuento": 0, "entregado": True}
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, numero, fecha, socio_id, total, estado_pago, monto_pagado, saldo_pendiente,
+                 metodo_pago, notas, entregador=None):
+        super().__init__(id, numero, fecha, socio_id, total, estado_pago, monto_pagado, saldo_pendiente,
+                         interno(metodo_pago), notas, interno(entregador))
+
+
+class ItemVenta(Registro):
+    CAMPOS = ("id", "ventaId", "productoId", "descripcion", "cantidad", "precioUnitario", "subtotal",
+              "descuento", "total")
+    ATRIBUTOS = {
+        "id": "id", "ventaId": "venta_id", "productoId": "producto_id", "descripcion": "descripcion",
+        "cantidad": "cantidad", "precioUnitario": "precio_unitario", "subtotal": "total", "total": "total",
+    }
+    FIJOS = {"descuento": 0}
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, venta_id, producto_id, descripcion, cantidad, precio_unitario, total):
+        super().__init__(id, venta_id, interno(producto_id), descripcion, cantidad, precio_unitario, total)
+
+
+class GastoOperativo(Registro):
+    CAMPOS = ("id", "numero", "fecha", "categoriaId", "detalle", "proveedor", "monto", "metodoPago",
+              "pagado", "esRecurrente")
+    ATRIBUTOS = {
+        "id": "id", "numero": "numero", "fecha": "fecha", "categoriaId": "categoria_id",
+        "detalle": "detalle", "proveedor": "proveedor", "monto": "monto", "metodoPago": "metodo_pago",
+    }
+    FIJOS = {"pagado": True, "esRecurrente": False}
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, numero, fecha, categoria_id, detalle, proveedor, monto, metodo_pago):
+        super().__init__(id, numero, fecha, interno(categoria_id), detalle, proveedor, monto,
+                         interno(metodo_pago))
+
+
+class MovimientoCuentaCorriente(Registro):
+    CAMPOS = ("id", "socioId", "fecha", "tipo", "concepto", "monto", "saldoAnterior", "saldoNuevo",
+              "referenciaId", "referenciaTabla")
+    ATRIBUTOS = {
+        "id": "id", "socioId": "socio_id", "fecha": "fecha", "tipo": "tipo", "concepto": "concepto",
+        "monto": "monto", "saldoAnterior": "saldo_anterior", "saldoNuevo": "saldo_nuevo",
+        "referenciaId": "referencia_id",
+    }
+    FIJOS = {"referenciaTabla": "ventas"}
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, socio_id, fecha, tipo, concepto, monto, saldo_anterior, saldo_nuevo, referencia_id):
+        super().__init__(id, socio_id, fecha, interno(tipo), concepto, monto, saldo_anterior, saldo_nuevo,
+                         referencia_id)
+
+
+class Pago(Registro):
+    CAMPOS = ("id", "fecha", "socioId", "ventaId", "monto", "metodoPago", "concepto")
+    ATRIBUTOS = {
+        "id": "id", "fecha": "fecha", "socioId": "socio_id", "ventaId": "venta_id", "monto": "monto",
+        "metodoPago": "metodo_pago", "concepto": "concepto",
+    }
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, fecha, socio_id, venta_id, monto, metodo_pago, concepto):
+        super().__init__(id, fecha, socio_id, venta_id, monto, interno(metodo_pago), concepto)
+
+
+class MovimientoStock(Registro):
+    CAMPOS = ("id", "productoId", "fecha", "tipo", "cantidad", "stockAnterior", "stockNuevo", "motivo",
+              "referenciaId", "referenciaTabla")
+    ATRIBUTOS = {
+        "id": "id", "productoId": "producto_id", "fecha": "fecha", "tipo": "tipo", "cantidad": "cantidad",
+        "stockAnterior": "stock_anterior", "stockNuevo": "stock_nuevo", "motivo": "motivo",
+        "referenciaId": "referencia_id", "referenciaTabla": "referencia_tabla",
+    }
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, producto_id, fecha, tipo, cantidad, stock_anterior, stock_nuevo, motivo,
+                 referencia_id=None, referencia_tabla=None):
+        super().__init__(id, interno(producto_id), fecha, interno(tipo), cantidad, stock_anterior,
+                         stock_nuevo, motivo, referencia_id, interno(referencia_tabla))
+
+
+class MovimientoCaja(Registro):
+    CAMPOS = ("id", "fecha", "tipo", "categoria", "monto", "metodoPago", "concepto", "referenciaId",
+              "referenciaTabla", "saldoAnterior", "saldoNuevo", "responsable", "notas")
+    ATRIBUTOS = {
+        "id": "id", "fecha": "fecha", "tipo": "tipo", "categoria": "categoria", "monto": "monto",
+        "metodoPago": "metodo_pago", "concepto": "concepto", "referenciaId": "referencia_id",
+        "referenciaTabla": "referencia_tabla", "saldoAnterior": "saldo_anterior",
+        "saldoNuevo": "saldo_nuevo", "responsable": "responsable",
+    }
+    FIJOS = {"notas": None}
+    FECHAS = frozenset({"fecha"})
+    __slots__ = _slots(ATRIBUTOS)
+
+    def __init__(self, id, fecha, tipo, categoria, monto, metodo_pago, concepto, referencia_id,
+                 referencia_tabla, saldo_anterior, saldo_nuevo, responsable=None):
+        super().__init__(id, fecha, interno(tipo), interno(categoria), monto, interno(metodo_pago), concepto,
+                         referencia_id, interno(referencia_tabla), saldo_anterior, saldo_nuevo, responsable)
@@ -0,0 +1,119 @@
+"""
+Informe de ejecución por etapas de la migración
+
+Cada sección de la migración (carga del workbook, HOJA 1, HOJA 2, HOJA 3, salida) se
+envuelve en informe.etapa(nombre), que registra:
+
+- segundos de reloj, filas procesadas y filas/s
+- filas salteadas por motivo (sin_fecha, ya_migrada, total_no_numerico, ...)
+- entidades generadas por colección
+- pico de memoria de tracemalloc de la etapa (solo con memoria=True: tracemalloc
+  hace la corrida bastante más lenta)
+
+El informe se guarda como JSON (guardar) para comparar corridas o procesarlo aparte.
+Un Informe inactivo no registra nada, así el código de la migración lo usa siempre
+sin preguntar si hay informe.
+"""
+
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+FORMATO_INFORME = 1
+
+
+class Informe:
+    """Acumula las métricas de cada etapa de una corrida"""
+
+    def __init__(self, activo=True, memoria=False):
+        self.activo = activo
+        self.memoria = memoria and activo
+        self.inicio = datetime.now().isoformat(timespec='seconds')
+        self.contexto = {}
+        self.etapas = []
+        self._actual = None
+        self._t0 = time.perf_counter()
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide el bloque como una etapa del informe"""
+        if not self.activo:
+            yield
+            return
+        registro = {"nombre": nombre, "filas": 0, "saltadas": Counter(), "entidades": Counter()}
+        anterior, self._actual = self._actual, registro
+        if self.memoria:
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            registro["segundos"] = round(segundos, 6)
+            registro["filas_por_seg"] = round(registro["filas"] / segundos) if segundos > 0 else None
+            if self.memoria:
+                registro["memoria_pico_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            registro["saltadas"] = dict(registro["saltadas"])
+            registro["entidades"] = dict(registro["entidades"])
+            self.etapas.append(registro)
+            self._actual = anterior
+
+    def fila(self, cantidad=1):
+        """Cuenta filas procesadas en la etapa actual"""
+        if self._actual is not None:
+            self._actual["filas"] += cantidad
+
+    def saltar(self, motivo):
+        """Cuenta una fila salteada en la etapa actual"""
+        if self._actual is not None:
+            self._actual["saltadas"][motivo] += 1
+
+    def entidades(self, cantidades):
+        """Suma entidades generadas {coleccion: cantidad} a la etapa actual"""
+        if self._actual is not None:
+            self._actual["entidades"].update({c: n for c, n in cantidades.items() if n})
+
+    def to_dict(self):
+        total = {"segundos": round(time.perf_counter() - self._t0, 6)}
+        if self.memoria:
+            total["memoria_pico_mb"] = max((e["memoria_pico_mb"] for e in self.etapas), default=0)
+        return {
+            "formato": FORMATO_INFORME,
+            "inicio": self.inicio,
+            "contexto": self.contexto,
+            "etapas": self.etapas,
+            "total": total,
+        }
+
+    def guardar(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def imprimir(self):
+        """Tabla resumen de las etapas"""
+        imprimir_etapas(self.etapas, self.memoria)
+
+
+def imprimir_etapas(etapas, memoria=False):
+    """Tabla resumen de etapas (de un Informe o de un informe guardado)"""
+    columna_memoria = f" {'MEM MB':>8}" if memoria else ""
+    print(f"\n{'ETAPA':<24} {'SEGUNDOS':>9} {'FILAS':>8} {'FILAS/S':>10}{columna_memoria}  SALTEADAS")
+    for e in etapas:
+        por_seg = f"{e['filas_por_seg']:,}" if e['filas_por_seg'] else '-'
+        mem = f" {e['memoria_pico_mb']:>8.2f}" if memoria else ""
+        saltadas = ', '.join(f"{m}={n}" for m, n in sorted(e['saltadas'].items())) or '-'
+        print(f"{e['nombre']:<24} {e['segundos']:>9.4f} {e['filas']:>8} {por_seg:>10}{mem}  {saltadas}")
+
+
+def cargar_informe(path):
+    """Lee un informe guardado con Informe.guardar"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+SIN_INFORME = Informe(activo=False)
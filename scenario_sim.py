@@ -0,0 +1,260 @@
+"""
+Simulador de escenarios de producción y rentabilidad con NumPy
+
+La hoja GASTOS FIJOS Y OTROS tiene, al costado de los costos fijos mensuales, un bloque
+de proyección: gramos por cultivo de cada sala, días de ciclo, ciclos al año, precio de
+venta por gramo y el saldo anual en pesos y en dólares. Ese bloque y los costos fijos
+son el caso base; el simulador corre miles de escenarios variando a la vez:
+
+- el rinde de cada sala (factor sobre los gramos por cultivo, independiente por sala)
+- la duración del ciclo en días (los ciclos al año salen de los días del año de la
+  hoja: ciclos base x días de ciclo base)
+- el precio de venta por gramo
+- la cotización del dólar: los costos anotados en USD (nota "400 USD") se ajustan con
+  ella y los resultados en dólares se convierten con la del escenario
+
+Por escenario se calcula el margen anual (ventas - 12 costos fijos mensuales) en pesos
+y en dólares, el margen mensual por parte y el precio de equilibrio (costo anual /
+gramos producidos). Los escenarios se generan y evalúan por lotes de arrays, sin loops
+por escenario, y se resumen con percentiles y la probabilidad de pérdida.
+
+El saldo de la hoja descuenta su propio punto de equilibrio en gramos (P. E X MES,
+cargado a mano con costos anteriores): se muestra al lado del caso base para comparar.
+Las celdas del bloque se ubican por su etiqueta (SALA 1, CICLOS AL AÑO, $ VTA, SALDO
+USD...), no por posición fija, así el bloque se puede correr de lugar en la hoja.
+
+Uso:
+    python scenario_sim.py [--excel ARCHIVO] [--escenarios 50000] [--lote 16384] [--semilla 1]
+                           [--rinde 0.2] [--ciclo 10] [--precio 0.15] [--dolar 0.25]
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import namedtuple
+from itertools import islice
+
+import numpy as np
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+HOJA_GASTOS_FIJOS = 'GASTOS FIJOS Y OTROS'
+PERCENTILES = (5, 25, 50, 75, 95)
+CICLO_MINIMO = 30  # días
+
+CasoBase = namedtuple('CasoBase', [
+    'gramos_sala',         # gramos por cultivo de cada sala
+    'ciclo_dias',
+    'ciclos_anio',
+    'precio_gramo',
+    'costo_fijo_pesos',    # costos fijos mensuales en pesos
+    'costo_fijo_dolar',    # parte de los costos fijos anotada en USD (en pesos a la cotización base)
+    'cotizacion',
+    'partes',
+    'saldo_planilla',      # saldo anual que calcula la hoja
+])
+
+# ============================================================================
+# CASO BASE DESDE LA HOJA
+# ============================================================================
+
+def _texto(valor):
+    return ' '.join(str(valor).upper().split()) if isinstance(valor, str) else ''
+
+
+def _numero(valor):
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return float(valor)
+    encontrado = re.search(r'\d+(?:[.,]\d+)?', str(valor or ''))
+    return float(encontrado.group().replace(',', '.')) if encontrado else None
+
+
+def _celdas(filas):
+    """{etiqueta: (fila, columna)} de las celdas de texto del bloque de proyección"""
+    celdas = {}
+    for i, fila in enumerate(filas):
+        for j, valor in enumerate(fila):
+            etiqueta = _texto(valor)
+            if etiqueta and etiqueta not in celdas:
+                celdas[etiqueta] = (i, j)
+    return celdas
+
+
+def _junto_a(filas, celdas, etiqueta, desplazamiento=1):
+    """Número en la celda a `desplazamiento` columnas de la etiqueta"""
+    if etiqueta not in celdas:
+        raise ValueError(f"{HOJA_GASTOS_FIJOS}: no se encontró la celda {etiqueta!r}")
+    i, j = celdas[etiqueta]
+    return _numero(filas[i][j + desplazamiento])
+
+
+def leer_caso_base(filas):
+    """
+    Arma el CasoBase con las filas de GASTOS FIJOS Y OTROS: los costos fijos de las filas
+    4 a 15 (como la migración) y el bloque de proyección de las columnas laterales.
+    """
+    filas = [tuple(fila) for fila in filas]
+
+    costo_pesos = costo_dolar = 0.0
+    for fila in islice(filas, 3, 15):
+        monto = fila[4] if len(fila) > 4 else None
+        if not (fila[3] and isinstance(monto, (int, float))):
+            continue
+        if 'USD' in _texto(fila[6] if len(fila) > 6 else None):
+            costo_dolar += monto
+        else:
+            costo_pesos += monto
+
+    celdas = _celdas(filas)
+    salas = sorted(posicion for etiqueta, posicion in celdas.items() if re.fullmatch(r'SAL+A \d+', etiqueta))
+    if not salas:
+        raise ValueError(f"{HOJA_GASTOS_FIJOS}: no se encontraron las filas de las salas")
+    gramos = tuple(_numero(filas[i][j + 1]) or 0 for i, j in salas)
+    ciclo_dias = _numero(filas[salas[0][0]][salas[0][1] + 2])
+
+    saldo = _junto_a(filas, celdas, 'SALDO')
+    saldo_usd = _junto_a(filas, celdas, 'SALDO USD')
+    por_parte = _junto_a(filas, celdas, 'P C/U')
+    return CasoBase(
+        gramos_sala=gramos,
+        ciclo_dias=ciclo_dias,
+        ciclos_anio=_junto_a(filas, celdas, 'CICLOS AL AÑO', -1),
+        precio_gramo=_junto_a(filas, celdas, '$ VTA'),
+        costo_fijo_pesos=costo_pesos,
+        costo_fijo_dolar=costo_dolar,
+        cotizacion=saldo / saldo_usd,
+        partes=round(saldo_usd / por_parte),
+        saldo_planilla=saldo,
+    )
+
+
+def cargar_caso_base(excel_path=EXCEL_PATH):
+    """Lee el caso base desde el snapshot cacheado del Excel"""
+    from workbook_cache import cargar_snapshot
+
+    wb = cargar_snapshot(excel_path)
+    try:
+        return leer_caso_base(wb[HOJA_GASTOS_FIJOS].iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+# ============================================================================
+# SIMULACIÓN
+# ============================================================================
+
+def evaluar(base, rinde, ciclo_dias, precio, cotizacion):
+    """
+    Resultados de escenarios dados como arrays: rinde (n, salas) es el factor sobre los
+    gramos de cada sala; ciclo_dias, precio y cotizacion son (n,). Devuelve un dict de
+    arrays (n,): gramos, margen, margen_usd, margen_parte_mes_usd, precio_equilibrio.
+    """
+    dias_anio = base.ciclos_anio * base.ciclo_dias
+    gramos = (rinde @ np.asarray(base.gramos_sala, dtype=np.float64)) * (dias_anio / ciclo_dias)
+    costo_anual = 12 * (base.costo_fijo_pesos + base.costo_fijo_dolar * (cotizacion / base.cotizacion))
+    margen = gramos * precio - costo_anual
+    margen_usd = margen / cotizacion
+    equilibrio = np.divide(costo_anual, gramos, out=np.full_like(gramos, np.inf), where=gramos > 0)
+    return {
+        "gramos": gramos,
+        "margen": margen,
+        "margen_usd": margen_usd,
+        "margen_parte_mes_usd": margen_usd / base.partes / 12,
+        "precio_equilibrio": equilibrio,
+    }
+
+
+def caso_base(base):
+    """Resultados del caso base sin variaciones (escalares)"""
+    uno = np.ones(1)
+    resultado = evaluar(base, np.ones((1, len(base.gramos_sala))), base.ciclo_dias * uno,
+                        base.precio_gramo * uno, base.cotizacion * uno)
+    return {clave: float(valores[0]) for clave, valores in resultado.items()}
+
+
+def _sortear(base, rng, n, variacion):
+    """Variables de n escenarios alrededor del caso base"""
+    salas = len(base.gramos_sala)
+    rinde = np.maximum(rng.normal(1.0, variacion["rinde"], (n, salas)), 0)
+    ciclo = np.maximum(rng.normal(base.ciclo_dias, variacion["ciclo"], n), CICLO_MINIMO)
+    precio = base.precio_gramo * np.maximum(rng.normal(1.0, variacion["precio"], n), 0)
+    cotizacion = base.cotizacion * np.exp(rng.normal(0.0, variacion["dolar"], n))
+    return rinde, ciclo, precio, cotizacion
+
+
+def simular(base, escenarios, variacion, lote=16384, semilla=None):
+    """
+    Corre `escenarios` escenarios por lotes de `lote` y devuelve un dict de arrays
+    (escenarios,) como evaluar. variacion: desvíos de rinde, precio y dolar (relativos)
+    y de ciclo (días). Con la misma semilla el resultado es el mismo.
+    """
+    rng = np.random.default_rng(semilla)
+    resultados = None
+    for inicio in range(0, escenarios, lote):
+        n = min(lote, escenarios - inicio)
+        parcial = evaluar(base, *_sortear(base, rng, n, variacion))
+        if resultados is None:
+            resultados = {clave: np.empty(escenarios) for clave in parcial}
+        for clave, valores in parcial.items():
+            resultados[clave][inicio:inicio + n] = valores
+    return resultados
+
+
+def resumir(resultados):
+    """{métrica: (percentiles, media)} y la probabilidad de margen negativo"""
+    resumen = {}
+    for clave, valores in resultados.items():
+        finitos = valores[np.isfinite(valores)]
+        resumen[clave] = (np.percentile(finitos, PERCENTILES), finitos.mean())
+    return resumen, float(np.mean(resultados["margen"] < 0))
+
+
+METRICAS = (
+    ("gramos", "Gramos al año", "{:>14,.0f}"),
+    ("margen", "Margen anual $", "{:>14,.0f}"),
+    ("margen_usd", "Margen anual USD", "{:>14,.0f}"),
+    ("margen_parte_mes_usd", "Mensual por parte USD", "{:>14,.0f}"),
+    ("precio_equilibrio", "Precio equilibrio $/g", "{:>14,.0f}"),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escenarios de producción y rentabilidad (GASTOS FIJOS Y OTROS)")
+    parser.add_argument('--excel', default=EXCEL_PATH)
+    parser.add_argument('--escenarios', type=int, default=50000)
+    parser.add_argument('--lote', type=int, default=16384, help="Escenarios por lote de arrays")
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--rinde', type=float, default=0.2, help="Desvío relativo del rinde de cada sala")
+    parser.add_argument('--ciclo', type=float, default=10, help="Desvío de la duración del ciclo, en días")
+    parser.add_argument('--precio', type=float, default=0.15, help="Desvío relativo del precio de venta")
+    parser.add_argument('--dolar', type=float, default=0.25, help="Desvío del logaritmo de la cotización")
+    args = parser.parse_args(argv)
+    if args.escenarios <= 0 or args.lote <= 0:
+        parser.error("--escenarios y --lote tienen que ser positivos")
+
+    base = cargar_caso_base(args.excel)
+    print(f"Salas: {' + '.join(f'{g:,.0f} g' for g in base.gramos_sala)} por cultivo, "
+          f"ciclo de {base.ciclo_dias:.0f} días ({base.ciclos_anio:g} ciclos al año)")
+    print(f"Precio: ${base.precio_gramo:,.0f}/g | Dólar: ${base.cotizacion:,.2f} | Partes: {base.partes}")
+    print(f"Costos fijos mensuales: ${base.costo_fijo_pesos + base.costo_fijo_dolar:,.0f} "
+          f"(${base.costo_fijo_dolar:,.0f} anotados en USD)")
+    inicial = caso_base(base)
+    print(f"Caso base: margen anual ${inicial['margen']:,.0f} (US${inicial['margen_usd']:,.0f}), "
+          f"equilibrio ${inicial['precio_equilibrio']:,.0f}/g | saldo de la hoja ${base.saldo_planilla:,.0f}")
+
+    variacion = {"rinde": args.rinde, "ciclo": args.ciclo, "precio": args.precio, "dolar": args.dolar}
+    inicio = time.perf_counter()
+    resultados = simular(base, args.escenarios, variacion, args.lote, args.semilla)
+    resumen, perdida = resumir(resultados)
+    segundos = time.perf_counter() - inicio
+
+    print(f"\nESCENARIOS: {args.escenarios:,} en {segundos:.3f}s (lotes de {args.lote:,})")
+    print(f"{'':<24}" + ''.join(f" {f'P{p}':>14}" for p in PERCENTILES) + f" {'MEDIA':>14}")
+    for clave, nombre, formato in METRICAS:
+        percentiles, media = resumen[clave]
+        print(f"{nombre:<24}" + ''.join(' ' + formato.format(v) for v in percentiles) + ' ' + formato.format(media))
+    print(f"\nProbabilidad de pérdida: {perdida:.1%}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -3,8 +3,10 @@
 // Importa datos_migrados.json a Firebase
 // ============================================================================
 
-import { readFileSync } from 'fs';
+import { createReadStream, readFileSync } from 'fs';
 import { join } from 'path';
+import { createInterface } from 'readline';
+import { createGunzip } from 'zlib';
 import { importService, COLLECTIONS } from '../lib/firebaseService';
 import {
   mockInversores,
@@ -22,6 +24,54 @@ import {
   mockMovimientosStock,
 } from '../lib/mockData';
 
+// Colección de Firebase para cada archivo NDJSON generado por
+// `python migrate_excel_to_new_model.py --formato ndjson` (en orden de dependencias)
+const COLECCIONES_NDJSON: [string, string][] = [
+  ['inversores', COLLECTIONS.INVERSORES],
+  ['gastosInversion', COLLECTIONS.GASTOS_INVERSION],
+  ['socios', COLLECTIONS.SOCIOS],
+  ['ventas', COLLECTIONS.VENTAS],
+  ['itemsVenta', COLLECTIONS.ITEMS_VENTA],
+  ['gastosOperativos', COLLECTIONS.GASTOS],
+  ['gastosFijos', COLLECTIONS.GASTOS],
+];
+
+// Límite de operaciones por writeBatch de Firestore
+const TAMANO_LOTE = 500;
+
+/**
+ * Importa la salida NDJSON de la migración leyendo cada archivo línea a línea,
+ * sin cargar el JSON completo en memoria. Soporta archivos sin comprimir o gzip.
+ */
+async function importarNdjson(directorio: string): Promise<void> {
+  const manifiesto = JSON.parse(readFileSync(join(directorio, 'manifest.json'), 'utf-8'));
+  if (manifiesto.compresion && manifiesto.compresion !== 'gzip') {
+    throw new Error(`Compresión no soportada para importar: ${manifiesto.compresion}`);
+  }
+
+  for (const [coleccion, destino] of COLECCIONES_NDJSON) {
+    const info = manifiesto.colecciones[coleccion];
+    if (!info) continue;
+
+    const archivo = createReadStream(join(directorio, info.archivo));
+    const entrada = manifiesto.compresion === 'gzip' ? archivo.pipe(createGunzip()) : archivo;
+    const lineas = createInterface({ input: entrada, crlfDelay: Infinity });
+
+    let lote: { id: string }[] = [];
+    for await (const linea of lineas) {
+      if (!linea.trim()) continue;
+      lote.push(JSON.parse(linea));
+      if (lote.length === TAMANO_LOTE) {
+        await importService.importarLote(destino, lote);
+        lote = [];
+      }
+    }
+    if (lote.length > 0) {
+      await importService.importarLote(destino, lote);
+    }
+  }
+}
+
 async function main() {
   console.log('=' .repeat(100));
   console.log('IMPORTACIÓN DE DATOS A FIREBASE');
@@ -60,6 +110,11 @@ async function main() {
     await importService.importarTodosDatos(datosMigrados);
     */
 
+    /*
+    // DESCOMENTAR PARA IMPORTAR LA SALIDA NDJSON (--formato ndjson) EN STREAMING
+    await importarNdjson(join(process.cwd(), 'datos_migrados'));
+    */
+
   } catch (error) {
     console.error('❌ Error durante la importación:', error);
     throw error;
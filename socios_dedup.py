@@ -0,0 +1,241 @@
+"""
+Deduplicación de socios (clientes) del Excel
+
+normalize_cliente solo pasa a mayúsculas, así que "COLO", "COLO." y "COLO R" terminan
+como socios distintos. Este módulo:
+
+1. Pliega los nombres (sin acentos ni puntuación, espacios colapsados).
+2. Arma un índice invertido de trigramas de caracteres para encontrar pares candidatos
+   sin comparar todos contra todos (los trigramas demasiado frecuentes no generan pares).
+3. Puntúa cada par con el coeficiente de Dice sobre trigramas, o con la regla de
+   iniciales ("MARCOS R" ~ "MARCOS REYNOSO"), y une los pares sobre el umbral.
+4. Guarda un mapa de alias (nombre plegado -> nombre canónico) en socios_alias.json,
+   que la migración aplica con un lookup por fila. El canónico de cada grupo es la
+   variante más usada en el Excel.
+
+El mapa es una sugerencia para revisar: las entradas que ya existen en el archivo
+(por ejemplo, correcciones manuales) se respetan al regenerarlo.
+
+Uso:
+    python socios_dedup.py [--excel ARCHIVO] [--umbral 0.8] [--salida socios_alias.json]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+ALIAS_PATH = 'socios_alias.json'
+UMBRAL = 0.8
+MAX_BLOQUE = 200
+PUNTAJE_INICIALES = 0.9
+
+
+def plegar_nombre(nombre):
+    """Quita acentos y puntuación y colapsa espacios: 'Matías  R.' -> 'MATIAS R'"""
+    if not nombre:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(nombre))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r'[^0-9A-Za-z]+', ' ', texto.upper())
+    return ' '.join(texto.split())
+
+
+def trigramas(nombre_plegado):
+    relleno = f" {nombre_plegado} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _token_compatible(a, b):
+    """Tokens iguales, o uno es inicial (1 letra) o prefijo de 5+ letras del otro"""
+    if a == b:
+        return True
+    corto, largo = sorted((a, b), key=len)
+    return largo.startswith(corto) and (len(corto) == 1 or len(corto) >= 5)
+
+
+def es_nombre_completo(nombre_plegado):
+    """Dos o más tokens sin iniciales sueltas: 'SANTI MOLINA' sí, 'SANTIAGO M' no"""
+    tokens = nombre_plegado.split()
+    return len(tokens) > 1 and all(len(t) > 1 for t in tokens)
+
+
+def coinciden_iniciales(a, b):
+    """
+    'MARCOS R' ~ 'MARCOS REYNOSO', 'COLO' ~ 'COLO R', 'MAURI FLASS' ~ 'MAURICIO FLASS'.
+    El primer token debe coincidir (o ser prefijo largo) y solo se tolera una inicial suelta de más.
+    """
+    ta, tb = a.split(), b.split()
+    if len(ta) > len(tb):
+        ta, tb = tb, ta
+    if not ta:
+        return False
+    if len(tb) - len(ta) > 1 or (len(tb) - len(ta) == 1 and len(tb[-1]) != 1):
+        return False
+    if len(ta[0]) == 1 or len(tb[0]) == 1:
+        return False
+    return all(_token_compatible(x, y) for x, y in zip(ta, tb))
+
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> nombres para generar pares candidatos (blocking)"""
+
+    def __init__(self, nombres, max_bloque=MAX_BLOQUE):
+        self.nombres = list(nombres)
+        self.gramas = [trigramas(n) for n in self.nombres]
+        self.max_bloque = max_bloque
+        self.postings = defaultdict(list)
+        for i, gramas in enumerate(self.gramas):
+            for g in gramas:
+                self.postings[g].append(i)
+
+    def pares_candidatos(self, minimo_compartido=2):
+        """Genera (i, j, trigramas compartidos) para los pares que comparten suficientes trigramas"""
+        utiles = {g: ids for g, ids in self.postings.items() if 1 < len(ids) <= self.max_bloque}
+        for i, gramas in enumerate(self.gramas):
+            compartidos = Counter()
+            for g in gramas:
+                for j in utiles.get(g, ()):
+                    if j < i:
+                        compartidos[j] += 1
+            for j, n in compartidos.items():
+                if n >= minimo_compartido:
+                    yield j, i, n
+
+    def similitud(self, i, j, compartidos=None):
+        """Dice sobre trigramas, o el puntaje de la regla de iniciales si es mayor"""
+        if compartidos is None:
+            compartidos = len(self.gramas[i] & self.gramas[j])
+        dice = 2 * compartidos / (len(self.gramas[i]) + len(self.gramas[j]))
+        if dice < PUNTAJE_INICIALES and coinciden_iniciales(self.nombres[i], self.nombres[j]):
+            return PUNTAJE_INICIALES
+        return dice
+
+
+def agrupar_nombres(frecuencias, umbral=UMBRAL, max_bloque=MAX_BLOQUE):
+    """
+    Agrupa nombres (normalizados como en la migración) que refieren al mismo socio.
+    frecuencias: {nombre: cantidad de filas} en orden de primera aparición.
+    Devuelve {nombre: canónico} solo para los grupos de más de una variante.
+    """
+    # Variantes con el mismo nombre plegado caen juntas sin necesidad de comparar
+    por_plegado = defaultdict(list)
+    for nombre in frecuencias:
+        por_plegado[plegar_nombre(nombre)].append(nombre)
+    plegados = [p for p in por_plegado if p]
+
+    indice = IndiceTrigramas(plegados, max_bloque)
+    padre = list(range(len(plegados)))
+    # Nombres completos de cada grupo: dos grupos no se unen si tienen nombres completos
+    # distintos entre sí, para que una inicial ('SANTIAGO M') no encadene 'SANTI MOLINA'
+    # con 'SANTI MARTEAU'
+    completos = {k: [k] if es_nombre_completo(p) else [] for k, p in enumerate(plegados)}
+
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    for i, j, compartidos in indice.pares_candidatos():
+        if indice.similitud(i, j, compartidos) < umbral:
+            continue
+        ri, rj = raiz(i), raiz(j)
+        if ri == rj:
+            continue
+        if all(indice.similitud(a, b) >= umbral for a in completos[ri] for b in completos[rj]):
+            padre[rj] = ri
+            completos[ri].extend(completos.pop(rj))
+
+    grupos = defaultdict(list)
+    for k, plegado in enumerate(plegados):
+        grupos[raiz(k)].extend(por_plegado[plegado])
+
+    orden = {nombre: n for n, nombre in enumerate(frecuencias)}
+    alias = {}
+    for variantes in grupos.values():
+        if len(variantes) < 2:
+            continue
+        canonico = min(variantes, key=lambda v: (-frecuencias[v], orden[v]))
+        for variante in variantes:
+            alias[variante] = canonico
+    return alias
+
+
+def mapa_por_plegado(alias):
+    """Convierte {variante: canónico} en {nombre plegado: canónico} para el lookup de la migración"""
+    return {plegar_nombre(variante): canonico for variante, canonico in alias.items()}
+
+
+def cargar_alias(path=ALIAS_PATH):
+    """Lee el mapa de alias persistido (None si no existe)"""
+    if not Path(path).exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['alias']
+
+
+def huella_alias(alias):
+    """SHA-256 del mapa de alias (None sin mapa), para invalidar la migración incremental"""
+    if not alias:
+        return None
+    contenido = json.dumps(alias, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def guardar_alias(alias, path=ALIAS_PATH, umbral=UMBRAL):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"umbral": umbral, "alias": alias}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def frecuencias_clientes(rows):
+    """Cuenta las filas con fecha de cada cliente de STOCK Y VENTAS, normalizado como en la migración"""
+    from migrate_excel_to_new_model import iter_registros_stock
+
+    frecuencias = Counter()
+    for registro in iter_registros_stock(rows):
+        if registro.cliente:
+            frecuencias[registro.cliente] += 1
+    return frecuencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sugiere el mapa de alias de socios duplicados")
+    parser.add_argument('--excel', default='Sheets actual 19-01-26.xlsx')
+    parser.add_argument('--umbral', type=float, default=UMBRAL, help="Similitud mínima para unir dos nombres")
+    parser.add_argument('--salida', default=ALIAS_PATH)
+    args = parser.parse_args(argv)
+
+    from workbook_cache import cargar_snapshot
+
+    wb = cargar_snapshot(args.excel)
+    frecuencias = frecuencias_clientes(wb['STOCK Y VENTAS'].iter_rows(values_only=True))
+    sugerido = agrupar_nombres(frecuencias, args.umbral)
+
+    # Los plegados ya presentes en el archivo (revisados a mano) tienen prioridad
+    existente = cargar_alias(args.salida) or {}
+    ya_mapeados = {plegar_nombre(v) for v in existente}
+    alias = dict(existente)
+    for variante, canonico in sugerido.items():
+        if plegar_nombre(variante) not in ya_mapeados:
+            alias[variante] = canonico
+    guardar_alias(alias, args.salida, args.umbral)
+
+    grupos = defaultdict(list)
+    for variante, canonico in alias.items():
+        grupos[canonico].append(variante)
+    print(f"Clientes distintos: {len(frecuencias)}")
+    print(f"Grupos con variantes: {len(grupos)}")
+    for canonico, variantes in sorted(grupos.items()):
+        otros = sorted(v for v in variantes if v != canonico)
+        print(f"  {canonico} <- {', '.join(otros)}")
+    print(f"\nMapa de alias guardado en {args.salida}")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,238 @@
+"""
+Libro de stock por producto a partir de CANTIDAD GR y ESQUE/KITS
+
+Cada cantidad de esas columnas de STOCK Y VENTAS es un movimiento de stock (tabla
+movimientos_stock) con la cantidad con signo, como los que genera la app:
+
+- AJUSTE: filas de ajuste (cliente o detalle AJUSTE), con cualquier signo
+- INGRESO: el resto de las cantidades positivas (INGRESO STOCK ...)
+- EGRESO: ventas ("Venta #n", con referencia a la venta), sueldos y pagos en especie
+
+Por producto los movimientos quedan ordenados por fecha (a igual fecha, en el orden
+de llegada) con sumas prefijas: stock después de cada movimiento, egresos acumulados
+y área stock x días. El stock a una fecha, el neto o los egresos de un rango, el stock
+promedio y la rotación se responden con una búsqueda binaria.
+
+cerrar() se puede volver a llamar después de agregar movimientos: las sumas se
+recalculan solo desde el primer movimiento insertado de cada producto, así que las
+filas nuevas posteriores al último movimiento solo extienden los arrays.
+
+La hoja no registra todos los ingresos (el stock se corrige con filas de ajuste), así
+que el stock calculado puede quedar negativo entre ajustes: el libro refleja lo
+registrado, sin corregirlo.
+
+Uso:
+    python stock_ledger.py [--entrada datos_migrados.json] [--fecha AAAA-MM-DD]
+                           [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD]
+"""
+
+import argparse
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from records import MovimientoStock, clave_fecha
+
+INGRESO = "INGRESO"
+EGRESO = "EGRESO"
+AJUSTE = "AJUSTE"
+
+_INFINITO = float('inf')
+
+
+def dias(clave):
+    """Días (con fracción) desde el 1/1/1 de una clave ISO, para el área stock x días"""
+    fecha = datetime.fromisoformat(clave)
+    return fecha.toordinal() + (fecha.hour * 3600 + fecha.minute * 60 + fecha.second) / 86400
+
+
+class _Serie:
+    """Movimientos de un producto ordenados por (fecha, llegada) con sus sumas prefijas"""
+
+    __slots__ = ('llaves', 'dias', 'movimientos', 'stock', 'egresos', 'area')
+
+    def __init__(self):
+        self.llaves = []       # (fecha ISO, orden de llegada)
+        self.dias = []
+        self.movimientos = []
+        self.stock = []        # stock después de cada movimiento
+        self.egresos = []      # egresos acumulados (en positivo)
+        self.area = []         # integral de stock x días hasta cada movimiento
+
+    def insertar(self, llave, movimiento):
+        """Inserta el movimiento en su lugar (las sumas quedan pendientes); devuelve la posición"""
+        i = bisect_right(self.llaves, llave)
+        self.llaves.insert(i, llave)
+        self.dias.insert(i, dias(llave[0]))
+        self.movimientos.insert(i, movimiento)
+        for prefijo in (self.stock, self.egresos, self.area):
+            prefijo.insert(i, None)
+        return i
+
+    def recalcular(self, desde):
+        """Rehace las sumas prefijas (y stockAnterior/stockNuevo) desde la posición dada"""
+        for i in range(desde, len(self.llaves)):
+            movimiento = self.movimientos[i]
+            if i:
+                anterior, egresos = self.stock[i - 1], self.egresos[i - 1]
+                area = self.area[i - 1] + anterior * (self.dias[i] - self.dias[i - 1])
+            else:
+                anterior = egresos = area = 0
+            movimiento.stock_anterior = anterior
+            movimiento.stock_nuevo = self.stock[i] = round(anterior + movimiento.cantidad, 3)
+            self.egresos[i] = egresos - movimiento.cantidad if movimiento.tipo == EGRESO else egresos
+            self.area[i] = area
+
+    def hasta(self, clave):
+        """Cantidad de movimientos con fecha <= clave"""
+        return bisect_right(self.llaves, (clave, _INFINITO))
+
+    def desde(self, clave):
+        """Posición del primer movimiento con fecha >= clave"""
+        return bisect_left(self.llaves, (clave,))
+
+    def area_hasta(self, clave):
+        i = self.hasta(clave) - 1
+        if i < 0:
+            return 0
+        return self.area[i] + self.stock[i] * (dias(clave) - self.dias[i])
+
+
+class LibroStock:
+    """
+    Libro de movimientos de stock. Se alimenta con agregar (en el orden de las filas)
+    y cerrar() ordena, calcula los saldos y deja listo el índice para las consultas.
+    Cada movimiento trae su ID (derivado de la fila de origen, ver content_ids.py).
+    """
+
+    def __init__(self):
+        self.movimientos = []
+        self._series = {}
+        self._pendientes = []
+
+    def agregar(self, id, producto_id, fecha, cantidad, tipo, motivo, referencia_id=None, referencia_tabla=None):
+        """Registra un movimiento; cantidad con signo (negativa para egresos)"""
+        movimiento = MovimientoStock(
+            id=id,
+            producto_id=producto_id,
+            fecha=clave_fecha(fecha),
+            tipo=tipo,
+            cantidad=cantidad,
+            stock_anterior=None,
+            stock_nuevo=None,
+            motivo=motivo,
+            referencia_id=referencia_id,
+            referencia_tabla=referencia_tabla
+        )
+        self._pendientes.append((len(self.movimientos), movimiento))
+        self.movimientos.append(movimiento)
+        return movimiento
+
+    def agregar_registro(self, registro):
+        """Registra un movimiento de una salida previa (registro o dict con las claves JSON)"""
+        return self.agregar(registro["id"], registro["productoId"], registro["fecha"], registro["cantidad"],
+                            registro["tipo"], registro["motivo"], registro.get("referenciaId"),
+                            registro.get("referenciaTabla"))
+
+    def cerrar(self):
+        """Inserta los movimientos pendientes y recalcula cada producto desde el primer cambio"""
+        cambios = {}
+        for orden, movimiento in self._pendientes:
+            serie = self._series.setdefault(movimiento.producto_id, _Serie())
+            i = serie.insertar((movimiento.fecha, orden), movimiento)
+            cambios[movimiento.producto_id] = min(cambios.get(movimiento.producto_id, i), i)
+        self._pendientes = []
+        for producto_id, desde in cambios.items():
+            self._series[producto_id].recalcular(desde)
+        return self
+
+    # ------------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------------
+
+    def productos(self):
+        return list(self._series)
+
+    def stock(self, producto_id, fecha=None):
+        """Stock del producto después de sus movimientos hasta fecha (por defecto, el actual)"""
+        serie = self._series.get(producto_id)
+        if serie is None or not serie.stock:
+            return 0
+        i = len(serie.stock) if fecha is None else serie.hasta(clave_fecha(fecha))
+        return serie.stock[i - 1] if i else 0
+
+    def neto(self, producto_id, desde, hasta):
+        """Suma de los movimientos del producto entre desde y hasta (inclusive)"""
+        serie = self._series.get(producto_id)
+        if serie is None:
+            return 0
+        inicio, fin = serie.desde(clave_fecha(desde, fin_del_dia=False)), serie.hasta(clave_fecha(hasta))
+        if fin <= inicio:
+            return 0
+        return round(serie.stock[fin - 1] - (serie.stock[inicio - 1] if inicio else 0), 3)
+
+    def egresos(self, producto_id, desde, hasta):
+        """Cantidad egresada (ventas, sueldos y pagos en especie) entre desde y hasta, en positivo"""
+        serie = self._series.get(producto_id)
+        if serie is None:
+            return 0
+        inicio, fin = serie.desde(clave_fecha(desde, fin_del_dia=False)), serie.hasta(clave_fecha(hasta))
+        if fin <= inicio:
+            return 0
+        return round(serie.egresos[fin - 1] - (serie.egresos[inicio - 1] if inicio else 0), 3)
+
+    def stock_promedio(self, producto_id, desde, hasta):
+        """Stock promedio en el tiempo entre desde y hasta (integral de stock x días / días)"""
+        serie = self._series.get(producto_id)
+        inicio, fin = clave_fecha(desde, fin_del_dia=False), clave_fecha(hasta)
+        duracion = dias(fin) - dias(inicio)
+        if serie is None or duracion <= 0:
+            return 0
+        return (serie.area_hasta(fin) - serie.area_hasta(inicio)) / duracion
+
+    def rotacion(self, producto_id, desde, hasta):
+        """Egresos del rango sobre el stock promedio; None si el stock promedio no es positivo"""
+        promedio = self.stock_promedio(producto_id, desde, hasta)
+        if promedio <= 0:
+            return None
+        return self.egresos(producto_id, desde, hasta) / promedio
+
+
+def cargar_libro(entrada):
+    """Arma el libro de stock desde los movimientosStock de una salida de la migración"""
+    from ndjson_output import iter_salida
+
+    libro = LibroStock()
+    for coleccion, registro in iter_salida(entrada):
+        if coleccion == "movimientosStock":
+            libro.agregar_registro(registro)
+    return libro.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stock por producto de una salida migrada")
+    parser.add_argument('--entrada', default='datos_migrados.json',
+                        help="JSON o directorio NDJSON de la migración")
+    parser.add_argument('--fecha', help="Stock a esta fecha (AAAA-MM-DD); por defecto el actual")
+    parser.add_argument('--desde', help="Inicio del rango para egresos y rotación (AAAA-MM-DD)")
+    parser.add_argument('--hasta', help="Fin del rango (AAAA-MM-DD); por defecto --fecha o hoy")
+    args = parser.parse_args(argv)
+
+    libro = cargar_libro(args.entrada)
+    print(f"Movimientos de stock: {len(libro.movimientos)}")
+    print(f"\n{'PRODUCTO':<16} {'STOCK':>12}" + (f" {'EGRESOS':>12} {'PROMEDIO':>12} {'ROTACION':>9}"
+                                                   if args.desde else ""))
+    hasta = args.hasta or args.fecha or datetime.now().date().isoformat()
+    for producto_id in sorted(libro.productos()):
+        linea = f"{producto_id:<16} {libro.stock(producto_id, args.fecha):>12,.2f}"
+        if args.desde:
+            rotacion = libro.rotacion(producto_id, args.desde, hasta)
+            linea += (f" {libro.egresos(producto_id, args.desde, hasta):>12,.2f}"
+                      f" {libro.stock_promedio(producto_id, args.desde, hasta):>12,.2f}"
+                      f" {'-' if rotacion is None else f'{rotacion:.2f}':>9}")
+        print(linea)
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
@@ -0,0 +1,191 @@
+"""
+Generador de workbooks sintéticos con el formato de "Sheets actual 19-01-26.xlsx"
+
+Escribe las tres hojas que lee la migración con la misma disposición de columnas:
+
+- INVERSION  GASTOS: bloque de Tony (B-H) y de Facu (J-P), totales en la fila 4,
+  encabezados en la 5 y gastos desde la 6.
+- STOCK Y VENTAS: columnas B-M (fecha, detalle, cliente, precio, entrega, modo de pago,
+  gramos, esquejes/kits, gasto, total, deudas, notas) desde la fila 5, con ventas de
+  WEED/ESQUEJE/KIT, gastos, ingresos de stock y filas vacías entre medio.
+- GASTOS FIJOS Y OTROS: los 12 costos fijos mensuales en las filas 5 a 16.
+
+La cantidad de filas y de clientes distintos es configurable; los clientes siguen una
+distribución de Zipf (pocos clientes concentran muchas compras) y algunos nombres
+aparecen con espacios o minúsculas de más, como en el Excel real. Con la misma semilla
+el archivo generado es siempre el mismo.
+
+Uso:
+    python synthetic_workbook.py SALIDA.xlsx [--filas 10000] [--clientes 200] [--semilla 0]
+"""
+
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+FECHA_INICIAL = datetime(2024, 8, 28)
+
+NOMBRES = [
+    'JUANCHY', 'SEBA', 'ROBER', 'PATO', 'GERO', 'GALLO', 'MOCOCHO', 'COLO', 'FABRI', 'MAX',
+    'MATIAS', 'SANTI', 'MARCOS', 'LUCHO', 'RAMIRO', 'JAVIER', 'AUGUSTO', 'PELAO', 'NEGRO', 'GASTON',
+    'NICO', 'FRAN', 'TOMI', 'NACHO', 'AGUS', 'BRUNO', 'DIEGO', 'PABLO', 'LEO', 'FACU',
+]
+APELLIDOS = [
+    'REYNOSO', 'MOLINA', 'ROSCONE', 'BUSTAMANTE', 'SBROCCO', 'AREDES', 'PIQUE', 'SERRANO',
+    'FLASS', 'SCARLATTA', 'GOMEZ', 'PEREZ', 'DIAZ', 'ROMERO', 'SOSA', 'ACOSTA',
+]
+DETALLES_GASTO = [
+    'SUELDO TINO', 'GASTOS VARIOS', 'CAJA CHICA', 'MANICURA', 'MATERIALES MARCELO', 'MANO DE OBRA MARCE',
+    'COMPRAS CLUB', 'PH+', 'SEMILLAS', 'RIEGO INTEGRAL', 'CERRAJERO', 'YERBA', 'BAZAR', 'BOLSAS',
+    'FIBRA DE COCO', 'MEDIDOR EC', 'BOMBA BPT26', 'ALQUILER', 'NAFTA MARCELO',
+]
+DETALLES_INVERSION = [
+    'AIRE ACONDICIONADO', 'COMPRA HIERROS', 'INSTALACION AIRE', 'ALQUILER OCTUBRE', 'PLOTEO VENTANAS',
+    'HONORARIOS ABOGADO', 'EXTRACTORES', 'FERTILIZANTES', 'GOTEROS NETAFIM', 'MATERIALES AGUA',
+    'SUELDO TINO', 'EDET', 'VENTILADORES', '47 MACETAS 3L', 'COMPRA DE AGUA 400 LTS', 'FONTANERO',
+]
+GASTOS_FIJOS = [
+    ('ALQUILER', 900000.0, None), ('ABOGADOS BAIRES', 534000, '400 USD'), ('ABOGADOS TUC', 250000.0, None),
+    ('MEDICO ONG', 303000.0, '200 USD'), ('REDES SOCIALES', 660000.0, None), ('SUELDO TINO', 1000000.0, None),
+    ('MATIAS', 750000.0, None), ('BIANCA', 500000.0, None), ('VICTOR', 1350000.0, None),
+    ('LUZ', 2077030.0, 'BIMESTRAL'), ('INTERNET', 38000.0, None), ('AGUA', None, None),
+]
+MODOS_PAGO = ['EFECTIVO'] * 8 + ['TRANSFERENCIA', 'EFECTIVO/TRAN']
+
+
+def nombres_clientes(cantidad, rng):
+    """Genera `cantidad` nombres de clientes distintos (apodo, o apodo + apellido / inicial)"""
+    nombres = list(dict.fromkeys(NOMBRES))[:cantidad]
+    while len(nombres) < cantidad:
+        nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS + [chr(c) for c in range(65, 91)])}"
+        if len(nombres) >= len(NOMBRES) * (len(APELLIDOS) + 26):
+            nombre = f"{nombre} {len(nombres)}"
+        if nombre not in nombres:
+            nombres.append(nombre)
+    return nombres
+
+
+def _variante(nombre, rng):
+    """Ruido de tipeo como el del Excel: espacio final o minúsculas"""
+    r = rng.random()
+    if r < 0.03:
+        return nombre + ' '
+    if r < 0.05:
+        return nombre.title()
+    return nombre
+
+
+def generar_filas_stock(cantidad, clientes, rng):
+    """Genera las filas de datos de STOCK Y VENTAS (tuplas de la columna A a la M)"""
+    pesos = [1 / (k + 1) for k in range(len(clientes))]
+    fecha = FECHA_INICIAL
+    for _ in range(cantidad):
+        if rng.random() < 0.35:
+            fecha += timedelta(days=1)
+        r = rng.random()
+        if r < 0.03:
+            yield (None,) * 13  # Filas vacías entre bloques
+        elif r < 0.08:
+            gramos = float(rng.randint(50, 300))
+            yield (None, fecha, f"INGRESO STOCK GELLATO {rng.randint(1, 9)}", 'CLUB', '-', '-', '-',
+                   gramos, None, None, 0.0, 0.0, None)
+        elif r < 0.25:
+            monto = -float(rng.choice([20000, 30000, 50000, 142500, 300000, 750000]))
+            yield (None, fecha, rng.choice(DETALLES_GASTO), rng.choice(clientes), monto, 'TINO',
+                   rng.choice(MODOS_PAGO), None, None, 1.0, monto, 0.0, None)
+        else:
+            cliente = _variante(rng.choices(clientes, weights=pesos)[0], rng)
+            deuda = 0.0
+            if rng.random() < 0.88:
+                gramos = -float(rng.choice([5, 5, 10, 10, 15, 20]))
+                total = -gramos * 6000
+                detalle, precio, esquejes = rng.choice(['WEED'] * 9 + ['WEED ']), 6000.0, None
+            else:
+                esquejes = -float(rng.randint(1, 3))
+                detalle, precio = rng.choice([('ESQUEJE', 10000.0), ('KIT', 45000.0), ('KIT GARDEN', 45000.0)])
+                total, gramos = -esquejes * precio, None
+            if rng.random() < 0.08:
+                deuda = total / 2
+            yield (None, fecha, detalle, cliente, precio, 'TINO', rng.choice(MODOS_PAGO),
+                   gramos, esquejes, None, total, deuda, 'FIADO' if deuda else None)
+
+
+def generar_filas_inversion(cantidad, rng):
+    """Genera las filas de gastos de INVERSION GASTOS (Tony en B-H, Facu en J-P)"""
+    fecha = datetime(2023, 11, 7)
+    for i in range(cantidad):
+        fecha += timedelta(days=rng.randint(0, 3))
+        fila = [None] * 17
+        for col in (1, 9):
+            if col == 9 and i >= cantidad * 0.8:  # Facu tiene menos gastos que Tony
+                continue
+            precio = float(rng.choice([890, 960, 1020, 1150, 1300]))
+            pesos = float(rng.randint(10, 2000) * 1000)
+            fila[col:col + 7] = [fecha, rng.choice(DETALLES_INVERSION), None, None,
+                                 pesos / precio, pesos, precio]
+        yield fila
+
+
+def generar_workbook(path, filas=1000, clientes=200, filas_inversion=None, semilla=0):
+    """
+    Escribe el workbook sintético en path. filas es la cantidad de filas de datos de
+    STOCK Y VENTAS; por defecto INVERSION GASTOS tiene una fila cada cinco.
+    """
+    import openpyxl
+
+    rng = random.Random(semilla)
+    nombres = nombres_clientes(clientes, rng)
+    filas_inversion = filas_inversion if filas_inversion is not None else max(1, filas // 5)
+
+    wb = openpyxl.Workbook(write_only=True)
+
+    ws = wb.create_sheet('INVERSION  GASTOS')
+    ws.append([])
+    ws.append([None, 'CLUB CANNABICO THE GARDEN BOYS'])
+    ws.append([])
+    ws.append([None, 'GASTOS TONY', None, None, None, 16425.35534, 18336373.86, datetime(2025, 8, 19),
+               None, 'GASTOS FACU', None, None, None, 22701.69688, 20465181.68, datetime(2025, 8, 19)])
+    ws.append([None, 'FECHA', 'DETALLE', None, None, 'MONTO USD', 'MONTO $', 'PRECIO DOLAR',
+               None, 'FECHA', 'DETALLE', None, None, 'DOLARES', 'MONTO', 'PRECIO DOLAR'])
+    for fila in generar_filas_inversion(filas_inversion, rng):
+        ws.append(fila)
+
+    ws = wb.create_sheet('STOCK Y VENTAS')
+    ws.append([])
+    ws.append([None, 'STOCK - VENTAS - GASTOS'])
+    ws.append([])
+    ws.append([None, 'FECHA', 'DETALLE', 'CLIENTES', 'PRECIO VTA', 'ENTREGA', 'MODO PAGO', 'CANTIDAD GR',
+               'ESQUE/KITS', 'GASTOS', 'TOTAL', 'DEUDAS', 'NOTAS'])
+    for fila in generar_filas_stock(filas, nombres, rng):
+        ws.append(fila)
+
+    ws = wb.create_sheet('GASTOS FIJOS Y OTROS')
+    ws.append([])
+    ws.append([None, 'GASTOS FIJOS Y OTROS'])
+    ws.append([])
+    ws.append([None, None, 'COSTO FIJO MENSUAL', 'DETALLE', 'MONTO', 'VENCIMIENTO', 'NOTA'])
+    for n, (detalle, monto, nota) in enumerate(GASTOS_FIJOS, 1):
+        ws.append([None, None, float(n), detalle, monto, 'HASTA 10', nota])
+
+    wb.save(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un workbook sintético con el formato del Excel real")
+    parser.add_argument('salida')
+    parser.add_argument('--filas', type=int, default=1000, help="Filas de datos de STOCK Y VENTAS")
+    parser.add_argument('--clientes', type=int, default=200, help="Clientes distintos")
+    parser.add_argument('--filas-inversion', type=int, default=None,
+                        help="Filas de INVERSION GASTOS; por defecto una cada cinco de stock")
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generar_workbook(args.salida, args.filas, args.clientes, args.filas_inversion, args.semilla)
+    print(f"Workbook generado: {args.salida} ({args.filas} filas, {args.clientes} clientes)")
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    main()
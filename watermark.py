@@ -0,0 +1,96 @@
+"""
+Marcas de agua para la migración incremental
+
+Por cada bloque de filas migrado (STOCK Y VENTAS, gastos de Tony, gastos de Facu)
+se guarda la última fila procesada, su fecha y una huella SHA-256 de todas las
+filas del bloque hasta esa fila inclusive. En la corrida siguiente se recalcula
+la huella del mismo prefijo: si coincide solo se procesan las filas nuevas; si no
+coincide (se editó o borró una fila ya migrada) se lanza PrefijoModificado para
+que la migración se rehaga completa.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+FORMATO_MARCA = 3  # 2: las ventas llevan entregador; 3: ventas PARCIAL con su montoPagado
+
+
+class PrefijoModificado(Exception):
+    """Las filas ya migradas de un bloque cambiaron desde la última corrida"""
+
+
+class MarcaAgua:
+    """Sigue la última fila con fecha de un bloque de columnas y la huella de su prefijo"""
+
+    def __init__(self, nombre, columnas, previa=None):
+        self.nombre = nombre
+        self.columnas = columnas
+        self.previa = previa
+        self.fila = 0
+        self.fecha = None
+        self._hash = hashlib.sha256()
+        self.huella = self._hash.hexdigest()
+
+    def ver(self, fila, row, fecha=None):
+        """
+        Registra una fila del bloque (fecha=None si la fila no tiene fecha válida).
+        Devuelve True si la fila es nueva respecto de la marca previa.
+        """
+        self._hash.update(repr(row[self.columnas]).encode('utf-8'))
+        if fecha is not None:
+            self.fila = fila
+            self.fecha = fecha.isoformat()
+            self.huella = self._hash.copy().hexdigest()
+
+        if self.previa is None:
+            return True
+        if fila == self.previa['fila'] and self._hash.copy().hexdigest() != self.previa['huella']:
+            raise PrefijoModificado(f"{self.nombre}: cambiaron filas anteriores a la {fila}")
+        return fila > self.previa['fila']
+
+    def cerrar(self):
+        """Verifica que el bloque llegó al menos hasta la fila de la marca previa"""
+        if self.previa is not None and self.fila < self.previa['fila']:
+            raise PrefijoModificado(
+                f"{self.nombre}: la última fila migrada ({self.previa['fila']}) ya no existe"
+            )
+
+    def to_dict(self):
+        return {"fila": self.fila, "fecha": self.fecha, "huella": self.huella}
+
+
+def ruta_marca(salida_path):
+    """Archivo de marcas de agua asociado a un archivo de salida"""
+    salida = Path(salida_path)
+    return salida.with_name(f"{salida.stem}.watermark.json")
+
+
+def cargar_marca(salida_path):
+    """Lee las marcas de agua de la corrida anterior (None si no hay o son de otro formato)"""
+    ruta = ruta_marca(salida_path)
+    if not ruta.exists():
+        return None
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            marca = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if marca.get('formato') != FORMATO_MARCA:
+        return None
+    return marca
+
+
+def guardar_marca(salida_path, bloques, contadores, huellas=None):
+    """
+    Guarda las marcas de agua de cada bloque, los contadores de IDs y las huellas de la
+    configuración usada (mapa de alias, reglas de clasificación)
+    """
+    marca = {
+        "formato": FORMATO_MARCA,
+        "bloques": {nombre: m.to_dict() for nombre, m in bloques.items()},
+        "contadores": contadores,
+        "huellas": huellas,
+    }
+    with open(ruta_marca(salida_path), 'w', encoding='utf-8') as f:
+        json.dump(marca, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,189 @@
+"""
+Cache de snapshots del Excel compartido por los scripts de análisis y migración
+
+Parsear el xlsx es lo más lento de cada corrida. Este módulo lee las hojas con el
+lector directo de xlsx_reader.py (mismas filas que openpyxl read-only, sin su modelo
+de objetos) y guarda las filas (values_only) de las hojas del club en un archivo binario (pickle)
+identificado por el hash SHA-256 del contenido del workbook, de modo que las
+corridas siguientes lo cargan en milisegundos. Si el Excel cambia, cambia el hash
+y el snapshot se regenera solo (los snapshots viejos del mismo archivo se borran).
+
+El nombre del snapshot lleva además una huella corta de la ruta absoluta del Excel:
+workbooks con el mismo nombre en carpetas distintas (los mensuales de cada club en un
+lote) no se pisan ni se borran entre sí. Cada proceso escribe en su propio temporal y
+recién lo publica con os.replace, así dos workers que cachean el mismo Excel no se
+truncan el archivo.
+
+Uso:
+    from workbook_cache import cargar_snapshot
+    wb = cargar_snapshot('Sheets actual 19-01-26.xlsx')
+    rows = list(wb['STOCK Y VENTAS'].iter_rows(values_only=True))
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from xlsx_reader import abrir_xlsx
+
+HOJAS = ('INVERSION  GASTOS', 'STOCK Y VENTAS', 'GASTOS FIJOS Y OTROS')
+CACHE_DIR = Path('.cache') / 'workbooks'
+FORMATO_CACHE = 1
+
+
+def hash_archivo(path):
+    """Calcula el SHA-256 del contenido del archivo"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _comprimir_fila(row):
+    """Quita los None finales de una fila para guardarla compacta"""
+    fin = len(row)
+    while fin and row[fin - 1] is None:
+        fin -= 1
+    return row[:fin]
+
+
+class HojaSnapshot:
+    """Hoja cacheada con la misma interfaz de lectura que un worksheet de openpyxl"""
+
+    def __init__(self, title, ancho, filas):
+        self.title = title
+        self.max_column = ancho
+        self._filas = filas
+
+    @property
+    def max_row(self):
+        return len(self._filas)
+
+    def iter_rows(self, values_only=True):
+        """Devuelve las filas como tuplas completas (rellenadas con None hasta max_column)"""
+        ancho = self.max_column
+        for fila in self._filas:
+            faltan = ancho - len(fila)
+            yield fila + (None,) * faltan if faltan else fila
+
+
+class WorkbookSnapshot:
+    """Workbook cacheado: se indexa por nombre de hoja como un workbook de openpyxl"""
+
+    def __init__(self, hash_contenido, hojas):
+        self.hash = hash_contenido
+        self._hojas = hojas
+
+    @property
+    def sheetnames(self):
+        return list(self._hojas)
+
+    def __getitem__(self, nombre):
+        return self._hojas[nombre]
+
+    def __iter__(self):
+        return iter(self._hojas.values())
+
+    def close(self):
+        """Compatibilidad con openpyxl: no hay recursos abiertos"""
+
+
+def abrir_openpyxl(path):
+    """Workbook read-only de openpyxl (la referencia del lector directo)"""
+    import openpyxl
+
+    return openpyxl.load_workbook(path, data_only=True, read_only=True)
+
+
+def parsear_workbook(path, hojas=HOJAS, abrir=abrir_xlsx):
+    """
+    Lee el Excel (por defecto con el lector directo; abrir=abrir_openpyxl para usar
+    openpyxl) y devuelve {hoja: (ancho, filas compactas)}
+    """
+    wb = abrir(path)
+    try:
+        datos = {}
+        for nombre in wb.sheetnames:
+            if nombre not in hojas:
+                continue
+            ancho = 0
+            filas = []
+            for row in wb[nombre].iter_rows(values_only=True):
+                ancho = max(ancho, len(row))
+                filas.append(_comprimir_fila(row))
+            datos[nombre] = (ancho, filas)
+        return datos
+    finally:
+        wb.close()
+
+
+def prefijo_cache(path):
+    """Prefijo de los archivos de cache de un Excel: nombre + huella corta de su ruta absoluta"""
+    ruta = Path(path).resolve()
+    return f"{ruta.stem}.{hashlib.sha256(str(ruta).encode('utf-8')).hexdigest()[:8]}"
+
+
+def borrar_viejos(path, vigente, cache_dir, extension):
+    """Elimina los archivos de cache del mismo Excel (misma ruta) con otro hash de contenido"""
+    for viejo in Path(cache_dir).glob(f"{glob.escape(prefijo_cache(path))}.*{extension}"):
+        if viejo != vigente:
+            viejo.unlink(missing_ok=True)
+
+
+def guardar_atomico(ruta, escribir):
+    """
+    Escribe ruta con escribir(f) en un temporal propio del proceso dentro del mismo
+    directorio y lo publica con os.replace (el temporal se borra si falla)
+    """
+    with tempfile.NamedTemporaryFile(dir=Path(ruta).parent, prefix=Path(ruta).name + '.',
+                                     suffix='.tmp', delete=False) as f:
+        tmp = f.name
+        try:
+            escribir(f)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, ruta)
+
+
+def _ruta_snapshot(path, hash_contenido, cache_dir):
+    return Path(cache_dir) / f"{prefijo_cache(path)}.{hash_contenido[:16]}.snap"
+
+
+def cargar_snapshot(path, cache_dir=CACHE_DIR, hojas=HOJAS):
+    """
+    Devuelve un WorkbookSnapshot del Excel, leyendo del cache si el contenido no cambió
+    o parseando y guardando un snapshot nuevo si cambió (o no existe).
+    """
+    hash_contenido = hash_archivo(path)
+    ruta = _ruta_snapshot(path, hash_contenido, cache_dir)
+
+    datos = None
+    if ruta.exists():
+        try:
+            with open(ruta, 'rb') as f:
+                payload = pickle.load(f)
+            if (payload.get('formato') == FORMATO_CACHE and payload.get('hash') == hash_contenido
+                    and all(h in payload['hojas'] for h in hojas)):
+                datos = payload['hojas']
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+            datos = None
+
+    if datos is None:
+        datos = parsear_workbook(path, hojas)
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        guardar_atomico(ruta, lambda f: pickle.dump(
+            {'formato': FORMATO_CACHE, 'hash': hash_contenido, 'hojas': datos}, f,
+            protocol=pickle.HIGHEST_PROTOCOL))
+        borrar_viejos(path, ruta, cache_dir, '.snap')
+
+    hojas_snapshot = {
+        nombre: HojaSnapshot(nombre, ancho, filas)
+        for nombre, (ancho, filas) in datos.items()
+    }
+    return WorkbookSnapshot(hash_contenido, hojas_snapshot)
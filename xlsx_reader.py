@@ -0,0 +1,398 @@
+"""
+Lector directo del xlsx (zipfile + XML incremental) sin el modelo de objetos de openpyxl
+
+openpyxl, aun en modo read-only, arma un objeto celda por valor y eso es lo que más
+tarda en cada corrida. La migración y los análisis solo usan las tuplas de
+iter_rows(values_only=True) de tres hojas conocidas, así que este módulo lee las
+partes del paquete directamente:
+
+- xl/workbook.xml y sus relaciones: nombre de cada hoja -> parte XML, y date1904
+- xl/styles.xml: qué estilos (cellXfs) tienen formato de fecha o de duración
+- xl/sharedStrings.xml: tabla de textos compartidos (solo el texto, sin formato)
+- cada hoja con iterparse, una fila a la vez (se libera al procesarla)
+
+Las filas son las mismas tuplas que da openpyxl read-only con data_only=True: mismo
+ancho (el de <dimension> o, si falta, hasta la última celda de cada fila), filas
+faltantes como filas vacías, números como int o float, seriales con estilo de fecha
+convertidos a datetime (time / timedelta según el formato) y fórmulas con su último
+valor calculado. `python xlsx_reader.py` verifica esa paridad contra openpyxl.
+
+Uso:
+    from xlsx_reader import abrir_xlsx
+    wb = abrir_xlsx('Sheets actual 19-01-26.xlsx')
+    rows = wb['STOCK Y VENTAS'].iter_rows(values_only=True)
+
+    python xlsx_reader.py [--excel ARCHIVO] [--todas]
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+import time
+import zipfile
+from datetime import datetime, timedelta
+from datetime import time as hora
+from xml.etree.ElementTree import fromstring, iterparse
+
+EXCEL_PATH = 'Sheets actual 19-01-26.xlsx'
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+REL_DOCUMENTO = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+TAG_FILA = NS_MAIN + 'row'
+TAG_VALOR = NS_MAIN + 'v'
+TAG_INLINE = NS_MAIN + 'is'
+TAG_TEXTO = NS_MAIN + 't'
+TAG_RUN = NS_MAIN + 'r'
+TAG_SI = NS_MAIN + 'si'
+TAG_DIMENSION = NS_MAIN + 'dimension'
+TAG_DATOS = NS_MAIN + 'sheetData'
+
+EPOCA_WINDOWS = datetime(1899, 12, 30)
+EPOCA_MAC = datetime(1904, 1, 1)
+
+# Formatos incorporados (numFmtId < 164) que son fechas u horas, y los que son duraciones
+FORMATOS_FECHA_INCORPORADOS = frozenset(range(14, 23)) | {45, 46, 47}
+FORMATOS_DURACION_INCORPORADOS = frozenset({46})
+
+# Mismo criterio que openpyxl.styles.numbers: se ignora lo literal ("...") y los
+# [modificadores] salvo [h], [m] y [s]; es fecha si queda alguna d, m, h, y o s sin escapar
+_LITERAL_O_LOCALE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+_LETRA_FECHA = re.compile(r'(?<![_\\])[dmhysDMHYS]')
+_DURACION = re.compile(r'\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?', re.I)
+
+
+def es_formato_fecha(formato):
+    return _LETRA_FECHA.search(_LITERAL_O_LOCALE.sub('', formato.split(';')[0])) is not None
+
+
+def es_formato_duracion(formato):
+    return _DURACION.search(formato.split(';')[0]) is not None
+
+
+def desde_serial(valor, epoca=EPOCA_WINDOWS, duracion=False):
+    """Serial de Excel -> datetime (time si es solo hora, timedelta si es una duración)"""
+    if duracion:
+        delta = timedelta(days=valor)
+        if delta.microseconds:
+            delta = timedelta(seconds=delta.total_seconds() // 1, microseconds=round(delta.microseconds, -3))
+        return delta
+    dia, fraccion = divmod(valor, 1)
+    diferencia = timedelta(milliseconds=round(fraccion * 86400 * 1000))
+    if 0 <= valor < 1 and diferencia.days == 0:
+        minutos, segundos = divmod(diferencia.seconds, 60)
+        horas, minutos = divmod(minutos, 60)
+        return hora(horas, minutos, segundos, diferencia.microseconds)
+    # Excel cuenta el 29/2/1900 que no existió: los seriales antes del 60 se corren un día
+    if 0 < valor < 60 and epoca == EPOCA_WINDOWS:
+        dia += 1
+    return epoca + timedelta(days=dia) + diferencia
+
+
+def _numero(texto):
+    if '.' in texto or 'E' in texto or 'e' in texto:
+        return float(texto)
+    return int(texto)
+
+
+def _columna(referencia):
+    """Número de columna (1 = A) de una referencia como 'AB12'"""
+    numero = 0
+    for letra in referencia:
+        if letra > '@':
+            numero = numero * 26 + ord(letra) - 64
+        else:
+            break
+    return numero
+
+
+def _limites(ref):
+    """(max_columna, max_fila) de un ref de <dimension> ('A1:P200'); None si no se entiende"""
+    ultima = ref.split(':')[-1].replace('$', '')
+    columna = _columna(ultima)
+    fila = ultima[len(ultima.rstrip('0123456789')):]
+    if not columna or not fila:
+        return None
+    return columna, int(fila)
+
+
+def _texto_plano(nodo):
+    """Texto de un <si> o <is>: el <t> directo más el de cada run, sin formato"""
+    partes = []
+    for hijo in nodo:
+        if hijo.tag == TAG_TEXTO:
+            if hijo.text:
+                partes.append(hijo.text)
+        elif hijo.tag == TAG_RUN:
+            t = hijo.find(TAG_TEXTO)
+            if t is not None and t.text:
+                partes.append(t.text)
+    return ''.join(partes)
+
+
+def _relaciones(archivo, parte):
+    """{Id: ruta de la parte destino} de las relaciones de una parte del paquete"""
+    directorio, nombre = posixpath.split(parte)
+    ruta = posixpath.join(directorio, '_rels', nombre + '.rels')
+    if ruta not in archivo.namelist():
+        return {}, {}
+    destinos, tipos = {}, {}
+    for rel in fromstring(archivo.read(ruta)).iter(NS_PKG + 'Relationship'):
+        destino = rel.get('Target')
+        if rel.get('TargetMode') == 'External':
+            continue
+        if destino.startswith('/'):
+            destino = destino[1:]
+        else:
+            destino = posixpath.normpath(posixpath.join(directorio, destino))
+        destinos[rel.get('Id')] = destino
+        tipos[rel.get('Type').rsplit('/', 1)[-1]] = destino
+    return destinos, tipos
+
+
+class HojaXlsx:
+    """Hoja del xlsx con la misma interfaz de lectura que un worksheet read-only de openpyxl"""
+
+    def __init__(self, libro, title, parte):
+        self.title = title
+        self._libro = libro
+        self._parte = parte
+        self.max_column = self.max_row = None
+        # <dimension> va antes de <sheetData>: alcanza con los eventos de apertura
+        with libro._archivo.open(parte) as fuente:
+            for _, elemento in iterparse(fuente, events=('start',)):
+                if elemento.tag == TAG_DIMENSION:
+                    limites = _limites(elemento.get('ref', ''))
+                    if limites:
+                        self.max_column, self.max_row = limites
+                    break
+                if elemento.tag == TAG_DATOS:
+                    break
+
+    def _filas_xml(self):
+        """
+        (número de fila, columna de la última celda, [(columna, valor)]) de cada <row> del
+        XML, en orden. Las celdas vacías (solo estilo) no se listan: solo cuentan para el ancho.
+        """
+        libro = self._libro
+        textos = libro.textos_compartidos
+        fechas, duraciones, epoca = libro.estilos_fecha, libro.estilos_duracion, libro.epoca
+        columnas = {}
+        numero_fila = 0
+        with libro._archivo.open(self._parte) as fuente:
+            for _, fila in iterparse(fuente):
+                if fila.tag != TAG_FILA:
+                    continue
+                r = fila.get('r')
+                numero_fila = int(float(r)) if r else numero_fila + 1
+                celdas = []
+                columna = 0
+                for c in fila:
+                    ref = c.get('r')
+                    if ref:
+                        letras = ref.rstrip('0123456789')
+                        anterior, columna = columna, columnas.get(letras)
+                        if columna is None:
+                            columna = columnas[letras] = _columna(letras)
+                    else:
+                        anterior, columna = columna, columna + 1
+                    if not len(c):
+                        if columna <= anterior:
+                            celdas.append((columna, None))  # Repetida: pisa el valor anterior
+                        continue
+                    tipo = c.get('t', 'n')
+                    if tipo == 'inlineStr':
+                        nodo = c.find(TAG_INLINE)
+                        valor = _texto_plano(nodo) if nodo is not None else None
+                    else:
+                        valor = c.findtext(TAG_VALOR) or None
+                        if valor is not None:
+                            if tipo == 'n':
+                                valor = _numero(valor)
+                                estilo = c.get('s')
+                                if estilo and int(estilo) in fechas:
+                                    try:
+                                        valor = desde_serial(valor, epoca, int(estilo) in duraciones)
+                                    except (OverflowError, ValueError):
+                                        valor = '#VALUE!'
+                            elif tipo == 's':
+                                valor = textos[int(valor)]
+                            elif tipo == 'b':
+                                valor = bool(int(valor))
+                            elif tipo == 'd':
+                                valor = datetime.fromisoformat(valor)
+                    celdas.append((columna, valor))
+                fila.clear()
+                yield numero_fila, columna, celdas
+
+    def iter_rows(self, values_only=True):
+        """Tuplas de valores de la fila 1 a la última, como openpyxl read-only con values_only"""
+        max_col, max_row = self.max_column, self.max_row
+        vacia = (None,) * max_col if max_col is not None else ()
+        siguiente = numero = 1
+        for numero, ultima, celdas in self._filas_xml():
+            if max_row is not None and numero > max_row:
+                break
+            while siguiente < numero:
+                siguiente += 1
+                yield vacia
+            if siguiente > numero:
+                continue  # Fila repetida o fuera de orden: openpyxl la descarta
+            siguiente += 1
+            if not ultima and not max_col:
+                yield ()
+                continue
+            ancho = max_col or ultima
+            valores = [None] * ancho
+            for columna, valor in celdas:
+                if 1 <= columna <= ancho:
+                    valores[columna - 1] = valor
+            yield tuple(valores)
+        if max_row is not None and max_row < numero:
+            for _ in range(siguiente, max_row + 1):
+                yield vacia
+
+
+class WorkbookXlsx:
+    """Workbook abierto con el lector directo: se indexa por nombre de hoja como uno de openpyxl"""
+
+    def __init__(self, path):
+        self._archivo = zipfile.ZipFile(path)
+        _, tipos_paquete = _relaciones(self._archivo, '')
+        parte = tipos_paquete.get(REL_DOCUMENTO.rsplit('/', 1)[-1], 'xl/workbook.xml')
+        destinos, tipos = _relaciones(self._archivo, parte)
+
+        raiz = fromstring(self._archivo.read(parte))
+        propiedades = raiz.find(NS_MAIN + 'workbookPr')
+        fecha1904 = propiedades is not None and propiedades.get('date1904') in ('1', 'true')
+        self.epoca = EPOCA_MAC if fecha1904 else EPOCA_WINDOWS
+        self._partes = {
+            hoja.get('name'): destinos[hoja.get(NS_REL + 'id')]
+            for hoja in raiz.iter(NS_MAIN + 'sheet') if hoja.get(NS_REL + 'id') in destinos
+        }
+        self._parte_textos = tipos.get('sharedStrings')
+        self.estilos_fecha, self.estilos_duracion = self._leer_estilos(tipos.get('styles'))
+        self._textos = None
+        self._hojas = {}
+
+    def _leer_estilos(self, parte):
+        """Índices de cellXfs con formato de fecha y con formato de duración"""
+        if parte is None:
+            return frozenset(), frozenset()
+        raiz = fromstring(self._archivo.read(parte))
+        propios = {int(f.get('numFmtId')): f.get('formatCode', '')
+                   for f in raiz.iter(NS_MAIN + 'numFmt')}
+        fechas, duraciones = set(), set()
+        xfs = raiz.find(NS_MAIN + 'cellXfs')
+        for i, xf in enumerate(xfs if xfs is not None else ()):
+            formato_id = int(xf.get('numFmtId', 0))
+            formato = propios.get(formato_id)
+            if formato is None:
+                es_fecha = formato_id in FORMATOS_FECHA_INCORPORADOS
+                es_duracion = formato_id in FORMATOS_DURACION_INCORPORADOS
+            else:
+                es_fecha, es_duracion = es_formato_fecha(formato), es_formato_duracion(formato)
+            if es_fecha:
+                fechas.add(i)
+            if es_duracion:
+                duraciones.add(i)
+        return frozenset(fechas), frozenset(duraciones)
+
+    @property
+    def textos_compartidos(self):
+        """Tabla de sharedStrings (se lee una vez, al pedir la primera hoja)"""
+        if self._textos is None:
+            self._textos = []
+            if self._parte_textos and self._parte_textos in self._archivo.namelist():
+                with self._archivo.open(self._parte_textos) as fuente:
+                    for _, nodo in iterparse(fuente):
+                        if nodo.tag == TAG_SI:
+                            self._textos.append(_texto_plano(nodo).replace('x005F_', ''))
+                            nodo.clear()
+        return self._textos
+
+    @property
+    def sheetnames(self):
+        return list(self._partes)
+
+    def __getitem__(self, nombre):
+        hoja = self._hojas.get(nombre)
+        if hoja is None:
+            hoja = self._hojas[nombre] = HojaXlsx(self, nombre, self._partes[nombre])
+        return hoja
+
+    def __iter__(self):
+        return (self[nombre] for nombre in self._partes)
+
+    def close(self):
+        self._archivo.close()
+
+
+def abrir_xlsx(path):
+    """Abre el Excel con el lector directo (las hojas se leen recién al iterarlas)"""
+    return WorkbookXlsx(path)
+
+# ============================================================================
+# PARIDAD CON OPENPYXL
+# ============================================================================
+
+def comparar_con_openpyxl(path, hojas=None):
+    """
+    Lee las hojas con este lector y con openpyxl read-only (data_only) y devuelve
+    {hoja: (filas, diferencias, segundos_xml, segundos_openpyxl)}; diferencias es una
+    lista de (número de fila, fila openpyxl, fila xml) con las primeras 5 que no coinciden.
+    """
+    import openpyxl
+
+    inicio = time.perf_counter()
+    wb = abrir_xlsx(path)
+    propias = {nombre: [tuple(f) for f in wb[nombre].iter_rows(values_only=True)]
+               for nombre in wb.sheetnames if hojas is None or nombre in hojas}
+    wb.close()
+    segundos_xml = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    wb = openpyxl.load_workbook(path, data_only=True, read_only=True)
+    referencia = {nombre: [tuple(f) for f in wb[nombre].iter_rows(values_only=True)] for nombre in propias}
+    wb.close()
+    segundos_openpyxl = time.perf_counter() - inicio
+
+    resultado = {}
+    for nombre, filas in propias.items():
+        esperadas = referencia[nombre]
+        diferencias = [(i, a, b) for i, (a, b) in enumerate(zip(esperadas, filas), 1) if a != b][:5]
+        if len(esperadas) != len(filas):
+            diferencias.append((min(len(esperadas), len(filas)) + 1, len(esperadas), len(filas)))
+        resultado[nombre] = (len(filas), diferencias, segundos_xml, segundos_openpyxl)
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica el lector directo contra openpyxl")
+    parser.add_argument('--excel', default=EXCEL_PATH)
+    parser.add_argument('--todas', action='store_true',
+                        help="Compara todas las hojas (por defecto, las tres que usa la migración)")
+    args = parser.parse_args(argv)
+
+    from workbook_cache import HOJAS
+
+    resultado = comparar_con_openpyxl(args.excel, None if args.todas else HOJAS)
+    ok = True
+    for nombre, (filas, diferencias, _, _) in resultado.items():
+        print(f"{'OK' if not diferencias else 'DISTINTA':<9} {nombre:<25} {filas:>7} filas")
+        for numero, esperada, obtenida in diferencias:
+            print(f"    fila {numero}:\n      openpyxl: {esperada}\n      xml:      {obtenida}")
+        ok = ok and not diferencias
+    if resultado:
+        _, _, segundos_xml, segundos_openpyxl = next(iter(resultado.values()))
+        print(f"\nLector xml: {segundos_xml:.3f}s | openpyxl read-only: {segundos_openpyxl:.3f}s "
+              f"({segundos_openpyxl / segundos_xml:.1f}x)")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.exit(main())